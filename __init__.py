@@ -1,20 +1,36 @@
-# gui
-from PySide2 import QtWidgets
-
-# pose manager
-from .ui import PoseManagerUI
-
 # bulit-ins
+import importlib
 import sys
 
-# maya
-from maya import cmds as mc
+# gui, maya 는 show() 에서 import 합니다.
+# mayapy batch 에서 api, io 만 사용할 때 PySide2, ui 를 import 하지 않습니다.
 
 self = sys.modules[__name__]
 self._window = None
 
+_lazy_modules = ("api", "io", "model", "check", "profiler", "batch", "posefile", "analysis", "solver", "export", "bake",
+                 "retarget", "sweep", "live", "cache", "history", "lut", "ui")
+
+
+def __getattr__(name):
+    # posemanager.api 처럼 접근할 때 submodule 을 import 합니다.
+    if name in _lazy_modules:
+        return importlib.import_module("." + name, __name__)
+    if name == "PoseManagerUI":
+        return importlib.import_module(".ui", __name__).PoseManagerUI
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
 
 def show():
+    # gui
+    from PySide2 import QtWidgets
+
+    # maya
+    from maya import cmds as mc
+
+    # pose manager
+    from .ui import PoseManagerUI
+
     app = QtWidgets.QApplication.instance()
     maya_window = next(w for w in app.topLevelWidgets() if w.objectName() == "MayaWindow")
     try:
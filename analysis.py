@@ -0,0 +1,151 @@
+"""
+redundant pose 를 찾고 지웁니다.
+
+    from posemanager import analysis
+    report = analysis.analyze(api.get_data())
+    analysis.print_report(report)
+    analysis.prune(report)
+
+- duplicate : controller t/r 이 거의 같고 driven offset 도 거의 같은 pose. 앞의 pose 를 남깁니다.
+- conflict : controller t/r 은 거의 같은데 driven offset 이 다른 pose. 지우지 않고 보고만 합니다.
+- noop : driven offset 이 모두 tolerance 이하인 pose. rest pose (controller t/r 이 0) 는 다른 pose 의 weight 에
+  영향을 주므로 지우지 않습니다.
+"""
+# pose manager
+from . import model
+
+# built-ins
+import math
+
+default_tolerance = {
+    "translate": 1e-3,
+    "rotate": 0.1,
+    "offset_translate": 1e-4,
+    "offset_rotate": 1e-3
+}
+
+
+def _max_differences(tr, i, j):
+    # packed array 의 i, j 번째 pose 의 translate, rotate 최대 차이
+    a = i * 6
+    b = j * 6
+    dt = max(abs(tr[a + k] - tr[b + k]) for k in range(3))
+    dr = max(abs(tr[a + k] - tr[b + k]) for k in range(3, 6))
+    return dt, dr
+
+
+def analyze_interpolator(interpolator, tolerance=None):
+    """
+    :param interpolator: model.Interpolator
+    :param tolerance: default_tolerance 와 같은 key
+    :return: {"duplicate": [(keep, remove)], "conflict": [(a, b)], "noop": [pose],
+              "distance": {(a, b): float}, "contribution": {pose: float}, ...cost}
+    """
+    tolerance = dict(default_tolerance, **(tolerance or {}))
+    names = list(interpolator.poses)
+    pose_tr = interpolator.pose_array()
+    offset_tr = {d: interpolator.offset_array(d) for d in interpolator.drivens}
+
+    # pose 별 driven offset 의 최대 크기
+    contribution = {}
+    for i, name in enumerate(names):
+        value = 0.0
+        for tr in offset_tr.values():
+            value = max([value] + [abs(tr[i * 6 + k]) for k in range(6)])
+        contribution[name] = value
+
+    distance = {}
+    duplicate = []
+    conflict = []
+    removed = set()
+    for i in range(len(names)):
+        for j in range(i + 1, len(names)):
+            dt, dr = _max_differences(pose_tr, i, j)
+            distance[(names[i], names[j])] = math.sqrt(dt * dt + math.radians(dr) ** 2)
+            if dt > tolerance["translate"] or dr > tolerance["rotate"] or names[j] in removed:
+                continue
+            same_offset = True
+            for tr in offset_tr.values():
+                ot, orr = _max_differences(tr, i, j)
+                if ot > tolerance["offset_translate"] or orr > tolerance["offset_rotate"]:
+                    same_offset = False
+                    break
+            if same_offset:
+                duplicate.append((names[i], names[j]))
+                removed.add(names[j])
+            else:
+                conflict.append((names[i], names[j]))
+
+    noop = []
+    for i, name in enumerate(names):
+        if name in removed:
+            continue
+        is_rest = all(abs(x) <= tolerance["translate"] for x in pose_tr[i * 6:i * 6 + 3]) and \
+            all(abs(x) <= tolerance["rotate"] for x in pose_tr[i * 6 + 3:i * 6 + 6])
+        offsets = [tr[i * 6:i * 6 + 6] for tr in offset_tr.values()]
+        is_noop = all(max(abs(x) for x in o[:3]) <= tolerance["offset_translate"] and
+                      max(abs(x) for x in o[3:]) <= tolerance["offset_rotate"] for o in offsets)
+        if is_noop and not is_rest:
+            noop.append(name)
+            removed.add(name)
+
+    poses_before = len(names)
+    poses_after = poses_before - len(removed)
+    drivens = len(interpolator.drivens)
+    return {
+        "duplicate": duplicate,
+        "conflict": conflict,
+        "noop": noop,
+        "remove": [n for n in names if n in removed],
+        "distance": distance,
+        "contribution": contribution,
+        "poses_before": poses_before,
+        "poses_after": poses_after,
+        # 대략적인 evaluation 비용. rbf kernel (pose ^ 2) + blendMatrix target (pose * driven)
+        "cost_before": poses_before * poses_before + poses_before * drivens,
+        "cost_after": poses_after * poses_after + poses_after * drivens
+    }
+
+
+def analyze(data, tolerance=None):
+    """
+    :param data: _data or pose file data
+    :return: {interpolator name: analyze_interpolator result}
+    """
+    return {k: analyze_interpolator(v, tolerance) for k, v in model.from_data(data).items()}
+
+
+def print_report(report):
+    before = sum(r["poses_before"] for r in report.values())
+    after = sum(r["poses_after"] for r in report.values())
+    cost_before = sum(r["cost_before"] for r in report.values())
+    cost_after = sum(r["cost_after"] for r in report.values())
+    for interpolator_name, result in report.items():
+        for keep, remove in result["duplicate"]:
+            print("duplicate  {0:<40} {1} == {2}".format(interpolator_name, remove, keep))
+        for a, b in result["conflict"]:
+            print("conflict   {0:<40} {1} ~ {2} (different driven offset)".format(interpolator_name, a, b))
+        for pose in result["noop"]:
+            print("noop       {0:<40} {1}".format(interpolator_name, pose))
+    print("pose {0} -> {1}, estimated cost {2} -> {3}".format(before, after, cost_before, cost_after))
+
+
+def prune(report):
+    """
+    report 의 remove pose 를 지웁니다.
+
+    :param report: analyze result
+    :return: {"poses_before", "poses_after", "cost_before", "cost_after"}
+    """
+    # maya 가 필요한 기능이므로 여기서 import 합니다.
+    from . import api
+
+    poses = {k.replace(model.interpolator_suffix, ""): v["remove"] for k, v in report.items() if v["remove"]}
+    if poses:
+        api.delete_poses(poses)
+    return {
+        "poses_before": sum(r["poses_before"] for r in report.values()),
+        "poses_after": sum(r["poses_after"] for r in report.values()),
+        "cost_before": sum(r["cost_before"] for r in report.values()),
+        "cost_after": sum(r["cost_after"] for r in report.values())
+    }
@@ -3,20 +3,31 @@ from maya import cmds as mc
 from maya import mel
 from maya.api import OpenMaya as om
 
+# pose manager
+from . import model
+
 # built-ins
 import json
 import math
 import traceback
 
-data_structure = {
-    "driver": "",
-    "driven": [],
-    "pose": {},
-    "controller": ""
-}
-
 l_mirror_token = "_L"
 r_mirror_token = "_R"
+# mirror 할 때 controller, driven 의 이 attribute 가 켜져 있으면 값을 뒤집습니다.
+inv_attributes = ("invTx", "invTy", "invTz", "invRx", "invRy", "invRz")
+
+# pose 의 driven offset 은 sparse 하게 저장합니다.
+# _data["pose"][pose]["driven"] 에 없는 driven 은 identity offset 입니다.
+identity_tolerance = 1e-6
+
+# driven topology
+# npo : driven 위에 _pm npo 를 만들고 blendMatrix -> decomposeMatrix -> npo.t, npo.r 로 연결합니다.
+# offsetParentMatrix : blendMatrix.outputMatrix -> driven.offsetParentMatrix 로 바로 연결합니다.
+topology_npo = "npo"
+topology_offset = "offsetParentMatrix"
+
+# 새 driven 에 사용할 topology
+driven_topology = topology_npo
 
 
 def initialize():
@@ -34,6 +45,331 @@ def set_data(data):
     mc.setAttr("pose_manager._data", json.dumps(data), type="string")
 
 
+def get_model():
+    """
+    :return: {interpolator name: model.Interpolator}
+    """
+    return model.from_data(get_data())
+
+
+def set_model(interpolators):
+    set_data(model.to_data(interpolators))
+
+
+def is_identity_offset(offset):
+    return all(abs(x) <= identity_tolerance for x in list(offset["t"]) + list(offset["r"]))
+
+
+def get_driven_offset(pose_data, driven):
+    """
+    sparse driven offset 을 읽습니다. 없으면 identity offset 을 반환합니다.
+
+    :param pose_data: _data[interpolator]["pose"][pose]
+    :param driven:
+    :return: {"t": [x, y, z], "r": [x, y, z]}
+    """
+    offset = pose_data["driven"].get(driven)
+    if offset is None:
+        return {"t": [0, 0, 0], "r": [0, 0, 0]}
+    return offset
+
+
+def sparse_data(data):
+    """
+    identity driven offset 을 제거합니다. 예전 dense data 를 변환할 때 사용합니다.
+
+    :param data: _data or pose file data
+    :return: new data
+    """
+    sparse = {}
+    for interpolator_name, interpolator_data in data.items():
+        sparse[interpolator_name] = dict(interpolator_data)
+        sparse[interpolator_name]["pose"] = {}
+        for pose, pose_data in interpolator_data["pose"].items():
+            sparse[interpolator_name]["pose"][pose] = dict(pose_data)
+            sparse[interpolator_name]["pose"][pose]["driven"] = {
+                k: v for k, v in pose_data["driven"].items() if not is_identity_offset(v)
+            }
+    return sparse
+
+
+def get_driven_topology(driven):
+    """
+    :param driven:
+    :return: topology_npo, topology_offset or None (setup 이 없을 때)
+    """
+    if mc.objExists(driven + "_pm"):
+        return topology_npo
+    blend_m = driven + "_bm"
+    if mc.objExists(blend_m) and mc.isConnected(blend_m + ".outputMatrix", driven + ".offsetParentMatrix"):
+        return topology_offset
+    return None
+
+
+def get_driven_parent(driven):
+    """
+    targetMatrix 를 계산할 때 기준이 되는 parent.
+    npo topology 는 npo 의 parent, offsetParentMatrix topology 는 driven 의 parent 입니다.
+    """
+    node = driven + "_pm" if mc.objExists(driven + "_pm") else driven
+    parent = mc.listRelatives(node, parent=True)
+    return parent[0] if parent else None
+
+
+def create_driven_setup(driven, blend_m, topology=None):
+    """
+    driven 과 blendMatrix 를 연결합니다. 이미 연결되어 있으면 그 topology 를 사용합니다.
+
+    :param driven:
+    :param blend_m:
+    :param topology: topology_npo or topology_offset. None 이면 driven_topology
+    :return: topology
+    """
+    current = get_driven_topology(driven)
+    if current:
+        return current
+    topology = topology or driven_topology
+
+    if topology == topology_npo:
+        parent = mc.listRelatives(driven, parent=True)
+        driven_npo = mc.createNode("transform", name=driven + "_pm", parent=parent[0] if parent else None)
+        m = mc.xform(driven, query=True, matrix=True, worldSpace=True)
+        mc.xform(driven_npo, matrix=m, worldSpace=True)
+        mc.parent(driven, driven_npo)
+
+        decom_m = mc.createNode("decomposeMatrix")
+        mc.connectAttr(blend_m + ".outputMatrix", decom_m + ".inputMatrix")
+        mc.connectAttr(decom_m + ".outputTranslate", driven_npo + ".t")
+        mc.connectAttr(decom_m + ".outputRotate", driven_npo + ".r")
+    else:
+        # 원래 offsetParentMatrix 를 rest 로 사용합니다.
+        mc.setAttr(blend_m + ".inputMatrix", mc.getAttr(driven + ".offsetParentMatrix"), type="matrix")
+        mc.connectAttr(blend_m + ".outputMatrix", driven + ".offsetParentMatrix", force=True)
+    return topology
+
+
+def connect_driven_setup(driven, blend_m, topology=None):
+    """
+    blendMatrix 를 driven 의 남아있는 setup 에 다시 연결합니다. setup 이 없으면 create_driven_setup 과 같습니다.
+    blendMatrix 를 새로 만들었는데 npo 가 남아있으면 create_driven_setup 은 연결하지 않고 return 합니다.
+
+    :param driven:
+    :param blend_m:
+    :param topology: setup 이 없을 때 사용합니다.
+    :return: topology
+    """
+    driven_npo = driven + "_pm"
+    if not mc.objExists(driven_npo):
+        return create_driven_setup(driven, blend_m, topology)
+
+    decom_m = mc.listConnections(driven_npo + ".t", source=True, destination=False, type="decomposeMatrix")
+    if decom_m:
+        decom_m = decom_m[0]
+    else:
+        decom_m = mc.createNode("decomposeMatrix")
+        mc.connectAttr(decom_m + ".outputTranslate", driven_npo + ".t", force=True)
+        mc.connectAttr(decom_m + ".outputRotate", driven_npo + ".r", force=True)
+    if not mc.isConnected(blend_m + ".outputMatrix", decom_m + ".inputMatrix"):
+        mc.connectAttr(blend_m + ".outputMatrix", decom_m + ".inputMatrix", force=True)
+    return topology_npo
+
+
+def remove_driven_setup(driven, reset=False):
+    """
+    driven 을 blendMatrix 에서 분리합니다. blendMatrix 는 지우지 않습니다.
+
+    :param driven:
+    :param reset: driven local matrix 를 identity 로 초기화
+    :return: 지워야 할 node list
+    """
+    return remove_driven_setups([driven], reset)
+
+
+def remove_driven_setups(drivens, reset=False):
+    """
+    여러 driven 을 blendMatrix 에서 분리합니다. parent 가 같은 driven 은 mc.parent 한 번으로 옮깁니다.
+
+    :param drivens:
+    :param reset: driven local matrix 를 identity 로 초기화
+    :return: 지워야 할 node list
+    """
+    delete_list = []
+    reparent = {}
+    drivens = list(dict.fromkeys(drivens))
+    for driven in drivens:
+        topology = get_driven_topology(driven)
+        if topology == topology_npo:
+            driven_npo = driven + "_pm"
+            parent = mc.listRelatives(driven_npo, parent=True)
+            reparent.setdefault(parent[0] if parent else None, []).append(driven)
+            delete_list.append(driven_npo)
+        elif topology == topology_offset:
+            blend_m = driven + "_bm"
+            mc.disconnectAttr(blend_m + ".outputMatrix", driven + ".offsetParentMatrix")
+            mc.setAttr(driven + ".offsetParentMatrix", mc.getAttr(blend_m + ".inputMatrix"), type="matrix")
+    for parent, children in reparent.items():
+        if parent:
+            mc.parent(children, parent)
+        else:
+            mc.parent(children, world=True)
+    if reset and drivens:
+        mc.xform(drivens, matrix=om.MMatrix(), worldSpace=False)
+    return delete_list
+
+
+def matrix_to_offset(m):
+    """
+    :param m: om.MMatrix
+    :return: {"t": [x, y, z], "r": [x, y, z]}
+    """
+    m = om.MTransformationMatrix(m)
+    return {"t": [x for x in m.translation(om.MSpace.kWorld)],
+            "r": [math.degrees(x) for x in m.rotation()]}
+
+
+def offset_to_matrix(offset):
+    """
+    :param offset: {"t": [x, y, z], "r": [x, y, z]}
+    :return: om.MMatrix
+    """
+    m = om.MTransformationMatrix()
+    m.setTranslation(om.MVector(offset["t"]), om.MSpace.kWorld)
+    m.setRotation(om.MEulerRotation([math.radians(x) for x in offset["r"]]))
+    return m.asMatrix()
+
+
+# _data 의 driven offset 은 topology 와 상관없이 driven rest 기준입니다.
+# driven world = local * rest * offset * parent
+# npo                : rest 는 driven 의 offsetParentMatrix, blendMatrix.inputMatrix 는 identity, targetMatrix = offset
+# offsetParentMatrix : rest 는 blendMatrix.inputMatrix (원래 offsetParentMatrix), targetMatrix = rest * offset
+def get_driven_rest(driven):
+    """
+    :param driven:
+    :return: om.MMatrix
+    """
+    if get_driven_topology(driven) == topology_offset:
+        return om.MMatrix(mc.getAttr(driven + "_bm.inputMatrix"))
+    return om.MMatrix(mc.getAttr(driven + ".offsetParentMatrix"))
+
+
+def offset_to_target(driven, offset):
+    """
+    :param driven:
+    :param offset: {"t", "r"} or om.MMatrix. driven rest 기준
+    :return: targetMatrix (om.MMatrix)
+    """
+    m = offset if isinstance(offset, om.MMatrix) else offset_to_matrix(offset)
+    return om.MMatrix(mc.getAttr(driven + "_bm.inputMatrix")) * m
+
+
+def target_to_offset(driven, m, input_matrix=None):
+    """
+    :param driven:
+    :param m: targetMatrix
+    :param input_matrix: blendMatrix.inputMatrix. 여러 target 을 읽을 때 한 번만 getAttr 합니다.
+    :return: {"t", "r"} driven rest 기준
+    """
+    if input_matrix is None:
+        input_matrix = mc.getAttr(driven + "_bm.inputMatrix")
+    return matrix_to_offset(om.MMatrix(input_matrix).inverse() * om.MMatrix(m))
+
+
+def set_pose_targets(blend_m, index, offset=None):
+    """
+    새 pose target 을 설정합니다. offset 이 없으면 rest 입니다. blendMatrix 의 기본 targetMatrix 는 identity 이므로
+    offsetParentMatrix topology 에서는 rest 로 채워야 pose 에서 driven 이 움직이지 않습니다.
+    """
+    driven = blend_m[:-len("_bm")]
+    m = offset_to_target(driven, offset) if offset is not None else om.MMatrix(mc.getAttr(blend_m + ".inputMatrix"))
+    mc.setAttr(blend_m + ".target[{0}].targetMatrix".format(index), m, type="matrix")
+
+
+def convert_driven_topology(driven, topology):
+    """
+    driven 의 topology 를 바꿉니다.
+    rest (offsetParentMatrix) 가 identity 가 아니면 targetMatrix 를 다시 계산합니다. _data 의 offset 은 rest 기준이므로 그대로입니다.
+
+    :param driven:
+    :param topology: topology_npo or topology_offset
+    """
+    current = get_driven_topology(driven)
+    if current is None:
+        mc.warning("Don't exists driven setup '{0}'".format(driven))
+        return
+    if current == topology:
+        return
+
+    blend_m = driven + "_bm"
+    driven_npo = driven + "_pm"
+
+    try:
+        mc.undoInfo(openChunk=True, infinity=True)
+
+        indexes = mc.getAttr(blend_m + ".target", multiIndices=True) or []
+        targets = {i: om.MMatrix(mc.getAttr(blend_m + ".target[{0}].targetMatrix".format(i))) for i in indexes}
+
+        if topology == topology_offset:
+            # npo -> offsetParentMatrix
+            # local * opm * target == local * target'
+            base = om.MMatrix(mc.getAttr(driven + ".offsetParentMatrix"))
+            decom_m = mc.listConnections(blend_m + ".outputMatrix", source=False, type="decomposeMatrix") or []
+            parent = mc.listRelatives(driven_npo, parent=True)
+            if parent:
+                mc.parent(driven, parent[0], relative=True)
+            else:
+                mc.parent(driven, world=True, relative=True)
+            mc.delete([driven_npo] + decom_m)
+            targets = {i: base * m for i, m in targets.items()}
+            mc.setAttr(blend_m + ".inputMatrix", base, type="matrix")
+            mc.connectAttr(blend_m + ".outputMatrix", driven + ".offsetParentMatrix", force=True)
+        else:
+            # offsetParentMatrix -> npo
+            # local * target == local * opm * target'
+            base = om.MMatrix(mc.getAttr(blend_m + ".inputMatrix"))
+            mc.disconnectAttr(blend_m + ".outputMatrix", driven + ".offsetParentMatrix")
+            mc.setAttr(driven + ".offsetParentMatrix", base, type="matrix")
+            parent = mc.listRelatives(driven, parent=True)
+            driven_npo = mc.createNode("transform", name=driven_npo, parent=parent[0] if parent else None)
+            mc.parent(driven, driven_npo, relative=True)
+            decom_m = mc.createNode("decomposeMatrix")
+            mc.connectAttr(blend_m + ".outputMatrix", decom_m + ".inputMatrix")
+            mc.connectAttr(decom_m + ".outputTranslate", driven_npo + ".t")
+            mc.connectAttr(decom_m + ".outputRotate", driven_npo + ".r")
+            targets = {i: base.inverse() * m for i, m in targets.items()}
+            mc.setAttr(blend_m + ".inputMatrix", om.MMatrix(), type="matrix")
+
+        for i, m in targets.items():
+            mc.setAttr(blend_m + ".target[{0}].targetMatrix".format(i), m, type="matrix")
+
+    except Exception:
+        traceback.print_exc()
+        mc.warning("Occur error convert_driven_topology '{0}' '{1}'. Returned to action".format(driven, topology))
+        mc.undoInfo(closeChunk=True)
+        mc.undo()
+    else:
+        mc.undoInfo(closeChunk=True)
+
+
+def convert_topology(topology):
+    """
+    모든 driven 의 topology 를 바꿉니다.
+
+    :param topology: topology_npo or topology_offset
+    """
+    if not mc.objExists("pose_manager"):
+        return
+    drivens = []
+    for interpolator_data in get_data().values():
+        drivens += [b.replace("_bm", "") for b in interpolator_data["driven"] if b.replace("_bm", "") not in drivens]
+
+    mc.undoInfo(openChunk=True, infinity=True)
+    try:
+        for driven in drivens:
+            convert_driven_topology(driven, topology)
+    finally:
+        mc.undoInfo(closeChunk=True)
+
+
 def add_driver(driver, controller):
     if not mc.objExists(driver):
         mc.warning("Don't exists : '{0}'".format(driver))
@@ -60,11 +396,7 @@ def add_driver(driver, controller):
 
         # add data
         data = get_data()
-        data[interpolator_name] = data_structure
-
-        data[interpolator_name]["driver"] = driver
-        data[interpolator_name]["controller"] = controller
-
+        data[interpolator_name] = model.Interpolator(interpolator_name, driver, controller).to_data()
         set_data(data)
     except:
         print(traceback.format_exc())
@@ -99,17 +431,13 @@ def add_pose(driver, pose):
 
         for blend_m in data[interpolator_name]["driven"]:
             mc.connectAttr(interpolator + ".output[{0}]".format(index), blend_m + ".target[{0}].weight".format(index))
-        driven = [k.replace("_bm", "") for k in data[interpolator_name]["driven"]]
-        driven_pos = {}
-        for d in driven:
-            driven_pos[d] = {}
-            driven_pos[d]["t"] = (0, 0, 0)
-            driven_pos[d]["r"] = (0, 0, 0)
+            set_pose_targets(blend_m, index)
 
+        # driven offset 은 identity 이므로 저장하지 않습니다.
         data[interpolator_name]["pose"][pose] = {
             "t": mc.getAttr(data[interpolator_name]["controller"] + ".t")[0],
             "r": mc.getAttr(data[interpolator_name]["controller"] + ".r")[0],
-            "driven": driven_pos
+            "driven": {}
         }
         set_data(data)
     except:
@@ -121,7 +449,7 @@ def add_pose(driver, pose):
         mc.undoInfo(closeChunk=True)
 
 
-def add_driven(driver, driven):
+def add_driven(driver, driven, topology=None):
     interpolator_name = driver + "_pmInterpolator"
     if not mc.objExists(interpolator_name):
         mc.warning("Don't exists '{0}' interpolator node '{1}'".format(driver, interpolator_name))
@@ -130,7 +458,6 @@ def add_driven(driver, driven):
 
     data = get_data()
 
-    driven_npo = driven + "_pm"
     blend_m = driven + "_bm"
 
     if blend_m in data[interpolator_name]["driven"]:
@@ -142,31 +469,16 @@ def add_driven(driver, driven):
     try:
         mc.undoInfo(openChunk=True, infinity=True)
         blend_m = mc.createNode("blendMatrix", name=blend_m) if not mc.objExists(blend_m) else blend_m
-
-        if not mc.objExists(driven_npo):
-            parent = mc.listRelatives(driven, parent=True)
-            driven_npo = mc.createNode("transform", name=driven_npo, parent=parent[0] if parent else None)
-            m = mc.xform(driven, query=True, matrix=True, worldSpace=True)
-            mc.xform(driven_npo, matrix=m, worldSpace=True)
-            mc.parent(driven, driven_npo)
-
-            decom_m = mc.createNode("decomposeMatrix")
-            mc.connectAttr(blend_m + ".outputMatrix", decom_m + ".inputMatrix")
-            mc.connectAttr(decom_m + ".outputTranslate", driven_npo + ".t")
-            mc.connectAttr(decom_m + ".outputRotate", driven_npo + ".r")
+        create_driven_setup(driven, blend_m, topology)
 
         for k, v in data[interpolator_name]["pose"].items():
             names = mc.poseInterpolator(interpolator, query=True, poseNames=True)
             indexes = mc.poseInterpolator(interpolator, query=True, index=True)
             index = indexes[names.index(k)]
 
-            data[interpolator_name]["pose"][k]["driven"][driven] = {}
-            data[interpolator_name]["pose"][k]["driven"][driven]["t"] = (0, 0, 0)
-            data[interpolator_name]["pose"][k]["driven"][driven]["r"] = (0, 0, 0)
             mc.connectAttr(interpolator + ".output[{0}]".format(index),
                            blend_m + ".target[{0}].weight".format(index))
-            m = [x for x in om.MMatrix()]
-            mc.setAttr(blend_m + ".target[{0}].targetMatrix".format(index), m, type="matrix")
+            set_pose_targets(blend_m, index)
         set_data(data)
     except Exception:
         print(traceback.format_exc())
@@ -218,7 +530,6 @@ def update_driven(driver, pose, driven):
     data = get_data()
 
     blend_m = driven + "_bm"
-    driven_npo = driven + "_pm"
 
     if blend_m not in data[interpolator_name]["driven"]:
         mc.warning("Don't exists blendMatrix '{0}' in _data".format(blend_m))
@@ -235,23 +546,23 @@ def update_driven(driver, pose, driven):
         indexes = mc.poseInterpolator(interpolator, query=True, index=True)
         index = indexes[names.index(pose)]
 
-        parent = mc.listRelatives(driven_npo, parent=True)
+        parent = get_driven_parent(driven)
         if parent:
-            parent_m = om.MMatrix(mc.xform(parent[0], query=True, matrix=True, worldSpace=True))
+            parent_m = om.MMatrix(mc.xform(parent, query=True, matrix=True, worldSpace=True))
         else:
             parent_m = om.MMatrix()
         driven_m = om.MMatrix(mc.xform(driven, query=True, matrix=True, worldSpace=True))
-        m = driven_m * parent_m.inverse()
+        # driven local 을 identity 로 초기화했을 때 rest * offset 이 되어야 하는 matrix
+        offset_m = get_driven_rest(driven).inverse() * driven_m * parent_m.inverse()
 
-        mc.setAttr(blend_m + ".target[{0}].targetMatrix".format(index), m, type="matrix")
+        set_pose_targets(blend_m, index, offset_m)
         mc.xform(driven, matrix=[x for x in om.MMatrix()], worldSpace=False)
 
-        m = om.MTransformationMatrix(m)
-        t = [x for x in m.translation(om.MSpace.kWorld)]
-        r = [math.degrees(x) for x in m.rotation()]
-
-        data[interpolator_name]["pose"][pose]["driven"][driven]["t"] = t
-        data[interpolator_name]["pose"][pose]["driven"][driven]["r"] = r
+        offset = matrix_to_offset(offset_m)
+        if is_identity_offset(offset):
+            data[interpolator_name]["pose"][pose]["driven"].pop(driven, None)
+        else:
+            data[interpolator_name]["pose"][pose]["driven"][driven] = offset
         set_data(data)
     except Exception:
         traceback.print_exc()
@@ -263,9 +574,24 @@ def update_driven(driver, pose, driven):
 
 
 def delete_driver(driver):
-    interpolator_name = driver + "_pmInterpolator"
-    if not mc.objExists(interpolator_name):
-        mc.warning("Don't exists '{0}' interpolator node '{1}'".format(driver, interpolator_name))
+    delete_drivers([driver])
+
+
+def delete_drivers(drivers):
+    """
+    여러 driver 를 지웁니다. reparent, delete, set_data 를 한 번씩 실행합니다.
+
+    :param drivers:
+    """
+    interpolator_names = []
+    for driver in drivers:
+        interpolator_name = driver + "_pmInterpolator"
+        if not mc.objExists(interpolator_name):
+            mc.warning("Don't exists '{0}' interpolator node '{1}'".format(driver, interpolator_name))
+            continue
+        if interpolator_name not in interpolator_names:
+            interpolator_names.append(interpolator_name)
+    if not interpolator_names:
         return
 
     data = get_data()
@@ -273,30 +599,26 @@ def delete_driver(driver):
     try:
         mc.undoInfo(openChunk=True, infinity=True)
 
-        delete_list = []
-        for blend_m in data[interpolator_name]["driven"]:
-            driven = blend_m.replace("_bm", "")
-
-            driven_npo = driven + "_pm"
-            parent = mc.listRelatives(driven_npo, parent=True)
-            if parent:
-                mc.parent(driven, parent[0])
-            else:
-                mc.parent(driven, world=True)
-            mc.xform(driven, matrix=om.MMatrix(), worldSpace=False)
-
-            delete_list.append(driven_npo)
+        # 남은 interpolator 가 같이 쓰는 blendMatrix 는 지우지 않습니다.
+        keep = {b for n, d in data.items() if n not in interpolator_names for b in d["driven"]}
+        blend_ms = []
+        for interpolator_name in interpolator_names:
+            for blend_m in data[interpolator_name]["driven"]:
+                if blend_m not in keep and blend_m not in blend_ms:
+                    blend_ms.append(blend_m)
+        delete_list = remove_driven_setups([b.replace("_bm", "") for b in blend_ms], reset=True)
 
-        mc.delete([interpolator_name] + delete_list + data[interpolator_name]["driven"])
+        mc.delete(interpolator_names + delete_list + blend_ms)
 
-        del data[interpolator_name]
+        for interpolator_name in interpolator_names:
+            del data[interpolator_name]
 
         set_data(data)
         if not data:
             mc.delete(initialize())
     except Exception:
         traceback.print_exc()
-        mc.warning("Occur error remove_driver '{0}'. Returned to action".format(driver))
+        mc.warning("Occur error remove_driver {0}. Returned to action".format(drivers))
         mc.undoInfo(closeChunk=True)
         mc.undo()
     else:
@@ -304,34 +626,64 @@ def delete_driver(driver):
 
 
 def delete_pose(driver, pose):
-    interpolator_name = driver + "_pmInterpolator"
-    if not mc.objExists(interpolator_name):
-        mc.warning("Don't exists '{0}' interpolator node '{1}'".format(driver, interpolator_name))
-        return
-    interpolator = mc.listRelatives(interpolator_name, shapes=True)[0]
+    delete_poses({driver: [pose]})
 
-    data = get_data()
 
-    if pose not in data[interpolator_name]["pose"]:
-        mc.warning("Don't exists '{0}' pose '{1}'".format(driver, pose))
+def delete_poses(poses, drivers=None):
+    """
+    여러 pose 를 지웁니다. set_data 는 한 번만 실행합니다.
+
+    delete_poses({"jaw": ["open", "wide"], "lip_L": ["up"]})
+    delete_poses(["open"], drivers=["jaw", "lip_L"])
+    delete_poses(["open"])  # 모든 driver 의 open pose
+
+    :param poses: {driver: [pose]} or [pose]
+    :param drivers: poses 가 list 일 때 대상 driver. None 이면 그 pose 를 가진 모든 driver
+    """
+    if not mc.objExists("pose_manager"):
         return
+    data = get_data()
 
-    if pose not in mc.poseInterpolator(interpolator, query=True, poseNames=True):
-        mc.warning("Don't exists '{0}' pose '{1}'".format(driver, pose))
+    if isinstance(poses, dict):
+        targets = {d + "_pmInterpolator": list(p) for d, p in poses.items()}
+    elif drivers is None:
+        targets = {k: [p for p in poses if p in v["pose"]] for k, v in data.items()}
+        targets = {k: v for k, v in targets.items() if v}
+    else:
+        targets = {d + "_pmInterpolator": list(poses) for d in drivers}
+
+    shapes = {}
+    for interpolator_name, pose_names in list(targets.items()):
+        driver = interpolator_name.replace("_pmInterpolator", "")
+        if not mc.objExists(interpolator_name) or interpolator_name not in data:
+            mc.warning("Don't exists '{0}' interpolator node '{1}'".format(driver, interpolator_name))
+            del targets[interpolator_name]
+            continue
+        interpolator = mc.listRelatives(interpolator_name, shapes=True)[0]
+        scene_poses = mc.poseInterpolator(interpolator, query=True, poseNames=True) or []
+        for pose in list(pose_names):
+            if pose not in data[interpolator_name]["pose"] or pose not in scene_poses:
+                mc.warning("Don't exists '{0}' pose '{1}'".format(driver, pose))
+                pose_names.remove(pose)
+        shapes[interpolator_name] = interpolator
+    if not any(targets.values()):
         return
 
     try:
         mc.undoInfo(openChunk=True, infinity=True)
 
-        index = mc.poseInterpolator(interpolator, edit=True, deletePose=pose)
-        for blend_m in data[interpolator_name]["driven"]:
-            mc.removeMultiInstance(blend_m + ".target[{0}]".format(index))
-        del data[interpolator_name]["pose"][pose]
+        for interpolator_name, pose_names in targets.items():
+            interpolator = shapes[interpolator_name]
+            for pose in pose_names:
+                index = mc.poseInterpolator(interpolator, edit=True, deletePose=pose)
+                for blend_m in data[interpolator_name]["driven"]:
+                    mc.removeMultiInstance(blend_m + ".target[{0}]".format(index))
+                del data[interpolator_name]["pose"][pose]
 
         set_data(data)
     except Exception:
         traceback.print_exc()
-        mc.warning("Occur error edit_driven '{0}' '{1}'. Returned to action".format(driver, pose))
+        mc.warning("Occur error delete_poses {0}. Returned to action".format(targets))
         mc.undoInfo(closeChunk=True)
         mc.undo()
     else:
@@ -339,43 +691,59 @@ def delete_pose(driver, pose):
 
 
 def delete_driven(driver, driven):
-    interpolator_name = driver + "_pmInterpolator"
-    if not mc.objExists(interpolator_name):
-        mc.warning("Don't exists '{0}' interpolator node '{1}'".format(driver, interpolator_name))
-        return
+    delete_drivens([driven], drivers=[driver])
 
-    data = get_data()
 
-    blend_m = driven + "_bm"
-    driven_npo = driven + "_pm"
-    if not mc.objExists(blend_m):
-        mc.warning("Don't exists '{0}'".format(blend_m))
-        return
-    if not mc.objExists(driven_npo):
-        mc.warning("Don't exists '{0}'".format(driven_npo))
+def delete_drivens(drivens, drivers=None):
+    """
+    여러 driven 을 지웁니다. reparent, delete, set_data 를 한 번씩 실행합니다.
+
+    :param drivens:
+    :param drivers: None 이면 driven 을 가진 driver 를 찾습니다.
+    """
+    if not mc.objExists("pose_manager"):
         return
-    if blend_m not in data[interpolator_name]["driven"]:
-        mc.warning("Don't exists '{0}' in _data".format(blend_m))
+    data = get_data()
+
+    interpolator_names = [d + "_pmInterpolator" for d in drivers] if drivers is not None else list(data)
+    for interpolator_name in interpolator_names:
+        if not mc.objExists(interpolator_name) or interpolator_name not in data:
+            mc.warning("Don't exists '{0}' interpolator node '{1}'".format(
+                interpolator_name.replace("_pmInterpolator", ""), interpolator_name))
+    interpolator_names = [n for n in interpolator_names if mc.objExists(n) and n in data]
+
+    targets = []
+    for driven in drivens:
+        blend_m = driven + "_bm"
+        owners = [n for n in interpolator_names if blend_m in data[n]["driven"]]
+        if not mc.objExists(blend_m):
+            mc.warning("Don't exists '{0}'".format(blend_m))
+            continue
+        if not get_driven_topology(driven):
+            mc.warning("Don't exists driven setup '{0}'".format(driven))
+            continue
+        if not owners:
+            mc.warning("Don't exists '{0}' in _data".format(blend_m))
+            continue
+        targets.append((driven, owners))
+    if not targets:
         return
 
     try:
         mc.undoInfo(openChunk=True, infinity=True)
 
-        parent = mc.listRelatives(driven_npo, parent=True)
-        if parent:
-            mc.parent(driven, parent[0])
-        else:
-            mc.parent(driven, world=True)
-
-        mc.delete([blend_m, driven_npo])
+        delete_list = remove_driven_setups([driven for driven, _ in targets])
+        mc.delete([driven + "_bm" for driven, _ in targets] + delete_list)
 
-        data[interpolator_name]["driven"].remove(blend_m)
-        for v in data[interpolator_name]["pose"].values():
-            del v["driven"][driven]
+        for driven, owners in targets:
+            for interpolator_name in owners:
+                data[interpolator_name]["driven"].remove(driven + "_bm")
+                for v in data[interpolator_name]["pose"].values():
+                    v["driven"].pop(driven, None)
         set_data(data)
     except Exception:
         traceback.print_exc()
-        mc.warning("Occur error remove_driven '{0}' '{1}'. Returned to action".format(driver, driven))
+        mc.warning("Occur error remove_driven {0}. Returned to action".format([driven for driven, _ in targets]))
         mc.undoInfo(closeChunk=True)
         mc.undo()
     else:
@@ -422,98 +790,55 @@ def mirror_driver(driver):
         mc.setAttr(interpolator + ".interpolation", 1)
 
         # target interpolator in _data
-        data[target_interpolator_name] = {}
-        data[target_interpolator_name]["driver"] = target_driver
-        data[target_interpolator_name]["controller"] = target_controller
-        data[target_interpolator_name]["driven"] = []
-        data[target_interpolator_name]["pose"] = {}
-
-        for pose, v in data[source_interpolator_name]["pose"].items():
+        source = model.Interpolator.from_data(source_interpolator_name, data[source_interpolator_name])
+        target = model.Interpolator(target_interpolator_name, target_driver, target_controller)
+
+        # get inv target driver pose
+        # rule is controller attribute
+        controller_inv = [-1 if mc.getAttr(source.controller + "." + attr) else 1 for attr in inv_attributes]
+
+        # get inv target driven pose
+        # rule is driven attribute
+        drivens = []
+        for source_driven in source.drivens:
+            target_driven = source_driven.replace(source_side, target_side)
+            if not mc.objExists(target_driven):
+                mc.warning("Don't exists target driven '{0}'".format(target_driven))
+                continue
+            driven_inv = [-1 if mc.getAttr(source_driven + "." + attr) else 1 for attr in inv_attributes]
+            drivens.append((source_driven, target_driven, driven_inv))
+
+        for pose in source.poses.values():
             # add pose
-            data[target_interpolator_name]["pose"][pose] = {"driven": {}}
-
-            # get inv target driver pose
-            # rule is controller attribute
-            inv_tx = -1 if mc.getAttr(data[source_interpolator_name]["controller"] + ".invTx") else 1
-            inv_ty = -1 if mc.getAttr(data[source_interpolator_name]["controller"] + ".invTy") else 1
-            inv_tz = -1 if mc.getAttr(data[source_interpolator_name]["controller"] + ".invTz") else 1
-            inv_rx = -1 if mc.getAttr(data[source_interpolator_name]["controller"] + ".invRx") else 1
-            inv_ry = -1 if mc.getAttr(data[source_interpolator_name]["controller"] + ".invRy") else 1
-            inv_rz = -1 if mc.getAttr(data[source_interpolator_name]["controller"] + ".invRz") else 1
-
-            source_t = data[source_interpolator_name]["pose"][pose]["t"]
-            target_t = [source_t[0] * inv_tx, source_t[1] * inv_ty, source_t[2] * inv_tz]
-
-            source_r = data[source_interpolator_name]["pose"][pose]["r"]
-            target_r = [source_r[0] * inv_rx, source_r[1] * inv_ry, source_r[2] * inv_rz]
-
-            mc.setAttr(target_controller + ".t", *target_t)
-            mc.setAttr(target_controller + ".r", *target_r)
-            index = mc.poseInterpolator(interpolator, edit=True, addPose=pose)
-            mc.setAttr(interpolator + ".pose[{0}].poseType".format(index), 1)
+            target_tr = [v * inv for v, inv in zip(pose.tr, controller_inv)]
+            target_pose = target.add_pose(pose.name, target_tr[:3], target_tr[3:])
 
-            # add pose in _data
-            data[target_interpolator_name]["pose"][pose]["t"] = target_t
-            data[target_interpolator_name]["pose"][pose]["r"] = target_r
-            for source_driven in v["driven"].keys():
-                # add driven
-                target_driven = source_driven.replace(source_side, target_side)
-                if not mc.objExists(target_driven):
-                    mc.warning("Don't exists target driven '{0}'".format(target_driven))
-                    continue
+            mc.setAttr(target_controller + ".t", *target_pose.t)
+            mc.setAttr(target_controller + ".r", *target_pose.r)
+            index = mc.poseInterpolator(interpolator, edit=True, addPose=pose.name)
+            mc.setAttr(interpolator + ".pose[{0}].poseType".format(index), 1)
 
+            for source_driven, target_driven, driven_inv in drivens:
                 # add blendMatrix
                 target_blend_m = target_driven + "_bm"
                 if not mc.objExists(target_blend_m):
                     target_blend_m = mc.createNode("blendMatrix", name=target_blend_m)
 
-                # get inv target driven pose
-                # rule is controller attribute
-                inv_tx = -1 if mc.getAttr(source_driven + ".invTx") else 1
-                inv_ty = -1 if mc.getAttr(source_driven + ".invTy") else 1
-                inv_tz = -1 if mc.getAttr(source_driven + ".invTz") else 1
-                inv_rx = -1 if mc.getAttr(source_driven + ".invRx") else 1
-                inv_ry = -1 if mc.getAttr(source_driven + ".invRy") else 1
-                inv_rz = -1 if mc.getAttr(source_driven + ".invRz") else 1
-
-                source_t = v["driven"][source_driven]["t"]
-                target_t = [source_t[0] * inv_tx, source_t[1] * inv_ty, source_t[2] * inv_tz]
+                target_tr = [v * inv for v, inv in zip(pose.offset(source_driven).tr, driven_inv)]
 
-                source_r = v["driven"][source_driven]["r"]
-                target_r = [source_r[0] * inv_rx, source_r[1] * inv_ry, source_r[2] * inv_rz]
+                # add driven npo or offsetParentMatrix connection. source 와 같은 topology 를 사용합니다.
+                # targetMatrix 는 inputMatrix (rest) 를 설정한 다음에 계산합니다.
+                create_driven_setup(target_driven, target_blend_m, get_driven_topology(source_driven))
 
-                target_m = om.MTransformationMatrix()
-                target_m.setTranslation(om.MVector(target_t), om.MSpace.kWorld)
-                target_m.setRotation(om.MEulerRotation([math.radians(x) for x in target_r]))
-
-                mc.setAttr(target_blend_m + ".target[{0}].targetMatrix".format(index),
-                           target_m.asMatrix(),
-                           type="matrix")
+                # add driven in _data
+                target_offset = target_pose.set_offset(target_driven, target_tr[:3], target_tr[3:])
+                set_pose_targets(target_blend_m, index, target_offset.to_data())
                 mc.connectAttr(interpolator + ".output[{0}]".format(index),
                                target_blend_m + ".target[{0}].weight".format(index))
 
-                # add driven in _data
-                data[target_interpolator_name]["pose"][pose]["driven"][target_driven] = {}
-                data[target_interpolator_name]["pose"][pose]["driven"][target_driven]["t"] = target_t
-                data[target_interpolator_name]["pose"][pose]["driven"][target_driven]["r"] = target_r
-
-                # add driven npo
-                driven_npo = target_driven + "_pm"
-                if not mc.objExists(driven_npo):
-                    parent = mc.listRelatives(target_driven, parent=True)
-                    driven_npo = mc.createNode("transform", name=driven_npo, parent=parent[0] if parent else None)
-                    m = mc.xform(target_driven, query=True, matrix=True, worldSpace=True)
-                    mc.xform(driven_npo, matrix=m, worldSpace=True)
-                    mc.parent(target_driven, driven_npo)
-
-                    decom_m = mc.createNode("decomposeMatrix")
-                    mc.connectAttr(target_blend_m + ".outputMatrix", decom_m + ".inputMatrix")
-                    mc.connectAttr(decom_m + ".outputTranslate", driven_npo + ".t")
-                    mc.connectAttr(decom_m + ".outputRotate", driven_npo + ".r")
-
                 # add blendMatrix in _data
-                if target_blend_m not in data[target_interpolator_name]["driven"]:
-                    data[target_interpolator_name]["driven"].append(target_blend_m)
+                target.add_driven(target_driven)
+        data[target_interpolator_name] = target.to_data()
         set_data(data)
     except Exception:
         traceback.print_exc()
@@ -0,0 +1,258 @@
+"""
+frame 범위의 pose weight 와 driven transform 을 bake 합니다.
+
+    from posemanager import bake
+    result = bake.bake(1, 120)
+    bake.write("shot.pmbk", result)
+    bake.key(result)
+
+controller 는 frame 마다 .t, .r 을 한 번씩 읽습니다. getAttr 의 time flag 를 사용하므로 currentTime 을 바꾸지 않습니다.
+weight 와 driven transform 은 solver 로 계산합니다. source="scene" 이면 weight 는 poseInterpolator output 을 읽습니다.
+driven transform 은 rest 기준 offset 입니다 (npo topology 의 driven_pm 아래 local transform).
+driven 이 여러 interpolator 에 있으면 data 순서대로 이어서 보간합니다.
+
+file layout (little endian, array 는 64 byte align)
+header
+    magic "PMBK", version u32, frame count u32, interpolator count u32, start f64, step f64,
+    name table offset u64, name count u32, driven count u32, directory offset u64,
+    driven names offset u64 (u32 x D), transforms offset u64 (f32 x D x F x 8 : tx ty tz 0 qx qy qz qw)
+directory (interpolator 마다 32 byte)
+    name u32, pose count u32, pad u64, pose names offset u64 (u32 x P), weights offset u64 (f32 x F x P)
+name table
+    export.NameTable 과 같습니다.
+"""
+# maya
+from maya import cmds as mc
+
+# pose manager
+from . import api
+from . import model
+from . import solver
+from . import export
+
+# built-ins
+import struct
+import traceback
+from array import array
+
+magic = b"PMBK"
+version = 1
+bake_node = "pose_manager_bake"
+
+_header = struct.Struct("<4sIIIddQIIQQQ8x")
+_entry = struct.Struct("<II8xQQ")
+
+
+def frame_range(start=None, end=None, step=1.0):
+    start = mc.playbackOptions(query=True, minTime=True) if start is None else start
+    end = mc.playbackOptions(query=True, maxTime=True) if end is None else end
+    count = int(round((end - start) / step)) + 1
+    return [start + step * i for i in range(max(count, 0))]
+
+
+def sample_controllers(controllers, frames):
+    """
+    :param controllers: controller list
+    :param frames: frame list
+    pose 는 controller 의 .t / .r 로 저장하므로 같은 값을 읽습니다. .matrix 는 jointOrient, rotateOrder, pivot 이 들어가서 다릅니다.
+    frame 마다 .t, .r compound 를 한 번씩 읽습니다.
+
+    :return: {controller: [(t, q), ...]} frame 순서
+    """
+    samples = {}
+    for c in controllers:
+        samples[c] = [(list(mc.getAttr(c + ".t", time=f)[0]),
+                       solver.euler_to_quaternion(list(mc.getAttr(c + ".r", time=f)[0]))) for f in frames]
+    return samples
+
+
+def sample_weights(interpolator, frames):
+    """
+    poseInterpolator output 을 frame 마다 한 번에 읽습니다.
+
+    :param interpolator: model.Interpolator
+    :return: [[weight, ...], ...] frame 순서, pose 순서
+    """
+    shape = mc.listRelatives(interpolator.name, shapes=True)[0]
+    names = mc.poseInterpolator(shape, query=True, poseNames=True) or []
+    indexes = mc.poseInterpolator(shape, query=True, index=True) or []
+    output_indexes = mc.getAttr(shape + ".output", multiIndices=True) or []
+    column = {n: i for n, i in zip(names, indexes)}
+    order = [output_indexes.index(column[p]) if column.get(p) in output_indexes else None for p in interpolator.poses]
+
+    weights = []
+    for f in frames:
+        output = mc.getAttr(shape + ".output", time=f) or []
+        weights.append([output[i] if i is not None and i < len(output) else 0.0 for i in order])
+    return weights
+
+
+def bake(start=None, end=None, step=1.0, data=None, falloffs=None, source="solver"):
+    """
+    :param start: None 이면 playback min
+    :param end: None 이면 playback max
+    :param step: frame step
+    :param data: None 이면 api.get_data()
+    :param falloffs: {interpolator name: {pose: falloff}}. None 이면 scene 에서 읽습니다.
+    :param source: "solver" or "scene"
+    :return: {"start", "step", "frames": [frame],
+              "interpolators": {name: {"poses": [pose], "weights": array F x P}},
+              "drivens": {driven: array F x 8}}
+    """
+    data = api.get_data() if data is None else data
+    interpolators = model.from_data(data)
+    if falloffs is None and source == "solver":
+        falloffs = export.collect_falloffs(data)
+    falloffs = falloffs or {}
+    frames = frame_range(start, end, step)
+
+    # controller 는 여러 interpolator 에서 같이 쓸 수 있으므로 한 번만 읽습니다.
+    controllers = sorted({i.controller for i in interpolators.values()})
+    samples = sample_controllers(controllers, frames) if source == "solver" else {}
+
+    result = {"start": frames[0] if frames else 0.0, "step": step, "frames": frames,
+              "interpolators": {}, "drivens": {}}
+    transforms = {}
+    for interpolator in interpolators.values():
+        if source == "solver":
+            pose_falloffs = falloffs.get(interpolator.name, {})
+            pose_solver = solver.PoseSolver(solver.interpolator_targets(interpolator),
+                                            [pose_falloffs.get(p, export.default_falloff) for p in interpolator.poses])
+            weights = [pose_solver.weights(t, q) for t, q in samples[interpolator.controller]]
+        else:
+            weights = sample_weights(interpolator, frames)
+        result["interpolators"][interpolator.name] = {
+            "poses": list(interpolator.poses),
+            "weights": array("f", [w for frame_weights in weights for w in frame_weights])
+        }
+
+        for driven in interpolator.drivens:
+            offsets = solver.interpolator_offsets(interpolator, driven)
+            rests = transforms.get(driven) or [solver.blend([], [])] * len(frames)
+            transforms[driven] = [solver.blend(offsets, w, rest) for w, rest in zip(weights, rests)]
+
+    for driven, values in transforms.items():
+        result["drivens"][driven] = array("f", [x for t, q in values for x in list(t) + [0.0] + list(q)])
+    return result
+
+
+def write(file_path, result):
+    """
+    :param result: bake result
+    :return: file_path
+    """
+    names = export.NameTable()
+    interpolators = result["interpolators"]
+    drivens = list(result["drivens"])
+    buffer = export.Buffer(_header.size + _entry.size * len(interpolators))
+
+    entries = []
+    for name, value in interpolators.items():
+        entries.append((
+            names.index(name),
+            len(value["poses"]),
+            buffer.append(export.uint_bytes([names.index(p) for p in value["poses"]])),
+            buffer.append(export.float_bytes(value["weights"]))
+        ))
+    driven_names_offset = buffer.append(export.uint_bytes([names.index(d) for d in drivens]))
+    transforms_offset = buffer.append(b"".join(export.float_bytes(result["drivens"][d]) for d in drivens))
+    name_table_offset = buffer.append(names.to_bytes())
+
+    _header.pack_into(buffer.data, 0, magic, version, len(result["frames"]), len(interpolators),
+                      result["start"], result["step"], name_table_offset, len(names.names), len(drivens),
+                      _header.size, driven_names_offset, transforms_offset)
+    for i, entry in enumerate(entries):
+        _entry.pack_into(buffer.data, _header.size + _entry.size * i, *entry)
+
+    with open(file_path, "wb") as f:
+        f.write(buffer.data)
+    return file_path
+
+
+def read(file_path):
+    """
+    :return: bake result
+    """
+    with open(file_path, "rb") as f:
+        buffer = f.read()
+
+    header = _header.unpack_from(buffer, 0)
+    if header[0] != magic:
+        raise ValueError("Not pose bake file '{0}'".format(file_path))
+    (_, _, frame_count, count, start, step, name_offset, name_count, driven_count,
+     directory_offset, driven_names_offset, transforms_offset) = header
+    names = export.read_name_table(buffer, name_offset, name_count)
+
+    def floats(offset, size):
+        return array("f", struct.unpack_from("<%df" % size, buffer, offset))
+
+    result = {"start": start, "step": step, "frames": [start + step * i for i in range(frame_count)],
+              "interpolators": {}, "drivens": {}}
+    for i in range(count):
+        name, pose_count, pose_names, weights = _entry.unpack_from(buffer, directory_offset + _entry.size * i)
+        result["interpolators"][names[name]] = {
+            "poses": [names[n] for n in struct.unpack_from("<%dI" % pose_count, buffer, pose_names)],
+            "weights": floats(weights, frame_count * pose_count)
+        }
+    stride = frame_count * 8
+    for i, n in enumerate(struct.unpack_from("<%dI" % driven_count, buffer, driven_names_offset)):
+        result["drivens"][names[n]] = floats(transforms_offset + i * stride * 4, stride)
+    return result
+
+
+def key(result, node=bake_node):
+    """
+    bake 결과를 node 의 attribute 에 key 합니다. driven 의 blendMatrix 연결은 건드리지 않습니다.
+
+    weight : <interpolator>_<pose>
+    driven : <driven>_tx ... <driven>_rz (xyz euler degrees)
+
+    :return: node
+    """
+    frames = result["frames"]
+    mc.undoInfo(openChunk=True, infinity=True)
+    try:
+        if not mc.objExists(node):
+            mc.createNode("transform", name=node)
+
+        curves = []
+        for interpolator_name, value in result["interpolators"].items():
+            poses = value["poses"]
+            weights = value["weights"]
+            for p, pose in enumerate(poses):
+                curves.append(("{0}_{1}".format(interpolator_name, pose),
+                               [weights[i * len(poses) + p] for i in range(len(frames))]))
+        for driven, values in result["drivens"].items():
+            channels = [[] for _ in range(6)]
+            for i in range(len(frames)):
+                t = values[i * 8:i * 8 + 3]
+                r = solver.quaternion_to_euler(values[i * 8 + 4:i * 8 + 8])
+                for c, v in enumerate(list(t) + r):
+                    channels[c].append(v)
+            for channel, keys in zip(("tx", "ty", "tz", "rx", "ry", "rz"), channels):
+                curves.append(("{0}_{1}".format(driven, channel), keys))
+
+        for attr, _ in curves:
+            if not mc.objExists(node + "." + attr):
+                mc.addAttr(node, longName=attr, attributeType="double", keyable=True)
+        # 이전 bake 의 curve 는 지우고 새로 만듭니다.
+        old_curves = mc.listConnections([node + "." + attr for attr, _ in curves],
+                                        source=True, destination=False, type="animCurveTU") or []
+        if old_curves:
+            mc.delete(list(set(old_curves)))
+
+        # attribute 마다 animCurve 하나를 만들고 keyTimeValue 를 setAttr 한 번으로 씁니다.
+        for attr, keys in curves:
+            curve = mc.createNode("animCurveTU", name="{0}_{1}".format(node, attr))
+            if frames:
+                ktv = [x for frame, v in zip(frames, keys) for x in (frame, v)]
+                mc.setAttr(curve + ".ktv[0:{0}]".format(len(frames) - 1), *ktv)
+            mc.connectAttr(curve + ".output", node + "." + attr, force=True)
+    except Exception:
+        traceback.print_exc()
+        mc.undoInfo(closeChunk=True)
+        mc.undo()
+        return None
+    else:
+        mc.undoInfo(closeChunk=True)
+    return node
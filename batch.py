@@ -0,0 +1,174 @@
+"""
+headless batch build with mayapy.
+
+    mayapy -m posemanager.batch manifest.json --workers 4 --report report.json
+
+manifest 는 job list 입니다.
+
+    [
+        {"scene": "char_a.ma", "pose": "face.pose"},
+        {"scene": "char_b.ma", "pose": "face.pose", "output": "char_b_pose.ma", "validate": false},
+        {"scene": "char_c.ma", "pose": "face.pose", "name_map": "char_c.json"},
+        {"scene": "char_d.ma", "pose": "face.pose", "isolated": true}
+    ]
+
+job 마다 scene 을 열고 io.load, check.scan 을 실행한 다음 저장합니다.
+validate 에서 issue 가 나오면 저장하지 않고 실패로 기록합니다.
+name_map 이 있으면 retarget name map 으로 이름을 바꿔서 적용합니다. 없는 이름이 있으면 scene 을 수정하지 않고 실패로 기록합니다.
+isolated 이면 interpolator 마다 따로 만들고 실패한 interpolator 만 issue 로 기록합니다 (io.load_isolated).
+나머지는 저장하지만 job 은 실패로 기록됩니다.
+
+--cache 를 주면 parse 한 .pose file 을 그 directory 에 cache 합니다 (cache.PoseCache).
+같은 file 을 읽는 job 은 network share 에서 다시 읽거나 parse 하지 않습니다. worker process 가 같은 directory 를 같이 씁니다.
+"""
+# maya
+from maya import cmds as mc
+
+# pose manager
+from . import io as pm_io
+from . import check
+from . import retarget
+from . import cache as pm_cache
+
+# built-ins
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+default_options = {
+    "output": None,
+    "validate": True,
+    "save": True,
+    "name_map": None,
+    "isolated": False,
+    "cache": None
+}
+
+
+def initialize_worker():
+    # worker process 마다 한 번 실행됩니다.
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+    try:
+        mc.loadPlugin("poseInterpolator", quiet=True)
+    except RuntimeError:
+        pass
+
+
+def run_job(job):
+    """
+    :param job: {"scene": str, "pose": str, "output": str, "validate": bool, "save": bool, "name_map": str,
+                 "isolated": bool, "cache": str}
+    :return: {"scene", "pose", "ok", "time", "issues", "error"}
+    """
+    options = dict(default_options)
+    options.update(job)
+    result = {"scene": job["scene"], "pose": job["pose"], "ok": False, "time": 0.0, "issues": [], "error": ""}
+
+    start = time.perf_counter()
+    try:
+        mc.file(job["scene"], open=True, force=True, prompt=False)
+        name_map = retarget.read(options["name_map"]) if options["name_map"] else None
+        pose_cache = pm_cache.PoseCache(options["cache"]) if options["cache"] else None
+        failed = {}
+        if options["isolated"]:
+            load_report = pm_io.load_isolated(job["pose"], name_map=name_map, cache=pose_cache)
+            data = load_report["data"] if load_report else None
+            failed = load_report["failed"] if load_report else {}
+        else:
+            data = pm_io.load(job["pose"], name_map=name_map, cache=pose_cache)
+        if data is None:
+            report = retarget.resolve(pm_io.read(job["pose"], pose_cache), name_map, mc.objExists)
+            result["issues"] = [{"type": "unmapped_name", "interpolator": "",
+                                 "message": "{0} '{1}' -> '{2}'".format(kind, source, target)}
+                                for kind, source, target in report["missing"]]
+            result["issues"] += [{"type": "duplicate_name", "interpolator": "",
+                                  "message": "'{0}' <- {1}".format(target, sources)}
+                                 for target, sources in report["duplicate"]]
+        else:
+            result["issues"] = [{"type": "build_failed", "interpolator": k, "message": v.strip().splitlines()[-1]}
+                                for k, v in failed.items()]
+        if data is not None and options["validate"]:
+            result["issues"] += check.scan()
+            loaded = set(check.collect_scene()[0])
+            result["issues"] += [{"type": "not_loaded", "interpolator": k, "message": "interpolator not built"}
+                                 for k in data if k not in loaded and k not in failed]
+
+        # isolated 이면 실패한 interpolator 를 뺀 나머지는 저장합니다.
+        blocking = [i for i in result["issues"] if i["type"] != "build_failed"]
+        if data is not None and not blocking and options["save"]:
+            if options["output"]:
+                mc.file(rename=options["output"])
+            mc.file(save=True, force=True)
+        result["ok"] = not result["issues"]
+    except Exception:
+        result["error"] = traceback.format_exc()
+    result["time"] = time.perf_counter() - start
+    return result
+
+
+def run(jobs, workers=None):
+    """
+    :param jobs: manifest job list
+    :param workers: process 수. None 이면 cpu 수
+    :return: result list. jobs 와 같은 순서입니다.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(jobs)) or 1
+    if workers == 1:
+        initialize_worker()
+        return [run_job(job) for job in jobs]
+
+    # maya 는 fork 하면 안전하지 않으므로 spawn 을 사용합니다.
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(workers, initializer=initialize_worker, maxtasksperchild=None) as pool:
+        return pool.map(run_job, jobs, chunksize=1)
+
+
+def print_summary(results, elapsed):
+    for result in results:
+        status = "ok" if result["ok"] else "FAILED"
+        print("{0:<7} {1:>8.2f}s  {2}  <-  {3}".format(status, result["time"], result["scene"], result["pose"]))
+        for issue in result["issues"]:
+            print("        {0:<22} {1:<40} {2}".format(issue["type"], issue["interpolator"], issue["message"]))
+        if result["error"]:
+            print("        " + result["error"].strip().replace("\n", "\n        "))
+    failed = len([r for r in results if not r["ok"]])
+    print("{0} job(s), {1} failed, {2:.2f}s wall, {3:.2f}s job total".format(
+        len(results), failed, elapsed, sum(r["time"] for r in results)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="mayapy -m posemanager.batch")
+    parser.add_argument("manifest", help="json job list")
+    parser.add_argument("--workers", type=int, default=None, help="default cpu count")
+    parser.add_argument("--report", help="write results to this json")
+    parser.add_argument("--cache", help="parsed pose file cache directory")
+    args = parser.parse_args(argv)
+
+    with open(args.manifest, "r", encoding="UTF-8") as f:
+        jobs = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(args.manifest))
+    for job in jobs:
+        for key in ("scene", "pose", "output", "name_map"):
+            if job.get(key):
+                job[key] = os.path.join(base_dir, job[key])
+        if args.cache:
+            job.setdefault("cache", os.path.abspath(args.cache))
+
+    start = time.perf_counter()
+    results = run(jobs, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    print_summary(results, elapsed)
+
+    if args.report:
+        with open(args.report, "w", encoding="UTF-8") as f:
+            json.dump({"time": elapsed, "jobs": results}, f, indent=2, ensure_ascii=False)
+    return 0 if all(r["ok"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+"""
+benchmark of api / io without maya.
+
+    python -m posemanager.bench
+    python -m posemanager.bench --drivers 20 --poses 10 --drivens 8 --save-baseline bench.json
+    python -m posemanager.bench --baseline bench.json
+
+fake_maya 가 maya.cmds, maya.mel, maya.api.OpenMaya 를 대신합니다.
+baseline 보다 maya.cmds 호출 수나 시간이 tolerance 이상 늘어나면 exit code 1 로 끝납니다.
+"""
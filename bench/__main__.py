@@ -0,0 +1,232 @@
+# built-ins
+import abc
+import argparse
+import importlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+# pose manager
+from . import fake_maya
+
+package = __package__.rsplit(".", 1)[0]
+
+
+def build_rig(cmds, drivers, drivens, sides=("_L", "_R")):
+    """
+    driver, controller, driven 을 만듭니다. inv attribute 는 x 축을 뒤집습니다.
+    driver 는 controller 아래에 두어 controller 를 따라가게 합니다.
+    """
+    for side in sides:
+        for i in range(drivers):
+            controller = cmds.createNode("transform", name="ctl{0}{1}".format(i, side))
+            cmds.createNode("joint", name="drv{0}{1}".format(i, side), parent=controller)
+            for d in range(drivens):
+                group = cmds.createNode("transform", name="grp{0}_{1}{2}".format(i, d, side))
+                cmds.xform(group, translation=(i, d, 0))
+                cmds.createNode("transform", name="dvn{0}_{1}{2}".format(i, d, side), parent=group)
+            for node in [controller] + ["dvn{0}_{1}{2}".format(i, d, side) for d in range(drivens)]:
+                for attr in ("invTx", "invTy", "invTz", "invRx", "invRy", "invRz"):
+                    cmds.addAttr(node, longName=attr, attributeType="bool", defaultValue=attr in ("invTx", "invRy"))
+
+
+def build_poses(api, cmds, drivers, poses, drivens):
+    """
+    L side 에 pose 를 만듭니다. driven 은 절반만 offset 을 가집니다.
+    """
+    for i in range(drivers):
+        driver = "drv{0}_L".format(i)
+        controller = "ctl{0}_L".format(i)
+        api.add_driver(driver, controller)
+        for d in range(drivens):
+            api.add_driven(driver, "dvn{0}_{1}_L".format(i, d))
+        for p in range(poses):
+            cmds.setAttr(controller + ".r", 15.0 * (p + 1), 5.0 * p, 0)
+            api.add_pose(driver, "pose{0}".format(p))
+            for d in range(0, drivens, 2):
+                driven = "dvn{0}_{1}_L".format(i, d)
+                cmds.setAttr(driven + ".t", 0.1 * (p + 1), 0, 0)
+                cmds.setAttr(driven + ".r", 0, 0, 2.0 * (p + 1))
+                api.update_driven(driver, "pose{0}".format(p), driven)
+        cmds.setAttr(controller + ".r", 0, 0, 0)
+
+
+class Scenario(abc.ABC):
+
+    def __init__(self, args):
+        self.args = args
+        self.scene = None
+        self.cmds = None
+
+    def fresh(self):
+        self.scene = fake_maya.install(latency=self.args.latency)
+        self.cmds = sys.modules["maya.cmds"]
+        build_rig(self.cmds, self.args.drivers, self.args.drivens)
+
+    def import_module(self, name):
+        module = importlib.import_module(package + "." + name)
+        if name == "api":
+            module.driven_topology = self.args.topology
+        return module
+
+    def setup(self):
+        pass
+
+    @abc.abstractmethod
+    def run(self):
+        pass
+
+    def validate(self):
+        issues = self.import_module("check").scan()
+        if issues:
+            raise AssertionError("{0} issue(s) after scenario : {1}".format(len(issues), issues[:5]))
+
+
+class ImportScenario(Scenario):
+    name = "import"
+
+    def setup(self):
+        fake_maya.install()
+        for name in list(sys.modules):
+            if name == package or name.startswith(package + "."):
+                if not name.startswith(package + ".bench"):
+                    del sys.modules[name]
+
+    def run(self):
+        importlib.import_module(package)
+        importlib.import_module(package + ".api")
+        importlib.import_module(package + ".io")
+
+    def validate(self):
+        for name in ("PySide2", package + ".ui", "maya.app.general.mayaMixin"):
+            if name in sys.modules:
+                raise AssertionError("'{0}' imported by headless import".format(name))
+
+
+class BuildScenario(Scenario):
+    name = "build"
+
+    def setup(self):
+        self.fresh()
+
+    def run(self):
+        build_poses(self.import_module("api"), self.cmds, self.args.drivers, self.args.poses, self.args.drivens)
+
+
+class MirrorScenario(Scenario):
+    name = "mirror"
+
+    def setup(self):
+        self.fresh()
+        build_poses(self.import_module("api"), self.cmds, self.args.drivers, self.args.poses, self.args.drivens)
+
+    def run(self):
+        api = self.import_module("api")
+        for i in range(self.args.drivers):
+            api.mirror_driver("drv{0}_L".format(i))
+
+
+class LoadScenario(Scenario):
+    name = "load"
+
+    def setup(self):
+        self.fresh()
+        api = self.import_module("api")
+        build_poses(api, self.cmds, self.args.drivers, self.args.poses, self.args.drivens)
+        handle, self.file_path = tempfile.mkstemp(suffix=".pose")
+        os.close(handle)
+        self.import_module("io").dump(self.file_path, api.get_data())
+        self.fresh()
+
+    def run(self):
+        self.import_module("io").load(self.file_path)
+
+    def validate(self):
+        os.remove(self.file_path)
+        super().validate()
+
+
+scenarios = [ImportScenario, BuildScenario, MirrorScenario, LoadScenario]
+
+
+def run(args):
+    results = {}
+    for cls in scenarios:
+        if args.scenario and cls.name not in args.scenario:
+            continue
+        scenario = cls(args)
+        scenario.setup()
+        scene = sys.modules["maya"]._scene
+        scene.calls.clear()
+        start = time.perf_counter()
+        scenario.run()
+        elapsed = time.perf_counter() - start
+        calls = dict(scene.calls)
+        scenario.validate()
+        results[cls.name] = {
+            "time": elapsed,
+            "calls": sum(calls.values()),
+            "by_command": dict(sorted(calls.items(), key=lambda x: -x[1])),
+            "warnings": len(scene.warnings)
+        }
+    return results
+
+
+def compare(results, baseline, call_tolerance, time_tolerance):
+    failures = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result["calls"] > base["calls"] * (1.0 + call_tolerance):
+            failures.append("{0} : calls {1} > baseline {2}".format(name, result["calls"], base["calls"]))
+        if result["time"] > base["time"] * (1.0 + time_tolerance):
+            failures.append("{0} : time {1:.3f}s > baseline {2:.3f}s".format(name, result["time"], base["time"]))
+    return failures
+
+
+def print_results(results):
+    print("{0:<10} {1:>10} {2:>10} {3:>9}  {4}".format("scenario", "time (s)", "calls", "warnings", "top commands"))
+    for name, result in results.items():
+        top = ", ".join("{0}={1}".format(k, v) for k, v in list(result["by_command"].items())[:4])
+        print("{0:<10} {1:>10.4f} {2:>10} {3:>9}  {4}".format(
+            name, result["time"], result["calls"], result["warnings"], top))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m {0}.bench".format(package))
+    parser.add_argument("--drivers", type=int, default=4)
+    parser.add_argument("--poses", type=int, default=6)
+    parser.add_argument("--drivens", type=int, default=6)
+    parser.add_argument("--topology", default="npo", choices=["npo", "offsetParentMatrix"])
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every maya.cmds call")
+    parser.add_argument("--scenario", action="append", help="run only this scenario. repeatable")
+    parser.add_argument("--import-budget", type=float, default=0.05, help="seconds")
+    parser.add_argument("--baseline", help="compare with this json")
+    parser.add_argument("--save-baseline", help="write results to this json")
+    parser.add_argument("--call-tolerance", type=float, default=0.0)
+    parser.add_argument("--time-tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    print_results(results)
+
+    failures = []
+    if "import" in results and results["import"]["time"] > args.import_budget:
+        failures.append("import : {0:.3f}s > budget {1:.3f}s".format(results["import"]["time"], args.import_budget))
+    if args.baseline:
+        with open(args.baseline, "r", encoding="UTF-8") as f:
+            failures += compare(results, json.load(f), args.call_tolerance, args.time_tolerance)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="UTF-8") as f:
+            json.dump(results, f, indent=2)
+
+    for failure in failures:
+        print("REGRESSION " + failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
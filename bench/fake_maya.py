@@ -0,0 +1,1044 @@
+"""
+in-process stand-in of maya.cmds, maya.mel, maya.api.OpenMaya for benchmark.
+
+node, attribute, connection, undo chunk 만 흉내냅니다. DG evaluation 은 하지 않습니다.
+install() 을 posemanager.api import 전에 호출하세요.
+"""
+# built-ins
+import collections
+import fnmatch
+import math
+import sys
+import time
+import types
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# maya.api.OpenMaya
+# ----------------------------------------------------------------------------------------------------------------------
+class MSpace(object):
+    kInvalid = 0
+    kTransform = 1
+    kPreTransform = 2
+    kPostTransform = 3
+    kWorld = 4
+    kObject = 2
+
+
+class MVector(object):
+
+    def __init__(self, *args):
+        if len(args) == 1:
+            args = tuple(args[0])
+        self.x, self.y, self.z = (list(args) + [0.0, 0.0, 0.0])[:3] if args else (0.0, 0.0, 0.0)
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __getitem__(self, i):
+        return (self.x, self.y, self.z)[i]
+
+    def __len__(self):
+        return 3
+
+
+class MEulerRotation(object):
+    kXYZ = 0
+
+    def __init__(self, *args):
+        if len(args) == 1:
+            args = tuple(args[0])
+        self.x, self.y, self.z = (list(args) + [0.0, 0.0, 0.0])[:3] if args else (0.0, 0.0, 0.0)
+        self.order = self.kXYZ
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __getitem__(self, i):
+        return (self.x, self.y, self.z)[i]
+
+    def __len__(self):
+        return 3
+
+
+class MMatrix(object):
+    """
+    row major 4x4. maya 와 같이 row vector (v * M) 규칙입니다.
+    """
+
+    def __init__(self, values=None):
+        if values is None:
+            self.m = [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+        else:
+            values = list(values)
+            if len(values) == 4:
+                values = [x for row in values for x in row]
+            self.m = [float(x) for x in values]
+
+    def __iter__(self):
+        return iter(self.m)
+
+    def __len__(self):
+        return 16
+
+    def __getitem__(self, i):
+        return self.m[i]
+
+    def getElement(self, row, col):
+        return self.m[row * 4 + col]
+
+    def __mul__(self, other):
+        a = self.m
+        b = other.m
+        return MMatrix([sum(a[r * 4 + k] * b[k * 4 + c] for k in range(4)) for r in range(4) for c in range(4)])
+
+    def __eq__(self, other):
+        return all(abs(x - y) < 1e-10 for x, y in zip(self.m, list(other)))
+
+    def isEquivalent(self, other, tolerance=1e-10):
+        return all(abs(x - y) <= tolerance for x, y in zip(self.m, list(other)))
+
+    def inverse(self):
+        n = 4
+        a = [self.m[r * 4:r * 4 + 4] + [1.0 if r == c else 0.0 for c in range(4)] for r in range(4)]
+        for col in range(n):
+            pivot = max(range(col, n), key=lambda r: abs(a[r][col]))
+            if abs(a[pivot][col]) < 1e-15:
+                raise ValueError("singular matrix")
+            a[col], a[pivot] = a[pivot], a[col]
+            p = a[col][col]
+            a[col] = [x / p for x in a[col]]
+            for r in range(n):
+                if r != col and a[r][col] != 0.0:
+                    f = a[r][col]
+                    a[r] = [x - f * y for x, y in zip(a[r], a[col])]
+        return MMatrix([x for row in a for x in row[4:]])
+
+
+def _rotation_rows(rx, ry, rz):
+    cx, sx = math.cos(rx), math.sin(rx)
+    cy, sy = math.cos(ry), math.sin(ry)
+    cz, sz = math.cos(rz), math.sin(rz)
+    # xyz order : Rx * Ry * Rz
+    return [[cy * cz, cy * sz, -sy],
+            [sx * sy * cz - cx * sz, sx * sy * sz + cx * cz, sx * cy],
+            [cx * sy * cz + sx * sz, cx * sy * sz - sx * cz, cx * cy]]
+
+
+def compose(t, r, s=(1.0, 1.0, 1.0)):
+    """
+    :param t: translate
+    :param r: rotate (radians, xyz)
+    :param s: scale
+    :return: MMatrix
+    """
+    rows = _rotation_rows(*r)
+    m = []
+    for i in range(3):
+        m += [x * s[i] for x in rows[i]] + [0.0]
+    m += [t[0], t[1], t[2], 1.0]
+    return MMatrix(m)
+
+
+def decompose(matrix):
+    """
+    :return: translate, rotate (radians, xyz), scale
+    """
+    m = list(matrix)
+    rows = [m[0:3], m[4:7], m[8:11]]
+    s = [math.sqrt(sum(x * x for x in row)) or 1.0 for row in rows]
+    rows = [[x / s[i] for x in row] for i, row in enumerate(rows)]
+    ry = math.asin(max(-1.0, min(1.0, -rows[0][2])))
+    if abs(math.cos(ry)) > 1e-9:
+        rx = math.atan2(rows[1][2], rows[2][2])
+        rz = math.atan2(rows[0][1], rows[0][0])
+    else:
+        rx = math.atan2(-rows[2][1], rows[1][1])
+        rz = 0.0
+    return m[12:15], [rx, ry, rz], s
+
+
+def quaternion(matrix):
+    """
+    :return: rotation quaternion [x, y, z, w] (w >= 0)
+    """
+    m = list(matrix)
+    rows = [m[0:3], m[4:7], m[8:11]]
+    rows = [[x / (math.sqrt(sum(v * v for v in row)) or 1.0) for x in row] for row in rows]
+    trace = rows[0][0] + rows[1][1] + rows[2][2]
+    if trace > 0.0:
+        w = math.sqrt(1.0 + trace) * 0.5
+        q = [(rows[1][2] - rows[2][1]) / (4.0 * w), (rows[2][0] - rows[0][2]) / (4.0 * w),
+             (rows[0][1] - rows[1][0]) / (4.0 * w), w]
+    else:
+        i = max(range(3), key=lambda k: rows[k][k])
+        j, k = (i + 1) % 3, (i + 2) % 3
+        v = math.sqrt(max(1.0 + rows[i][i] - rows[j][j] - rows[k][k], 1e-12)) * 0.5
+        q = [0.0, 0.0, 0.0, (rows[j][k] - rows[k][j]) / (4.0 * v)]
+        q[i] = v
+        q[j] = (rows[i][j] + rows[j][i]) / (4.0 * v)
+        q[k] = (rows[i][k] + rows[k][i]) / (4.0 * v)
+    return q if q[3] >= 0.0 else [-x for x in q]
+
+
+def _invert(matrix):
+    # gauss-jordan. 특이 행렬이면 None
+    n = len(matrix)
+    a = [list(row) + [1.0 if i == j else 0.0 for j in range(n)] for i, row in enumerate(matrix)]
+    for c in range(n):
+        pivot = max(range(c, n), key=lambda r: abs(a[r][c]))
+        if abs(a[pivot][c]) < 1e-12:
+            return None
+        a[c], a[pivot] = a[pivot], a[c]
+        scale = a[c][c]
+        a[c] = [x / scale for x in a[c]]
+        for r in range(n):
+            if r != c and a[r][c]:
+                factor = a[r][c]
+                a[r] = [x - factor * y for x, y in zip(a[r], a[c])]
+    return [row[n:] for row in a]
+
+
+class MTransformationMatrix(object):
+
+    def __init__(self, matrix=None):
+        t, r, s = decompose(matrix if matrix is not None else MMatrix())
+        self._t = t
+        self._r = r
+        self._s = s
+
+    def translation(self, space=MSpace.kWorld):
+        return MVector(self._t)
+
+    def setTranslation(self, vector, space=MSpace.kWorld):
+        self._t = list(vector)
+        return self
+
+    def rotation(self, asQuaternion=False):
+        return MEulerRotation(self._r)
+
+    def setRotation(self, rotation):
+        self._r = list(rotation)
+        return self
+
+    def scale(self, space=MSpace.kWorld):
+        return list(self._s)
+
+    def setScale(self, scale, space=MSpace.kWorld):
+        self._s = list(scale)
+        return self
+
+    def asMatrix(self):
+        return compose(self._t, self._r, self._s)
+
+
+def _scene():
+    return sys.modules["maya"]._scene
+
+
+class MObject(object):
+    """
+    node 는 name, matrix data 는 MMatrix 를 가집니다.
+    """
+
+    def __init__(self, node=None, matrix=None):
+        self.node = node
+        self.matrix = matrix
+
+
+class MPlug(object):
+
+    def __init__(self, name=""):
+        self.name = name
+
+    def partialName(self):
+        return self.name.split(".", 1)[-1]
+
+    def asMObject(self):
+        return MObject(matrix=MMatrix(Commands(_scene()).getAttr(self.name)))
+
+    def setMObject(self, data):
+        scene = _scene()
+        node, attr = scene.split_plug(self.name)
+        scene.set_value(node, attr, list(data.matrix))
+
+
+class MSelectionList(object):
+
+    def __init__(self):
+        self.items = []
+
+    def add(self, name):
+        self.items.append(name)
+        return self
+
+    def getPlug(self, index):
+        return MPlug(_scene().normalize_plug(self.items[index]))
+
+    def getDependNode(self, index):
+        return MObject(node=_scene().node(self.items[index]).name)
+
+
+class MFnMatrixData(object):
+
+    def __init__(self, data=None):
+        self.data = data
+
+    def create(self, matrix):
+        self.data = MObject(matrix=MMatrix(matrix))
+        return self.data
+
+    def matrix(self):
+        return self.data.matrix
+
+
+class MNodeMessage(object):
+    kAttributeSet = 1 << 11
+
+    @staticmethod
+    def addAttributeChangedCallback(node, function, client_data=None):
+        scene = _scene()
+        scene.callback_id += 1
+        scene.callbacks[scene.callback_id] = (node.node, function, client_data)
+        return scene.callback_id
+
+
+class MMessage(object):
+
+    @staticmethod
+    def removeCallback(callback_id):
+        _scene().callbacks.pop(callback_id, None)
+
+    @staticmethod
+    def removeCallbacks(callback_ids):
+        for callback_id in callback_ids:
+            MMessage.removeCallback(callback_id)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# scene
+# ----------------------------------------------------------------------------------------------------------------------
+_aliases = {"translate": "t", "rotate": "r", "scale": "s"}
+_channels = {"tx": ("t", 0), "ty": ("t", 1), "tz": ("t", 2),
+             "rx": ("r", 0), "ry": ("r", 1), "rz": ("r", 2),
+             "sx": ("s", 0), "sy": ("s", 1), "sz": ("s", 2),
+             "translateX": ("t", 0), "translateY": ("t", 1), "translateZ": ("t", 2),
+             "rotateX": ("r", 0), "rotateY": ("r", 1), "rotateZ": ("r", 2)}
+_identity = [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+
+
+class Node(object):
+    __slots__ = ("name", "type", "parent", "children", "attrs", "poses")
+
+    def __init__(self, name, node_type):
+        self.name = name
+        self.type = node_type
+        self.parent = None
+        self.children = []
+        self.attrs = {}
+        self.poses = collections.OrderedDict()
+        if node_type in ("transform", "joint"):
+            self.attrs.update({"t": (0.0, 0.0, 0.0),
+                               "r": (0.0, 0.0, 0.0),
+                               "s": (1.0, 1.0, 1.0),
+                               "offsetParentMatrix": list(_identity),
+                               "visibility": True})
+
+
+class Scene(object):
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.nodes = {}
+        self.connections = {}
+        self.selection = []
+        self.calls = collections.Counter()
+        self.warnings = []
+        self.steps = []
+        self.chunk = None
+        self.chunk_depth = 0
+        self.undo_enabled = True
+        self.current_time = 1.0
+        self.keys = {}
+        self.callbacks = {}
+        self.callback_id = 0
+        # evalDeferred 는 idle() 에서 실행합니다.
+        self.deferred = []
+
+    def idle(self):
+        while self.deferred:
+            command = self.deferred.pop(0)
+            command() if callable(command) else exec(command, {})
+
+    # ---- undo ----------------------------------------------------------------------------------------------------
+    def record(self, inverse):
+        if not self.undo_enabled:
+            return
+        if self.chunk is not None:
+            self.chunk.append(inverse)
+        else:
+            self.steps.append([inverse])
+
+    def undo(self):
+        if not self.steps:
+            return
+        step = self.steps.pop()
+        enabled = self.undo_enabled
+        self.undo_enabled = False
+        try:
+            for inverse in reversed(step):
+                inverse()
+        finally:
+            self.undo_enabled = enabled
+
+    # ---- names ---------------------------------------------------------------------------------------------------
+    @staticmethod
+    def short(name):
+        return name.split("|")[-1]
+
+    def node(self, name):
+        node = self.nodes.get(self.short(name))
+        if node is None:
+            raise ValueError("No object matches name: {0}".format(name))
+        return node
+
+    def split_plug(self, plug):
+        node_name, attr = plug.split(".", 1)
+        return self.node(node_name), attr
+
+    def unique_name(self, name):
+        if name not in self.nodes:
+            return name
+        base = name.rstrip("0123456789")
+        i = 1
+        while base + str(i) in self.nodes:
+            i += 1
+        return base + str(i)
+
+    def full_path(self, node):
+        names = []
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return "|" + "|".join(reversed(names))
+
+    # ---- nodes ---------------------------------------------------------------------------------------------------
+    def add_node(self, node_type, name=None, parent=None):
+        name = self.unique_name(name or node_type + "1")
+        node = Node(name, node_type)
+        self.nodes[name] = node
+        if parent is not None:
+            self.set_parent(node, self.node(parent), record=False)
+        self.record(lambda: self.remove_node(node))
+        return node
+
+    def remove_node(self, node):
+        for child in list(node.children):
+            self.remove_node(child)
+        parent = node.parent
+        index = parent.children.index(node) if parent else None
+        if parent:
+            parent.children.remove(node)
+        removed = {k: v for k, v in self.connections.items()
+                   if k.split(".")[0] == node.name or v.split(".")[0] == node.name}
+        for k in removed:
+            del self.connections[k]
+        del self.nodes[node.name]
+        if node.name in self.selection:
+            self.selection.remove(node.name)
+
+        def restore():
+            self.nodes[node.name] = node
+            if parent:
+                parent.children.insert(index, node)
+            self.connections.update(removed)
+        self.record(restore)
+
+    def set_parent(self, node, parent, record=True):
+        old = node.parent
+        if old:
+            old.children.remove(node)
+        node.parent = parent
+        if parent:
+            parent.children.append(node)
+        if record:
+            self.record(lambda: self.set_parent(node, old))
+
+    # ---- attributes ----------------------------------------------------------------------------------------------
+    def has_attr(self, node, attr):
+        attr = _aliases.get(attr, attr)
+        if attr in _channels:
+            return node.type in ("transform", "joint")
+        if attr in node.attrs:
+            return True
+        base = attr.split("[")[0].split(".")[0]
+        return any(k == base or k.startswith(base + "[") for k in node.attrs)
+
+    def get_value(self, node, attr):
+        attr = _aliases.get(attr, attr)
+        if attr in _channels:
+            compound, i = _channels[attr]
+            return node.attrs[compound][i]
+        if attr in node.attrs:
+            return node.attrs[attr]
+        if attr.endswith("Matrix") or attr.endswith("matrix"):
+            return list(_identity)
+        if node.type in ("blendMatrix", "poseInterpolator") or "[" in attr:
+            return 0.0
+        raise ValueError("No object matches name: {0}.{1}".format(node.name, attr))
+
+    def set_value(self, node, attr, value):
+        attr = _aliases.get(attr, attr)
+        if attr in _channels:
+            compound, i = _channels[attr]
+            v = list(node.attrs[compound])
+            v[i] = value
+            attr, value = compound, tuple(v)
+        missing = object()
+        old = node.attrs.get(attr, missing)
+        node.attrs[attr] = value
+
+        def restore():
+            if old is missing:
+                node.attrs.pop(attr, None)
+            else:
+                node.attrs[attr] = old
+        self.record(restore)
+
+        for callback_node, function, client_data in list(self.callbacks.values()):
+            if callback_node == node.name:
+                function(MNodeMessage.kAttributeSet, MPlug(node.name + "." + attr), MPlug(), client_data)
+
+    def remove_value(self, node, attr):
+        if attr not in node.attrs:
+            return
+        old = node.attrs.pop(attr)
+        self.record(lambda: node.attrs.__setitem__(attr, old))
+
+    def connect(self, src, dst):
+        old = self.connections.get(dst)
+        self.connections[dst] = src
+
+        def restore():
+            if old is None:
+                self.connections.pop(dst, None)
+            else:
+                self.connections[dst] = old
+        self.record(restore)
+
+    def disconnect(self, dst):
+        old = self.connections.pop(dst, None)
+        if old is not None:
+            self.record(lambda: self.connections.__setitem__(dst, old))
+
+    def normalize_plug(self, plug):
+        node, attr = self.split_plug(plug)
+        return node.name + "." + _aliases.get(attr, attr)
+
+    # ---- transform -----------------------------------------------------------------------------------------------
+    def transform_matrix(self, node):
+        # offsetParentMatrix 를 뺀 matrix
+        t = node.attrs.get("t", (0.0, 0.0, 0.0))
+        r = [math.radians(x) for x in node.attrs.get("r", (0.0, 0.0, 0.0))]
+        s = node.attrs.get("s", (1.0, 1.0, 1.0))
+        return compose(t, r, s)
+
+    def local_matrix(self, node):
+        return self.transform_matrix(node) * MMatrix(node.attrs.get("offsetParentMatrix", _identity))
+
+    def world_matrix(self, node):
+        m = MMatrix()
+        while node is not None:
+            if node.type in ("transform", "joint"):
+                m = m * self.local_matrix(node)
+            node = node.parent
+        return m
+
+    def driver_matrix(self, node):
+        # dg 를 평가하지 않으므로 driverMatrix 에 연결된 transform 의 world matrix 를 사용합니다.
+        # controller 아래에 있는 driver 는 controller 를 따라갑니다.
+        src = self.connections.get(node.name + ".driver[0].driverMatrix")
+        if src is None:
+            return MMatrix()
+        return self.world_matrix(self.node(src.split(".")[0]))
+
+    def pose_outputs(self, node):
+        """
+        poseInterpolator output. addPose 때 기록한 driver matrix 로 gaussian rbf 를 계산합니다.
+        solver.PoseSolver 와 따로 만든 근사이며 maya 와 같지 않습니다.
+
+        :return: {pose index: weight}
+        """
+        def feature(matrix):
+            return list(matrix)[12:15], quaternion(matrix)
+
+        def distance(a, b):
+            dot = min(1.0, abs(sum(x * y for x, y in zip(a[1], b[1]))))
+            return math.sqrt(sum((x - y) ** 2 for x, y in zip(a[0], b[0]))) + 2.0 * math.acos(dot)
+
+        indexes = [i for i in node.poses.values() if "pose[{0}].poseMatrix".format(i) in node.attrs]
+        poses = [feature(node.attrs["pose[{0}].poseMatrix".format(i)]) for i in indexes]
+        if not poses:
+            return {}
+        # pose 마다 가장 가까운 pose 까지의 거리를 폭으로 씁니다.
+        widths = [min([distance(p, q) for q in poses if q is not p] or [1.0]) or 1.0 for p in poses]
+        kernel = [[math.exp(-(distance(p, q) / widths[j]) ** 2) for j, q in enumerate(poses)] for p in poses]
+        inverse = _invert(kernel)
+        if inverse is None:
+            return {i: 0.0 for i in indexes}
+        current = feature(self.driver_matrix(node))
+        k = [math.exp(-(distance(current, q) / widths[j]) ** 2) for j, q in enumerate(poses)]
+        weights = [sum(k[j] * inverse[j][c] for j in range(len(k))) for c in range(len(k))]
+        return {i: max(0.0, min(1.0, w)) for i, w in zip(indexes, weights)}
+
+    def set_local_matrix(self, node, matrix, offset_parent=True):
+        matrix = MMatrix(matrix)
+        if offset_parent:
+            matrix = matrix * MMatrix(node.attrs.get("offsetParentMatrix", _identity)).inverse()
+        t, r, s = decompose(matrix)
+        self.set_value(node, "t", tuple(t))
+        self.set_value(node, "r", tuple(math.degrees(x) for x in r))
+        self.set_value(node, "s", tuple(s))
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# maya.cmds
+# ----------------------------------------------------------------------------------------------------------------------
+def _as_list(value):
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def _index(plug):
+    return int(plug.split("[")[-1].split("]")[0])
+
+
+class Commands(object):
+
+    def __init__(self, scene):
+        self.scene = scene
+
+    # ---- scene ---------------------------------------------------------------------------------------------------
+    def objExists(self, name):
+        scene = self.scene
+        if "." in name:
+            try:
+                node, attr = scene.split_plug(name)
+            except ValueError:
+                return False
+            return scene.has_attr(node, attr)
+        return scene.short(name) in scene.nodes
+
+    def createNode(self, node_type, name=None, parent=None, skipSelect=True, shared=False):
+        return self.scene.add_node(node_type, name=name, parent=parent).name
+
+    def spaceLocator(self, name=None, position=None):
+        transform = self.scene.add_node("transform", name=name or "locator1")
+        self.scene.add_node("locator", name=transform.name + "Shape", parent=transform.name)
+        return [transform.name]
+
+    def delete(self, *names):
+        names = [n for arg in names for n in _as_list(arg)]
+        for name in names:
+            node = self.scene.nodes.get(self.scene.short(name))
+            if node is not None:
+                self.scene.remove_node(node)
+
+    def select(self, *names, **kwargs):
+        names = [self.scene.short(n) for arg in names for n in _as_list(arg)]
+        if kwargs.get("clear"):
+            self.scene.selection = []
+            return
+        for n in names:
+            self.scene.node(n)
+        self.scene.selection = names
+
+    def ls(self, *patterns, **kwargs):
+        scene = self.scene
+        if kwargs.get("selection") or kwargs.get("sl"):
+            result = list(scene.selection)
+        else:
+            patterns = [p for arg in patterns for p in _as_list(arg)]
+            result = []
+            for name in scene.nodes:
+                if patterns and not any(fnmatch.fnmatchcase(name, scene.short(p)) for p in patterns):
+                    continue
+                result.append(name)
+        node_type = kwargs.get("type")
+        if node_type:
+            types_ = _as_list(node_type)
+            result = [n for n in result if scene.nodes[n].type in types_]
+        if kwargs.get("long"):
+            result = [scene.full_path(scene.nodes[n]) for n in result]
+        return result
+
+    def nodeType(self, name):
+        return self.scene.node(name).type
+
+    def listRelatives(self, names, parent=False, children=False, shapes=False, fullPath=False,
+                      allDescendents=False, type=None):
+        scene = self.scene
+        result = []
+        for name in _as_list(names):
+            node = scene.node(name)
+            if parent:
+                found = [node.parent] if node.parent else []
+            elif allDescendents:
+                found = []
+                stack = list(node.children)
+                while stack:
+                    child = stack.pop()
+                    found.append(child)
+                    stack.extend(child.children)
+            else:
+                found = list(node.children)
+                if shapes:
+                    found = [c for c in found if c.type not in ("transform", "joint")]
+            if type:
+                found = [c for c in found if c.type in _as_list(type)]
+            for f in found:
+                value = scene.full_path(f) if fullPath else f.name
+                if value not in result:
+                    result.append(value)
+        return result or None
+
+    def parent(self, *args, **kwargs):
+        scene = self.scene
+        names = [n for arg in args for n in _as_list(arg)]
+        if kwargs.get("world"):
+            children, new_parent = names, None
+        else:
+            children, new_parent = names[:-1], scene.node(names[-1])
+        result = []
+        for name in children:
+            node = scene.node(name)
+            world = scene.world_matrix(node)
+            scene.set_parent(node, new_parent)
+            if node.type in ("transform", "joint") and not kwargs.get("relative"):
+                parent_m = scene.world_matrix(new_parent) if new_parent else MMatrix()
+                scene.set_local_matrix(node, world * parent_m.inverse())
+            result.append(node.name)
+        return result
+
+    def xform(self, *names, query=False, matrix=None, worldSpace=False, translation=None, rotation=None,
+              objectSpace=False):
+        scene = self.scene
+        names = [n for arg in names for n in _as_list(arg)]
+        if not query and len(names) > 1:
+            for name in names:
+                self.xform(name, matrix=matrix, worldSpace=worldSpace, translation=translation, rotation=rotation)
+            return None
+        node = scene.node(names[0])
+        if query:
+            if matrix:
+                m = scene.world_matrix(node) if worldSpace else scene.transform_matrix(node)
+                return list(m)
+            if translation:
+                return list(scene.world_matrix(node)[12:15]) if worldSpace else list(node.attrs["t"])
+            if rotation:
+                return list(node.attrs["r"])
+            return None
+        if matrix is not None:
+            m = MMatrix(matrix)
+            if worldSpace and node.parent is not None:
+                m = m * scene.world_matrix(node.parent).inverse()
+            scene.set_local_matrix(node, m, offset_parent=worldSpace)
+        if translation is not None:
+            scene.set_value(node, "t", tuple(translation))
+        if rotation is not None:
+            scene.set_value(node, "r", tuple(rotation))
+
+    # ---- attributes ----------------------------------------------------------------------------------------------
+    def addAttr(self, name, longName=None, shortName=None, attributeType=None, dataType=None,
+                defaultValue=0.0, keyable=False, **kwargs):
+        node = self.scene.node(name)
+        if longName in node.attrs:
+            raise RuntimeError("Found attribute '{0}' already exists".format(longName))
+        value = "" if dataType == "string" else (bool(defaultValue) if attributeType == "bool" else defaultValue)
+        self.scene.set_value(node, longName, value)
+
+    def getAttr(self, plug, time=None, **kwargs):
+        scene = self.scene
+        node, attr = scene.split_plug(plug)
+        attr = _aliases.get(attr, attr)
+        if kwargs.get("multiIndices"):
+            if node.type == "poseInterpolator" and attr == "output":
+                return sorted(node.poses.values()) or None
+            indexes = set()
+            for k in node.attrs:
+                if k.startswith(attr + "["):
+                    indexes.add(_index(k[:k.index("]") + 1]))
+            for dst in scene.connections:
+                if dst.startswith(node.name + "." + attr + "["):
+                    indexes.add(_index(dst[:dst.index("]") + 1]))
+            return sorted(indexes) or None
+        if attr == "matrix" and node.type in ("transform", "joint"):
+            return list(scene.transform_matrix(node))
+        if node.type == "poseInterpolator" and attr.startswith("output"):
+            outputs = scene.pose_outputs(node)
+            if "[" in attr:
+                return outputs.get(_index(attr), 0.0)
+            return [outputs.get(i, 0.0) for i in node.poses.values()]
+        value = scene.get_value(node, attr)
+        if isinstance(value, tuple):
+            return [value]
+        if isinstance(value, list):
+            return list(value)
+        return value
+
+    def setAttr(self, plug, *values, **kwargs):
+        scene = self.scene
+        node, attr = scene.split_plug(plug)
+        normalized = node.name + "." + _aliases.get(attr, attr)
+        if normalized in scene.connections and not kwargs.get("force"):
+            raise RuntimeError("setAttr: The attribute '{0}' is locked or connected "
+                               "and cannot be modified.".format(plug))
+        data_type = kwargs.get("type")
+        if data_type == "string":
+            value = values[0]
+        elif data_type == "matrix":
+            value = list(values[0]) if len(values) == 1 else list(values)
+        elif len(values) == 1:
+            value = values[0]
+        else:
+            value = tuple(float(v) for v in values)
+        scene.set_value(node, attr, value)
+
+    def connectAttr(self, src, dst, force=False, **kwargs):
+        scene = self.scene
+        src = scene.normalize_plug(src)
+        dst = scene.normalize_plug(dst)
+        if dst in scene.connections and not force:
+            raise RuntimeError("connectAttr: '{0}' is already connected".format(dst))
+        scene.connect(src, dst)
+
+    def disconnectAttr(self, src, dst):
+        self.scene.disconnect(self.scene.normalize_plug(dst))
+
+    def isConnected(self, src, dst):
+        return self.scene.connections.get(self.scene.normalize_plug(dst)) == self.scene.normalize_plug(src)
+
+    def listConnections(self, *objects, **kwargs):
+        scene = self.scene
+        source = kwargs.get("source", True)
+        destination = kwargs.get("destination", True)
+        connections = kwargs.get("connections", False)
+        want_plugs = kwargs.get("plugs", False)
+        type = kwargs.get("type")
+        result = []
+        for plug in [o for arg in objects for o in _as_list(arg)]:
+            if "." in plug:
+                node, attr = scene.split_plug(plug)
+                prefix = node.name + "." + _aliases.get(attr, attr)
+            else:
+                prefix = scene.short(plug)
+
+            def match(p):
+                return p == prefix or p.startswith(prefix + "[") or p.startswith(prefix + ".") or \
+                    ("." not in prefix and p.split(".")[0] == prefix)
+
+            pairs = []
+            if destination:
+                pairs += [(src, dst) for dst, src in scene.connections.items() if match(src)]
+            if source:
+                pairs += [(dst, src) for dst, src in scene.connections.items() if match(dst)]
+            for own, other in pairs:
+                if type and scene.nodes[other.split(".")[0]].type not in _as_list(type):
+                    continue
+                if connections:
+                    result.append(own)
+                result.append(other if want_plugs else other.split(".")[0])
+        return result or None
+
+    def removeMultiInstance(self, plug, b=True, **kwargs):
+        scene = self.scene
+        node, attr = scene.split_plug(plug)
+        prefix = node.name + "." + attr
+        for k in [k for k in node.attrs if k == attr or k.startswith(attr + ".")]:
+            scene.remove_value(node, k)
+        for dst in [d for d in scene.connections if d == prefix or d.startswith(prefix + ".")]:
+            scene.disconnect(dst)
+
+    # ---- pose interpolator ---------------------------------------------------------------------------------------
+    def poseInterpolator(self, *names, **kwargs):
+        scene = self.scene
+        if not names:
+            transform = scene.add_node("transform", name=kwargs.get("name", "poseInterpolator1"))
+            shape = scene.add_node("poseInterpolator", name=transform.name + "Shape", parent=transform.name)
+            if scene.selection:
+                scene.connect(scene.selection[0] + ".matrix", shape.name + ".driver[0].driverMatrix")
+            return [transform.name]
+
+        node = scene.node(names[0])
+        if node.type != "poseInterpolator":
+            node = node.children[0]
+        if kwargs.get("query"):
+            if kwargs.get("poseNames"):
+                return list(node.poses.keys())
+            if kwargs.get("index"):
+                return list(node.poses.values())
+            return None
+        if "addPose" in kwargs:
+            pose = kwargs["addPose"]
+            index = 0
+            used = set(node.poses.values())
+            while index in used:
+                index += 1
+            old = collections.OrderedDict(node.poses)
+            node.poses[pose] = index
+            scene.record(lambda: setattr(node, "poses", old))
+            scene.set_value(node, "pose[{0}].poseName".format(index), pose)
+            scene.set_value(node, "pose[{0}].poseMatrix".format(index), list(scene.driver_matrix(node)))
+            return index
+        if "deletePose" in kwargs:
+            pose = kwargs["deletePose"]
+            old = collections.OrderedDict(node.poses)
+            index = node.poses.pop(pose)
+            scene.record(lambda: setattr(node, "poses", old))
+            for k in [k for k in node.attrs if k.startswith("pose[{0}]".format(index))]:
+                scene.remove_value(node, k)
+            for dst, src in list(scene.connections.items()):
+                if src == "{0}.output[{1}]".format(node.name, index):
+                    scene.disconnect(dst)
+            return index
+        if "updatePose" in kwargs:
+            index = node.poses[kwargs["updatePose"]]
+            scene.set_value(node, "pose[{0}].poseMatrix".format(index), list(scene.driver_matrix(node)))
+            return index
+        return None
+
+    # ---- misc ----------------------------------------------------------------------------------------------------
+    def undoInfo(self, openChunk=False, closeChunk=False, infinity=False, query=False, state=None,
+                 stateWithoutFlush=None, **kwargs):
+        scene = self.scene
+        if query:
+            return scene.undo_enabled
+        if openChunk:
+            if scene.chunk_depth == 0:
+                scene.chunk = []
+            scene.chunk_depth += 1
+        if closeChunk and scene.chunk_depth:
+            scene.chunk_depth -= 1
+            if scene.chunk_depth == 0:
+                if scene.chunk:
+                    scene.steps.append(scene.chunk)
+                scene.chunk = None
+        if stateWithoutFlush is not None:
+            scene.undo_enabled = bool(stateWithoutFlush)
+        if state is not None:
+            scene.undo_enabled = bool(state)
+            if not state:
+                scene.steps = []
+
+    def undo(self):
+        self.scene.undo()
+
+    def warning(self, message):
+        self.scene.warnings.append(message)
+
+    def error(self, message):
+        raise RuntimeError(message)
+
+    def currentTime(self, value=None, query=False, update=True):
+        if query or value is None:
+            return self.scene.current_time
+        self.scene.current_time = float(value)
+        return self.scene.current_time
+
+    def playbackOptions(self, query=False, minTime=False, maxTime=False, **kwargs):
+        return 1.0 if minTime else 24.0
+
+    def setKeyframe(self, node, attribute=None, time=None, value=None, **kwargs):
+        attributes = attribute if isinstance(attribute, (list, tuple)) else [attribute]
+        times = time if isinstance(time, (list, tuple)) else [time]
+        for attr in attributes:
+            plug = self.scene.normalize_plug(node + "." + attr)
+            keys = self.scene.keys.setdefault(plug, {})
+            for t in times:
+                previous = keys.get(t)
+                keys[t] = value
+                self.scene.record(lambda keys=keys, t=t, previous=previous:
+                                  keys.pop(t, None) if previous is None else keys.__setitem__(t, previous))
+
+    def keyframe(self, node, attribute=None, query=False, timeChange=False, **kwargs):
+        attributes = attribute if isinstance(attribute, (list, tuple)) else [attribute]
+        times = []
+        for attr in attributes:
+            times.extend(sorted(self.scene.keys.get(self.scene.normalize_plug(node + "." + attr), {})))
+        return times or None
+
+    def refresh(self, **kwargs):
+        pass
+
+    def dgdirty(self, *args, **kwargs):
+        pass
+
+    def workspace(self, query=False, rootDirectory=False):
+        return "."
+
+    def evalDeferred(self, command, **kwargs):
+        self.scene.deferred.append(command)
+
+
+def _mel_eval(command):
+    return None
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# install
+# ----------------------------------------------------------------------------------------------------------------------
+def _counted(scene, name, func):
+    def wrapper(*args, **kwargs):
+        scene.calls[name] += 1
+        if scene.latency:
+            time.sleep(scene.latency)
+        return func(*args, **kwargs)
+    wrapper.__name__ = name
+    return wrapper
+
+
+def _fill(module, scene, commands):
+    for name in dir(Commands):
+        if name.startswith("_"):
+            continue
+        setattr(module, name, _counted(scene, name, getattr(commands, name)))
+
+
+def install(latency=0.0):
+    """
+    sys.modules 에 fake maya module 을 등록합니다. 이미 등록되어 있으면 scene 만 새로 만듭니다.
+
+    :param latency: maya.cmds 호출마다 추가할 시간 (seconds)
+    :return: Scene
+    """
+    scene = Scene(latency=latency)
+    commands = Commands(scene)
+
+    maya = sys.modules.get("maya")
+    if maya is None or not getattr(maya, "_pose_manager_fake", False):
+        maya = types.ModuleType("maya")
+        maya._pose_manager_fake = True
+        cmds = types.ModuleType("maya.cmds")
+        mel = types.ModuleType("maya.mel")
+        maya_api = types.ModuleType("maya.api")
+        open_maya = types.ModuleType("maya.api.OpenMaya")
+        for cls in (MSpace, MVector, MEulerRotation, MMatrix, MTransformationMatrix, MObject, MPlug, MSelectionList,
+                    MFnMatrixData, MNodeMessage, MMessage):
+            setattr(open_maya, cls.__name__, cls)
+        maya.cmds = cmds
+        maya.mel = mel
+        maya.api = maya_api
+        maya_api.OpenMaya = open_maya
+        sys.modules.update({"maya": maya,
+                            "maya.cmds": cmds,
+                            "maya.mel": mel,
+                            "maya.api": maya_api,
+                            "maya.api.OpenMaya": open_maya})
+
+    _fill(maya.cmds, scene, commands)
+    maya.mel.eval = _counted(scene, "mel.eval", _mel_eval)
+    maya._scene = scene
+    return scene
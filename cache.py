@@ -0,0 +1,178 @@
+"""
+parse 한 .pose file 을 local disk 에 cache 합니다. maya 가 필요 없습니다.
+
+    from posemanager import cache, io
+    pose_cache = cache.PoseCache("D:/cache/posemanager", max_bytes=512 * 1024 * 1024)
+    data = io.read("//share/face.pose", cache=pose_cache)
+
+directory layout
+    paths/<sha1(abs path)>  : (size, mtime_ns, digest). file 을 stat 만 해서 hit 를 확인합니다.
+    blobs/<digest>          : pickle 한 data. digest 는 file 내용의 sha1 이라 같은 내용의 file 은 blob 하나를 같이 씁니다.
+
+path entry 의 size, mtime 이 같으면 원본 file 을 읽지 않고 blob 을 읽습니다.
+다르면 원본을 한 번 읽어서 hash 하고, 같은 digest 의 blob 이 있으면 parse 하지 않습니다.
+
+여러 worker process 가 같은 directory 를 같이 써도 됩니다. 모든 write 는 임시 file 에 쓰고 os.replace 로 바꿉니다.
+읽다가 깨진 file 이나 지워진 file 은 miss 로 처리합니다. lock 은 사용하지 않습니다.
+blob 의 mtime 을 hit 마다 갱신하고, 오래된 blob 부터 지워서 max_bytes, max_entries 를 유지합니다 (LRU).
+"""
+# built-ins
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+default_directory = os.path.join(os.path.expanduser("~"), ".cache", "posemanager")
+default_max_bytes = 256 * 1024 * 1024
+default_max_entries = 512
+# pickle format 이 바뀌면 올립니다. 다른 version 의 entry 는 miss 입니다.
+version = 1
+
+
+def _write_atomic(file_path, payload):
+    directory = os.path.dirname(file_path)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(temp_path, file_path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class PoseCache(object):
+    """
+    :param directory: None 이면 default_directory
+    :param max_bytes: blob 전체 크기
+    :param max_entries: blob 개수
+    """
+
+    def __init__(self, directory=None, max_bytes=default_max_bytes, max_entries=default_max_entries):
+        self.directory = directory or default_directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.paths_dir = os.path.join(self.directory, "paths")
+        self.blobs_dir = os.path.join(self.directory, "blobs")
+        for d in (self.paths_dir, self.blobs_dir):
+            os.makedirs(d, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def _path_entry(self, file_path):
+        key = hashlib.sha1(os.path.abspath(file_path).encode("UTF-8")).hexdigest()
+        return os.path.join(self.paths_dir, key)
+
+    def _blob(self, digest):
+        return os.path.join(self.blobs_dir, digest)
+
+    def _load_blob(self, digest):
+        blob = self._blob(digest)
+        try:
+            with open(blob, "rb") as f:
+                entry_version, data = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError):
+            return None
+        if entry_version != version:
+            return None
+        try:
+            os.utime(blob, None)
+        except OSError:
+            pass
+        return data
+
+    def get(self, file_path):
+        """
+        원본 file 은 stat 만 합니다.
+
+        :return: data. 없거나 원본이 바뀌었으면 None
+        """
+        stat = os.stat(file_path)
+        try:
+            with open(self._path_entry(file_path), "rb") as f:
+                size, mtime_ns, digest = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError):
+            return None
+        if size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+            return None
+        return self._load_blob(digest)
+
+    def read(self, file_path):
+        """
+        :return: data. io.read 와 같습니다.
+        """
+        data = self.get(file_path)
+        if data is not None:
+            self.hits += 1
+            return data
+        self.misses += 1
+
+        stat = os.stat(file_path)
+        with open(file_path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha1(raw).hexdigest()
+        data = self._load_blob(digest)
+        if data is None:
+            data = json.loads(raw.decode("UTF-8"))
+            _write_atomic(self._blob(digest), pickle.dumps((version, data), protocol=pickle.HIGHEST_PROTOCOL))
+            self.evict(keep=digest)
+        _write_atomic(self._path_entry(file_path), pickle.dumps((stat.st_size, stat.st_mtime_ns, digest)))
+        return data
+
+    def entries(self):
+        """
+        :return: [(mtime, size, digest), ...] 오래된 순서
+        """
+        entries = []
+        for digest in os.listdir(self.blobs_dir):
+            if digest.startswith(".tmp"):
+                continue
+            try:
+                stat = os.stat(self._blob(digest))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, digest))
+        return sorted(entries)
+
+    def evict(self, keep=None):
+        """
+        오래된 blob 부터 지웁니다. path entry 는 남겨둬도 blob 이 없으면 miss 입니다.
+
+        :param keep: 지우지 않을 digest
+        :return: 지운 blob 수
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        removed = 0
+        for _, size, digest in entries:
+            if total <= self.max_bytes and count <= self.max_entries:
+                break
+            if digest == keep:
+                continue
+            try:
+                os.remove(self._blob(digest))
+            except OSError:
+                # 다른 process 가 먼저 지웠습니다.
+                pass
+            total -= size
+            count -= 1
+            removed += 1
+        return removed
+
+    def clear(self):
+        for d in (self.paths_dir, self.blobs_dir):
+            for name in os.listdir(d):
+                try:
+                    os.remove(os.path.join(d, name))
+                except OSError:
+                    pass
+
+    def stats(self):
+        entries = self.entries()
+        return {"entries": len(entries), "bytes": sum(size for _, size, _ in entries),
+                "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,265 @@
+# maya
+from maya import cmds as mc
+
+# pose manager
+from . import api
+from . import io as pm_io
+
+# built-ins
+import traceback
+
+
+def collect_scene():
+    """
+    pose manager 와 관련된 node, connection 을 한 번에 모읍니다.
+
+    :return: {interpolator name: {"shape": str, "pose": {pose: index}, "driven": {blendMatrix: {index, ...}}}},
+             blendMatrix set, npo set, {blendMatrix: driven} 실제로 driven 을 움직이는 blendMatrix
+    """
+    scene = {}
+    if not mc.objExists("pose_manager"):
+        return scene, set(), set(), {}
+
+    shapes = mc.ls(type="poseInterpolator") or []
+    parents = (mc.listRelatives(shapes, parent=True) or []) if shapes else []
+    for shape, parent in zip(shapes, parents):
+        if not parent.endswith("_pmInterpolator"):
+            continue
+        names = mc.poseInterpolator(shape, query=True, poseNames=True) or []
+        indexes = mc.poseInterpolator(shape, query=True, index=True) or []
+        scene[parent] = {"shape": shape, "pose": dict(zip(names, indexes)), "driven": {}}
+
+    shape_to_name = {v["shape"]: k for k, v in scene.items()}
+    if shape_to_name:
+        # output[i] -> target[i].weight
+        connections = mc.listConnections([s + ".output" for s in shape_to_name],
+                                         source=False,
+                                         destination=True,
+                                         connections=True,
+                                         plugs=True,
+                                         type="blendMatrix") or []
+        for src, dst in zip(connections[::2], connections[1::2]):
+            shape = src.split(".")[0]
+            blend_m = dst.split(".")[0]
+            src_index = int(src.split("[")[-1].split("]")[0])
+            dst_index = int(dst.split("[")[-1].split("]")[0])
+            # index 가 다르면 -1 로 기록합니다.
+            index = src_index if src_index == dst_index else -1
+            scene[shape_to_name[shape]]["driven"].setdefault(blend_m, set()).add(index)
+
+    blend_matrices = set(mc.ls(type="blendMatrix") or [])
+    npos = set(mc.ls("*_pm", type="transform") or [])
+
+    # blendMatrix.outputMatrix -> driven.offsetParentMatrix
+    # blendMatrix.outputMatrix -> decomposeMatrix.outputTranslate -> driven_pm.t
+    wired = {}
+    decompose = {}
+    decompose_matrices = set(mc.ls(type="decomposeMatrix") or [])
+    if blend_matrices:
+        connections = mc.listConnections([b + ".outputMatrix" for b in blend_matrices],
+                                         source=False,
+                                         destination=True,
+                                         connections=True,
+                                         plugs=True) or []
+        for src, dst in zip(connections[::2], connections[1::2]):
+            blend_m = src.split(".")[0]
+            node, attr = dst.split(".", 1)
+            if attr == "offsetParentMatrix" and blend_m == node + "_bm":
+                wired[blend_m] = node
+            elif attr == "inputMatrix" and node in decompose_matrices:
+                decompose[node] = blend_m
+    if decompose:
+        connections = mc.listConnections([d + ".outputTranslate" for d in decompose],
+                                         source=False,
+                                         destination=True,
+                                         connections=True,
+                                         plugs=True) or []
+        for src, dst in zip(connections[::2], connections[1::2]):
+            blend_m = decompose[src.split(".")[0]]
+            npo = dst.split(".")[0]
+            if npo == blend_m[:-len("_bm")] + "_pm":
+                wired[blend_m] = blend_m[:-len("_bm")]
+    return scene, blend_matrices, npos, wired
+
+
+def scan():
+    """
+    _data 와 scene 을 비교합니다.
+
+    :return: [{"type": str, "interpolator": str, "message": str}, ...]
+    """
+    report = []
+    if not mc.objExists("pose_manager"):
+        return report
+    data = api.get_data()
+    scene, blend_matrices, _, wired = collect_scene()
+
+    def add(issue_type, interpolator_name, message):
+        report.append({"type": issue_type, "interpolator": interpolator_name, "message": message})
+
+    for interpolator_name in sorted(set(scene) - set(data)):
+        add("extra_interpolator", interpolator_name, "interpolator not in _data")
+
+    for interpolator_name, interpolator_data in data.items():
+        if interpolator_name not in scene:
+            add("missing_interpolator", interpolator_name, "interpolator not in scene")
+            continue
+        scene_interpolator = scene[interpolator_name]
+        if not mc.objExists(interpolator_data["controller"]):
+            add("missing_controller", interpolator_name, interpolator_data["controller"])
+
+        for pose in interpolator_data["pose"]:
+            if pose not in scene_interpolator["pose"]:
+                add("missing_pose", interpolator_name, pose)
+
+        indexes = set(scene_interpolator["pose"][p] for p in interpolator_data["pose"] if p in scene_interpolator["pose"])
+        for blend_m in interpolator_data["driven"]:
+            driven = blend_m.replace("_bm", "")
+            if blend_m not in blend_matrices:
+                add("missing_blend_matrix", interpolator_name, blend_m)
+                continue
+            if wired.get(blend_m) != driven:
+                add("missing_driven_setup", interpolator_name, "{0} -> {1}_pm or {1}.offsetParentMatrix".format(
+                    blend_m, driven))
+            connected = scene_interpolator["driven"].get(blend_m, set())
+            if -1 in connected:
+                add("bad_connection", interpolator_name, "{0} output / target index mismatch".format(blend_m))
+            for index in sorted(indexes - connected):
+                add("missing_connection", interpolator_name, "output[{0}] -> {1}".format(index, blend_m))
+
+        for blend_m in sorted(set(scene_interpolator["driven"]) - set(interpolator_data["driven"])):
+            add("extra_connection", interpolator_name, blend_m)
+    return report
+
+
+def print_report(report):
+    if not report:
+        print("pose manager : no issue")
+        return
+    for issue in report:
+        print("{0:<22} {1:<40} {2}".format(issue["type"], issue["interpolator"], issue["message"]))
+    mc.warning("pose manager : {0} issue(s)".format(len(report)))
+
+
+def rebuild_data():
+    """
+    scene 을 기준으로 _data 를 다시 만듭니다.
+    controller, pose 의 controller t/r 은 scene 에 없으므로 기존 _data 의 값을 사용합니다.
+
+    :return: data
+    """
+    old_data = api.get_data() if mc.objExists("pose_manager._data") else {}
+    scene, _, _, wired = collect_scene()
+
+    data = {}
+    for interpolator_name, scene_interpolator in scene.items():
+        old = old_data.get(interpolator_name, {"pose": {}})
+        driver = interpolator_name.replace("_pmInterpolator", "")
+        controller = old.get("controller")
+        if not controller:
+            mc.warning("Don't exists controller of '{0}' in _data. use driver".format(interpolator_name))
+            controller = driver
+
+        # pose 가 없으면 weight 연결도 없으므로 blendMatrix -> driven 연결로 driven 을 찾습니다.
+        data[interpolator_name] = {"driver": driver, "driven": [], "pose": {}, "controller": controller}
+        blend_matrices = [b for b in old.get("driven", []) if b in scene_interpolator["driven"] or b in wired]
+        blend_matrices += sorted(set(scene_interpolator["driven"]) - set(blend_matrices))
+        data[interpolator_name]["driven"] = blend_matrices
+
+        # blendMatrix 마다 inputMatrix, target index 를 한 번씩 읽고 pose 의 target 만 읽습니다.
+        targets = {}
+        for blend_m in blend_matrices:
+            indexes = set(mc.getAttr(blend_m + ".target", multiIndices=True) or [])
+            input_matrix = mc.getAttr(blend_m + ".inputMatrix")
+            targets[blend_m] = (indexes, input_matrix)
+
+        for pose, index in scene_interpolator["pose"].items():
+            old_pose = old["pose"].get(pose, {"t": [0, 0, 0], "r": [0, 0, 0]})
+            offsets = {}
+            for blend_m in blend_matrices:
+                indexes, input_matrix = targets[blend_m]
+                if index not in indexes:
+                    continue
+                # targetMatrix 는 rest * offset 입니다.
+                driven = blend_m.replace("_bm", "")
+                offset = api.target_to_offset(driven, mc.getAttr(blend_m + ".target[{0}].targetMatrix".format(index)),
+                                              input_matrix)
+                if not api.is_identity_offset(offset):
+                    offsets[driven] = offset
+            data[interpolator_name]["pose"][pose] = {"t": old_pose["t"], "r": old_pose["r"], "driven": offsets}
+
+    api.initialize()
+    api.set_data(data)
+    return data
+
+
+def rebuild_scene():
+    """
+    _data 를 기준으로 scene 을 고칩니다.
+    없는 interpolator 는 새로 만들고, 없는 connection 은 연결하고, targetMatrix 는 _data 값으로 설정합니다.
+    """
+    data = api.get_data()
+    scene, blend_matrices, _, wired = collect_scene()
+
+    mc.undoInfo(openChunk=True, infinity=True)
+    try:
+        for interpolator_name, interpolator_data in data.items():
+            if interpolator_name not in scene:
+                # _data 에서 지우고 새로 만듭니다.
+                removed = api.get_data()
+                del removed[interpolator_name]
+                api.set_data(removed)
+                pm_io.build_interpolator(interpolator_name, interpolator_data)
+                # 남아있던 npo 에 새 blendMatrix 를 연결합니다.
+                for blend_m in interpolator_data["driven"]:
+                    if mc.objExists(blend_m):
+                        api.connect_driven_setup(blend_m.replace("_bm", ""), blend_m, api.topology_offset)
+                continue
+
+            scene_interpolator = scene[interpolator_name]
+            for pose in interpolator_data["pose"]:
+                if pose not in scene_interpolator["pose"]:
+                    mc.warning("Don't exists pose '{0}' in '{1}'. re-add pose".format(pose, interpolator_name))
+                    controller = interpolator_data["controller"]
+                    mc.setAttr(controller + ".t", *interpolator_data["pose"][pose]["t"])
+                    mc.setAttr(controller + ".r", *interpolator_data["pose"][pose]["r"])
+                    index = mc.poseInterpolator(scene_interpolator["shape"], edit=True, addPose=pose)
+                    mc.setAttr(scene_interpolator["shape"] + ".pose[{0}].poseType".format(index), 1)
+                    mc.setAttr(controller + ".t", 0, 0, 0)
+                    mc.setAttr(controller + ".r", 0, 0, 0)
+                    scene_interpolator["pose"][pose] = index
+
+            for blend_m in interpolator_data["driven"]:
+                driven = blend_m.replace("_bm", "")
+                if blend_m not in blend_matrices:
+                    mc.warning("Don't exists '{0}' in '{1}'. re-create blendMatrix".format(blend_m, interpolator_name))
+                    mc.createNode("blendMatrix", name=blend_m)
+                    blend_matrices.add(blend_m)
+                    scene_interpolator["driven"].pop(blend_m, None)
+                if wired.get(blend_m) != driven:
+                    # npo 가 남아있으면 다시 연결합니다. npo 가 없으면 offsetParentMatrix topology 였습니다.
+                    api.connect_driven_setup(driven, blend_m, api.topology_offset)
+                    wired[blend_m] = driven
+                connected = scene_interpolator["driven"].get(blend_m, set())
+                for pose, index in scene_interpolator["pose"].items():
+                    if pose not in interpolator_data["pose"]:
+                        continue
+                    if index not in connected:
+                        mc.connectAttr(scene_interpolator["shape"] + ".output[{0}]".format(index),
+                                       blend_m + ".target[{0}].weight".format(index),
+                                       force=True)
+                    api.set_pose_targets(blend_m, index, api.get_driven_offset(interpolator_data["pose"][pose], driven))
+        api.set_data(data)
+
+        # blendMatrix 가 실제로 driven 을 움직이는지 확인합니다.
+        wired = collect_scene()[3]
+        unwired = [b for d in data.values() for b in d["driven"] if wired.get(b) != b.replace("_bm", "")]
+        if unwired:
+            raise RuntimeError("blendMatrix not connected to driven : {0}".format(unwired))
+    except Exception:
+        traceback.print_exc()
+        mc.warning("Occur error rebuild_scene. Returned to action")
+        mc.undoInfo(closeChunk=True)
+        mc.undo()
+    else:
+        mc.undoInfo(closeChunk=True)
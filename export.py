@@ -0,0 +1,394 @@
+"""
+realtime runtime 용 packed array export.
+
+    from posemanager import export
+    export.write("face.pmpk", api.get_data(), falloffs=export.collect_falloffs())
+    with export.PackedFile("face.pmpk") as packed:
+        weights, drivens = export.evaluate(packed.interpolators[0], t, r)
+
+모든 숫자는 little endian 입니다. 모든 array 는 64 byte 로 align 되어 있어
+numpy.memmap(file, dtype="<f4", offset=..., shape=...) 나 memoryview 로 복사 없이 읽을 수 있습니다.
+
+header (64 byte)
+    magic "PMPK", version u32, flags u32 (1 : offset 이 quaternion 대신 matrix), interpolator count u32,
+    name table offset u64, name count u32, pad u32, directory offset u64
+directory (interpolator 마다 64 byte)
+    name u32, driver u32, controller u32, pose count u32, driven count u32, pad u32,
+    pose names offset u64 (u32 x P), driven names offset u64 (u32 x D),
+    targets offset u64 (f32 x P x 8 : tx ty tz 0 qx qy qz qw),
+    falloffs offset u64 (f32 x P),
+    offsets offset u64 (f32 x D x P x 8 : tx ty tz 0 qx qy qz qw, flags 1 이면 x 16 : row major matrix)
+name table
+    u32 x (count + 1) byte offset, utf-8 bytes
+
+한계
+    weight 는 solver.PoseSolver (gaussian rbf) 로 계산합니다. solver 는 maya poseInterpolator 의 내부 구현과 같지 않으므로
+    pose target 에서는 같은 weight 를 주지만 pose 사이와 rest 에서는 maya 와 다른 값이 나올 수 있습니다.
+    verify_round_trip 은 packing 만 확인하고, maya 와의 차이는 verify_scene 으로 확인합니다.
+"""
+# pose manager
+from . import model
+from . import solver
+
+# built-ins
+import mmap
+import struct
+import sys
+from array import array
+
+magic = b"PMPK"
+version = 1
+flag_matrix = 1
+alignment = 64
+default_falloff = 1.0
+
+_header = struct.Struct("<4sIIIQIIQ16x")
+_entry = struct.Struct("<IIIIIIQQQQQ")
+
+
+def float_bytes(values):
+    a = array("f", values)
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a.tobytes()
+
+
+def uint_bytes(values):
+    a = array("I", values)
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a.tobytes()
+
+
+class Buffer(object):
+
+    def __init__(self, size):
+        self.data = bytearray(size)
+
+    def append(self, payload):
+        # 64 byte align 후 추가하고 offset 을 반환합니다.
+        pad = -len(self.data) % alignment
+        self.data += b"\0" * pad
+        offset = len(self.data)
+        self.data += payload
+        return offset
+
+
+class NameTable(object):
+
+    def __init__(self):
+        self.names = []
+        self.indexes = {}
+
+    def index(self, name):
+        if name not in self.indexes:
+            self.indexes[name] = len(self.names)
+            self.names.append(name)
+        return self.indexes[name]
+
+    def to_bytes(self):
+        encoded = [n.encode("UTF-8") for n in self.names]
+        offsets = [0]
+        for e in encoded:
+            offsets.append(offsets[-1] + len(e))
+        return uint_bytes(offsets) + b"".join(encoded)
+
+
+def read_name_table(buffer, offset, count):
+    offsets = struct.unpack_from("<%dI" % (count + 1), buffer, offset)
+    start = offset + (count + 1) * 4
+    return [bytes(buffer[start + a:start + b]).decode("UTF-8") for a, b in zip(offsets[:-1], offsets[1:])]
+
+
+def collect_falloffs(data=None):
+    """
+    scene 의 poseInterpolator 에서 pose falloff 를 읽습니다. maya 가 필요합니다.
+
+    :return: {interpolator name: {pose: falloff}}
+    """
+    from maya import cmds as mc
+    from . import api
+
+    data = data if data is not None else api.get_data()
+    falloffs = {}
+    for interpolator_name, interpolator_data in data.items():
+        if not mc.objExists(interpolator_name):
+            continue
+        interpolator = mc.listRelatives(interpolator_name, shapes=True)[0]
+        names = mc.poseInterpolator(interpolator, query=True, poseNames=True) or []
+        indexes = mc.poseInterpolator(interpolator, query=True, index=True) or []
+        falloffs[interpolator_name] = {
+            n: mc.getAttr(interpolator + ".pose[{0}].poseFalloff".format(i))
+            for n, i in zip(names, indexes) if n in interpolator_data["pose"]
+        }
+    return falloffs
+
+
+def write(file_path, data, falloffs=None, rotation="quaternion"):
+    """
+    :param file_path:
+    :param data: _data or pose file data
+    :param falloffs: {interpolator name: {pose: falloff}}. 없으면 default_falloff
+    :param rotation: "quaternion" or "matrix"
+    :return: file_path
+    """
+    falloffs = falloffs or {}
+    interpolators = list(model.from_data(data).values())
+    flags = flag_matrix if rotation == "matrix" else 0
+
+    names = NameTable()
+    buffer = Buffer(_header.size + _entry.size * len(interpolators))
+    entries = []
+    for interpolator in interpolators:
+        poses = list(interpolator.poses.values())
+        pose_falloffs = falloffs.get(interpolator.name, {})
+
+        targets = []
+        for t, q in solver.interpolator_targets(interpolator):
+            targets += list(t) + [0.0] + list(q)
+        offsets = []
+        for driven in interpolator.drivens:
+            for t, q in solver.interpolator_offsets(interpolator, driven):
+                if flags & flag_matrix:
+                    offsets += solver.offset_to_matrix(t, q)
+                else:
+                    offsets += list(t) + [0.0] + list(q)
+
+        entries.append((
+            names.index(interpolator.name),
+            names.index(interpolator.driver),
+            names.index(interpolator.controller),
+            len(poses),
+            len(interpolator.drivens),
+            0,
+            buffer.append(uint_bytes([names.index(p.name) for p in poses])),
+            buffer.append(uint_bytes([names.index(d) for d in interpolator.drivens])),
+            buffer.append(float_bytes(targets)),
+            buffer.append(float_bytes([pose_falloffs.get(p.name, default_falloff) for p in poses])),
+            buffer.append(float_bytes(offsets))
+        ))
+
+    name_table_offset = buffer.append(names.to_bytes())
+
+    _header.pack_into(buffer.data, 0, magic, version, flags, len(interpolators),
+                      name_table_offset, len(names.names), 0, _header.size)
+    for i, entry in enumerate(entries):
+        _entry.pack_into(buffer.data, _header.size + _entry.size * i, *entry)
+
+    with open(file_path, "wb") as f:
+        f.write(buffer.data)
+    return file_path
+
+
+class PackedInterpolator(object):
+    """
+    targets, falloffs, offsets 는 file 의 mmap 을 가리키는 float memoryview 입니다.
+    offsets 는 [driven][pose][stride] 순서입니다.
+    """
+
+    __slots__ = ("name", "driver", "controller", "poses", "drivens", "targets", "falloffs", "offsets", "stride",
+                 "_solver")
+
+    def target(self, pose_index):
+        i = pose_index * 8
+        return list(self.targets[i:i + 3]), list(self.targets[i + 4:i + 8])
+
+    def offset(self, driven_index, pose_index):
+        i = (driven_index * len(self.poses) + pose_index) * self.stride
+        values = self.offsets[i:i + self.stride]
+        if self.stride == 16:
+            rows = [list(values[0:3]), list(values[4:7]), list(values[8:11])]
+            return list(values[12:15]), solver.rows_to_quaternion(rows)
+        return list(values[0:3]), list(values[4:8])
+
+
+class PackedFile(object):
+
+    def __init__(self, file_path):
+        self.file = open(file_path, "rb")
+        self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.buffer)
+
+        header = _header.unpack_from(self.buffer, 0)
+        if header[0] != magic:
+            raise ValueError("Not packed pose file '{0}'".format(file_path))
+        _, self.version, self.flags, count, name_offset, name_count, _, directory_offset = header
+
+        self.names = read_name_table(self.buffer, name_offset, name_count)
+
+        stride = 16 if self.flags & flag_matrix else 8
+        self.layout = []
+        self.interpolators = []
+        for i in range(count):
+            entry = _entry.unpack_from(self.buffer, directory_offset + _entry.size * i)
+            (name, driver, controller, pose_count, driven_count, _,
+             pose_names, driven_names, targets, falloffs, offsets) = entry
+            interpolator = PackedInterpolator()
+            interpolator.name = self.names[name]
+            interpolator.driver = self.names[driver]
+            interpolator.controller = self.names[controller]
+            interpolator.poses = [self.names[n] for n in self._uints(pose_names, pose_count)]
+            interpolator.drivens = [self.names[n] for n in self._uints(driven_names, driven_count)]
+            interpolator.targets = self._floats(targets, pose_count * 8)
+            interpolator.falloffs = self._floats(falloffs, pose_count)
+            interpolator.offsets = self._floats(offsets, driven_count * pose_count * stride)
+            interpolator.stride = stride
+            interpolator._solver = None
+            self.interpolators.append(interpolator)
+            # numpy.memmap(file, dtype="<f4", offset=offset, shape=shape)
+            self.layout.append({
+                "name": interpolator.name,
+                "targets": {"offset": targets, "dtype": "<f4", "shape": (pose_count, 8)},
+                "falloffs": {"offset": falloffs, "dtype": "<f4", "shape": (pose_count,)},
+                "offsets": {"offset": offsets, "dtype": "<f4", "shape": (driven_count, pose_count, stride)}
+            })
+
+    def _uints(self, offset, count):
+        values = self.view[offset:offset + count * 4].cast("I")
+        return list(values) if sys.byteorder == "little" else list(struct.unpack_from("<%dI" % count, self.buffer, offset))
+
+    def _floats(self, offset, count):
+        if sys.byteorder == "little":
+            return self.view[offset:offset + count * 4].cast("f")
+        return array("f", struct.unpack_from("<%df" % count, self.buffer, offset))
+
+    def close(self):
+        for interpolator in self.interpolators:
+            interpolator.targets = interpolator.falloffs = interpolator.offsets = None
+        self.view.release()
+        self.buffer.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def evaluate(interpolator, t, r):
+    """
+    reference evaluator. packed array 만 사용합니다.
+
+    :param interpolator: PackedInterpolator
+    :param t: controller translate
+    :param r: controller rotate (xyz euler degrees)
+    :return: [weight, ...], {driven: (t, q)}
+    """
+    if interpolator._solver is None:
+        targets = [interpolator.target(i) for i in range(len(interpolator.poses))]
+        interpolator._solver = solver.PoseSolver(targets, list(interpolator.falloffs))
+    weights = interpolator._solver.weights(list(t), solver.euler_to_quaternion(r))
+    drivens = {}
+    for d, driven in enumerate(interpolator.drivens):
+        offsets = [interpolator.offset(d, p) for p in range(len(interpolator.poses))]
+        drivens[driven] = solver.blend(offsets, weights)
+    return weights, drivens
+
+
+def evaluate_data(interpolator, t, r, falloffs=None):
+    """
+    _data 로 계산합니다. evaluate 와 비교할 기준입니다.
+
+    :param interpolator: model.Interpolator
+    :return: [weight, ...], {driven: (t, q)}
+    """
+    falloffs = falloffs or {}
+    pose_solver = solver.PoseSolver(solver.interpolator_targets(interpolator),
+                                    [falloffs.get(p, default_falloff) for p in interpolator.poses])
+    weights = pose_solver.weights(list(t), solver.euler_to_quaternion(r))
+    drivens = {d: solver.blend(solver.interpolator_offsets(interpolator, d), weights) for d in interpolator.drivens}
+    return weights, drivens
+
+
+def _samples(interpolator):
+    """
+    rest, pose target, 인접한 pose 의 중간 지점
+
+    :return: [(t, r), ...]
+    """
+    poses = list(interpolator.poses.values())
+    samples = [([0.0] * 3, [0.0] * 3)] + [(list(p.t), list(p.r)) for p in poses]
+    samples += [([(a + b) * 0.5 for a, b in zip(p0.t, p1.t)], [(a + b) * 0.5 for a, b in zip(p0.r, p1.r)])
+                for p0, p1 in zip(poses[:-1], poses[1:])]
+    return samples
+
+
+def verify_round_trip(file_path, data, falloffs=None):
+    """
+    pose target 과 인접한 pose 의 중간 지점에서 packed 결과와 _data 결과를 비교합니다.
+    두 결과 모두 solver.PoseSolver 로 계산하므로 float32 packing 과 quantization 오차만 확인합니다.
+    solver 와 maya poseInterpolator 의 차이는 verify_scene 으로 확인합니다.
+
+    :return: {interpolator name: {"weight": max error, "translate": max error, "rotate": max error (radians)}}
+    """
+    falloffs = falloffs or {}
+    interpolators = model.from_data(data)
+    report = {}
+    with PackedFile(file_path) as packed:
+        for packed_interpolator in packed.interpolators:
+            interpolator = interpolators[packed_interpolator.name]
+            error = {"weight": 0.0, "translate": 0.0, "rotate": 0.0}
+            for t, r in _samples(interpolator):
+                packed_weights, packed_drivens = evaluate(packed_interpolator, t, r)
+                weights, drivens = evaluate_data(interpolator, t, r, falloffs.get(interpolator.name))
+                error["weight"] = max([error["weight"]] + [abs(a - b) for a, b in zip(packed_weights, weights)])
+                for driven, (driven_t, driven_q) in drivens.items():
+                    packed_t, packed_q = packed_drivens[driven]
+                    error["translate"] = max([error["translate"]] + [abs(a - b) for a, b in zip(packed_t, driven_t)])
+                    error["rotate"] = max(error["rotate"], solver.angle(packed_q, driven_q))
+            report[packed_interpolator.name] = error
+    return report
+
+
+def verify_scene(file_path, data=None):
+    """
+    verify_round_trip 과 같은 지점으로 controller 를 옮기고 packed weight 를 scene 의 poseInterpolator output 과 비교합니다.
+    maya 가 필요합니다. controller 값은 undo queue 밖에서 바꾸고 끝나면 되돌립니다.
+    target 은 pose target 에서의 오차이고, weight 는 rest 와 pose 사이를 포함한 오차입니다.
+
+    :param data: None 이면 api.get_data()
+    :return: {interpolator name: {"weight": max error, "target": max error}}
+    """
+    from maya import cmds as mc
+    from . import api
+
+    data = api.get_data() if data is None else data
+    interpolators = model.from_data(data)
+    report = {}
+    undo_state = mc.undoInfo(query=True, state=True)
+    mc.undoInfo(stateWithoutFlush=False)
+    try:
+        with PackedFile(file_path) as packed:
+            for packed_interpolator in packed.interpolators:
+                interpolator = interpolators[packed_interpolator.name]
+                controller = interpolator.controller
+                shape = mc.listRelatives(interpolator.name, shapes=True)[0]
+                names = mc.poseInterpolator(shape, query=True, poseNames=True) or []
+                indexes = mc.poseInterpolator(shape, query=True, index=True) or []
+                output_indexes = mc.getAttr(shape + ".output", multiIndices=True) or []
+                column = dict(zip(names, indexes))
+                order = [output_indexes.index(column[p]) if column.get(p) in output_indexes else None
+                         for p in packed_interpolator.poses]
+
+                rest = (mc.getAttr(controller + ".t")[0], mc.getAttr(controller + ".r")[0])
+                error = {"weight": 0.0, "target": 0.0}
+                try:
+                    for sample, (t, r) in enumerate(_samples(interpolator)):
+                        mc.setAttr(controller + ".t", *t)
+                        mc.setAttr(controller + ".r", *r)
+                        output = mc.getAttr(shape + ".output") or []
+                        weights = [output[i] if i is not None and i < len(output) else 0.0 for i in order]
+                        packed_weights, _ = evaluate(packed_interpolator, t, r)
+                        sample_error = max([0.0] + [abs(a - b) for a, b in zip(packed_weights, weights)])
+                        error["weight"] = max(error["weight"], sample_error)
+                        # sample 0 은 rest, 1 ~ pose count 는 pose target
+                        if 0 < sample <= len(interpolator.poses):
+                            error["target"] = max(error["target"], sample_error)
+                finally:
+                    mc.setAttr(controller + ".t", *rest[0])
+                    mc.setAttr(controller + ".r", *rest[1])
+                report[packed_interpolator.name] = error
+    finally:
+        mc.undoInfo(stateWithoutFlush=undo_state)
+    return report
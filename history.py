@@ -0,0 +1,358 @@
+"""
+_data 의 version history. 저장할 때나 N 번 수정할 때마다 snapshot 을 기록합니다.
+
+    from posemanager import history
+    store = history.History(history.history_directory("D:/rig/face.pose"))
+    store.record(api.get_data(), label="jaw fix")
+    for entry in store.versions():
+        print(entry["version"], entry["label"], entry["changed"])
+    history.restore(store, 3)
+
+    store = history.get(history.history_directory("D:/rig/face.pose"))  # directory 마다 하나를 같이 씁니다.
+    recorder = history.Recorder(store, every=20)
+    recorder.start()
+
+directory layout
+    index.json          : [{"version", "time", "label", "added", "changed", "removed"}, ...] listing 은 이 file 만 읽습니다.
+    versions/<version>  : index entry 와 "interpolators": [[name, digest], ...] data 순서
+    objects/<digest>    : zlib 으로 압축한 interpolator 하나의 json. digest 는 sorted json 의 sha1 입니다.
+
+snapshot 은 이전 version 에서 바뀐 interpolator 만 object 로 씁니다. 바뀌지 않은 interpolator 는 digest 만 다시 가리키므로
+저장 크기와 시간은 rig 크기 x version 수가 아니라 수정한 양에 비례합니다. 예전 상태로 되돌린 interpolator 도 object 를 다시 쓰지 않습니다.
+version 하나를 읽을 때는 그 version 의 manifest 와 object 만 읽습니다. 이전 version 을 순서대로 적용하지 않습니다.
+
+History 는 maya 가 필요 없습니다. restore, Recorder 는 maya 가 필요합니다.
+file 은 모두 임시 file 에 쓰고 os.replace 로 바꿉니다. record 는 매번 index.json 을 다시 읽고 version file 을 O_EXCL 로 만들어서
+같은 directory 에 쓰는 History 가 여러 개여도 version 번호가 겹치지 않습니다.
+"""
+# built-ins
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import traceback
+import zlib
+
+history_suffix = ".history"
+_histories = {}
+_histories_lock = threading.Lock()
+
+
+def history_directory(file_path):
+    """
+    :param file_path: .pose file
+    :return: <file_path>.history
+    """
+    return file_path + history_suffix
+
+
+def get(directory):
+    """
+    :param directory: history directory
+    :return: directory 마다 같은 History
+    """
+    key = os.path.normcase(os.path.abspath(directory))
+    with _histories_lock:
+        if key not in _histories:
+            _histories[key] = History(directory)
+        return _histories[key]
+
+
+def _write_atomic(file_path, payload):
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), prefix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(temp_path, file_path)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _claim(file_path, payload):
+    """
+    :return: file_path 를 새로 만들었는지. 이미 있으면 False
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), prefix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.link(temp_path, file_path)
+    except FileExistsError:
+        return False
+    finally:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+    return True
+
+
+def _encode(interpolator_data):
+    return json.dumps(interpolator_data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("UTF-8")
+
+
+def digest(interpolator_data):
+    return hashlib.sha1(_encode(interpolator_data)).hexdigest()
+
+
+def manifest_changes(old, new):
+    """
+    :param old: [[name, digest], ...]
+    :param new: [[name, digest], ...]
+    :return: {"added": [name], "changed": [name], "removed": [name]}
+    """
+    old = dict(old)
+    new_names = [name for name, _ in new]
+    return {
+        "added": [name for name in new_names if name not in old],
+        "changed": [name for name, d in new if name in old and old[name] != d],
+        "removed": [name for name in old if name not in new_names]
+    }
+
+
+class History(object):
+    """
+    :param directory: history directory. 없으면 만듭니다.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.objects_dir = os.path.join(directory, "objects")
+        self.versions_dir = os.path.join(directory, "versions")
+        for d in (self.objects_dir, self.versions_dir):
+            os.makedirs(d, exist_ok=True)
+        self.index_path = os.path.join(directory, "index.json")
+        self.lock = threading.Lock()
+
+    def versions(self):
+        """
+        :return: index. 오래된 순서
+        """
+        try:
+            with open(self.index_path, "r", encoding="UTF-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = []
+
+        # 다른 History 와 동시에 index.json 을 써서 빠진 version 은 version file 에서 채웁니다.
+        listed = set(e["version"] for e in index)
+        missing = [v for v in self._version_numbers() if v not in listed]
+        for version in missing:
+            with open(self._version_path(version), "r", encoding="UTF-8") as f:
+                entry = json.load(f)
+            entry.pop("interpolators", None)
+            index.append(entry)
+        if missing:
+            index.sort(key=lambda e: e["version"])
+        return index
+
+    def _version_numbers(self):
+        return [int(n[:-5]) for n in os.listdir(self.versions_dir) if n.endswith(".json") and n[:-5].isdigit()]
+
+    def latest(self):
+        # index.json 보다 version file 이 먼저 써지므로 versions directory 를 봅니다.
+        numbers = self._version_numbers()
+        return max(numbers) if numbers else None
+
+    def _version_path(self, version):
+        return os.path.join(self.versions_dir, "{0:06d}.json".format(version))
+
+    def manifest(self, version):
+        """
+        :return: [[name, digest], ...]
+        """
+        with open(self._version_path(version), "r", encoding="UTF-8") as f:
+            return json.load(f)["interpolators"]
+
+    def _object_path(self, object_digest):
+        return os.path.join(self.objects_dir, object_digest)
+
+    def read_object(self, object_digest):
+        with open(self._object_path(object_digest), "rb") as f:
+            return json.loads(zlib.decompress(f.read()).decode("UTF-8"))
+
+    def read(self, version, interpolators=None):
+        """
+        :param version:
+        :param interpolators: 읽을 interpolator name list. None 이면 전체
+        :return: data
+        """
+        return {name: self.read_object(d) for name, d in self.manifest(version)
+                if interpolators is None or name in interpolators}
+
+    def record(self, data, label="", force=False):
+        """
+        :param data: _data
+        :param label: 표시할 이름
+        :param force: 바뀐 것이 없어도 version 을 만듭니다.
+        :return: 새 version. 바뀐 것이 없으면 None
+        """
+        with self.lock:
+            return self._record(data, label, force)
+
+    def _record(self, data, label, force):
+        manifest = []
+        payloads = {}
+        for name, interpolator_data in data.items():
+            encoded = _encode(interpolator_data)
+            object_digest = hashlib.sha1(encoded).hexdigest()
+            manifest.append([name, object_digest])
+            payloads[object_digest] = encoded
+
+        # 이미 있는 object 는 다시 쓰지 않습니다.
+        written = False
+        while True:
+            latest = self.latest()
+            previous = self.manifest(latest) if latest is not None else []
+            if not force and manifest == previous:
+                return None
+            if not written:
+                for object_digest, encoded in payloads.items():
+                    object_path = self._object_path(object_digest)
+                    if not os.path.exists(object_path):
+                        _write_atomic(object_path, zlib.compress(encoded, 6))
+                written = True
+
+            # 다 쓴 임시 file 을 link 해서 version 을 차지합니다.
+            # 다른 History 가 먼저 같은 version 을 만들었으면 다시 비교합니다.
+            version = (latest or 0) + 1
+            entry = {"version": version, "time": time.time(), "label": label}
+            entry.update(manifest_changes(previous, manifest))
+            if _claim(self._version_path(version),
+                      json.dumps(dict(entry, interpolators=manifest), ensure_ascii=False).encode("UTF-8")):
+                break
+
+        index = [e for e in self.versions() if e["version"] != version] + [entry]
+        index.sort(key=lambda e: e["version"])
+        _write_atomic(self.index_path, json.dumps(index, indent=1, ensure_ascii=False).encode("UTF-8"))
+        return version
+
+    def changes(self, version_a, version_b):
+        """
+        :return: manifest_changes
+        """
+        return manifest_changes(self.manifest(version_a), self.manifest(version_b))
+
+
+def restore(history, version):
+    """
+    scene 을 version 의 data 로 되돌립니다. 현재 _data 와 다른 interpolator 만 지우고 다시 만듭니다. maya 가 필요합니다.
+
+    :param history: History
+    :param version:
+    :return: {"added", "changed", "removed"}. 실패하면 None
+    """
+    from maya import cmds as mc
+    from . import api
+    from . import io as pm_io
+
+    current = api.get_data() if mc.objExists("pose_manager._data") else {}
+    manifest = history.manifest(version)
+    changes = manifest_changes([[name, digest(d)] for name, d in current.items()], manifest)
+    rebuild = changes["added"] + changes["changed"]
+    data = history.read(version, rebuild)
+
+    mc.undoInfo(openChunk=True, infinity=True)
+    try:
+        remove = changes["changed"] + changes["removed"]
+        if remove:
+            api.delete_drivers([current[name]["driver"] for name in remove])
+        for name, _ in manifest:
+            if name in data:
+                pm_io.build_interpolator(name, data[name])
+    except Exception:
+        traceback.print_exc()
+        mc.warning("Occur error restore history version {0}. Returned to action".format(version))
+        mc.undoInfo(closeChunk=True)
+        mc.undo()
+        return None
+    else:
+        mc.undoInfo(closeChunk=True)
+    return changes
+
+
+class Recorder(object):
+    """
+    pose_manager._data 를 every 번 수정할 때마다 snapshot 을 기록합니다. maya 가 필요합니다.
+    io.load, restore 처럼 한 번의 작업 안에서 _data 를 여러 번 쓰면 한 번으로 셉니다.
+    _data 가 바뀌면 evalDeferred 로 idle 때 한 번 세므로 작업 중간 상태는 세지도 기록하지도 않습니다.
+
+    :param history: History
+    :param every: 수정 횟수
+    """
+
+    def __init__(self, history, every=20):
+        self.history = history
+        self.every = max(1, every)
+        self.count = 0
+        self.callback = None
+        self.pending = False
+
+    @property
+    def running(self):
+        return self.callback is not None
+
+    def start(self):
+        from maya.api import OpenMaya as om
+        from . import api
+
+        if self.running:
+            return
+        selection = om.MSelectionList()
+        selection.add(api.initialize())
+        self.callback = om.MNodeMessage.addAttributeChangedCallback(selection.getDependNode(0), self.changed)
+
+    def stop(self):
+        from maya.api import OpenMaya as om
+
+        self.pending = False
+        if self.running:
+            om.MMessage.removeCallback(self.callback)
+            self.callback = None
+
+    def changed(self, message, plug, other_plug, client_data):
+        from maya import cmds as mc
+        from maya.api import OpenMaya as om
+
+        if not message & om.MNodeMessage.kAttributeSet or plug.partialName() != "_data":
+            return
+        if self.pending:
+            return
+        self.pending = True
+        mc.evalDeferred(self.committed, lowestPriority=True)
+
+    def committed(self):
+        """
+        _data 를 쓴 작업이 끝난 뒤 한 번 불립니다.
+        """
+        if not self.pending:
+            return
+        self.pending = False
+        if not self.running:
+            return
+        self.count += 1
+        if self.count >= self.every:
+            self.flush()
+
+    def flush(self, label="auto"):
+        """
+        남은 수정이 있으면 지금 기록합니다.
+
+        :return: 새 version or None
+        """
+        from . import api
+
+        if not self.count:
+            return None
+        self.count = 0
+        try:
+            return self.history.record(api.get_data(), label=label)
+        except Exception:
+            traceback.print_exc()
+            return None
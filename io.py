@@ -7,55 +7,131 @@ from maya import cmds as mc
 
 # pose manager
 from . import api
+from . import model
+from . import retarget
 
 
-def load(file_path):
+def read(file_path, cache=None):
+    """
+    read and parse pose file. no maya call, safe to run in a worker thread
+
+    :param file_path:
+    :param cache: cache.PoseCache. 있으면 parse 한 결과를 local disk 에서 읽습니다.
+    :return:
+    """
+    if cache is not None:
+        return cache.read(file_path)
+    with open(file_path, "r", encoding="UTF-8") as f:
+        return json.load(f)
+
+
+def build_interpolator(interpolator_name, interpolator_data, topology=None):
+    """
+    generate one interpolator from data
+
+    create interpolator
+    loop driven
+        create blendMatrix
+        create driven npo
+        connect blendMatrix -> driven npo
+    loop pose
+        add pose
+        set driven targetMatrix (rest * offset)
+
+    :param interpolator_name:
+    :param interpolator_data:
+    :param topology: driven topology. api.topology_npo or api.topology_offset. None 이면 api.driven_topology
+    :return:
+    """
+    source = model.Interpolator.from_data(interpolator_name, interpolator_data)
+
+    # add driver
+    driver = interpolator_name.replace("_pmInterpolator", "")
+    controller = source.controller
+    api.add_driver(driver, controller)
+
+    for driven in source.drivens:
+        # add driven
+        api.add_driven(driver, driven, topology)
+
+    interpolator = mc.listRelatives(interpolator_name, shapes=True)[0]
+    offsets = {}
+    for pose in source.poses.values():
+        # add pose
+        mc.setAttr(controller + ".t", *pose.t)
+        mc.setAttr(controller + ".r", *pose.r)
+        api.add_pose(driver, pose.name)
+        names = mc.poseInterpolator(interpolator, query=True, poseNames=True) or []
+        if pose.name not in names:
+            # add_pose 가 실패했습니다. warning 은 add_pose 가 남깁니다.
+            continue
+        index = mc.poseInterpolator(interpolator, query=True, index=True)[names.index(pose.name)]
+
+        offsets[pose.name] = []
+        for driven, offset in pose.offsets.items():
+            # 예전 dense file 의 identity offset 은 건너뜁니다.
+            if offset.is_identity():
+                continue
+            if driven + "_bm" not in source.blend_matrices:
+                mc.warning("Don't exists blendMatrix '{0}' in _data".format(driven + "_bm"))
+                continue
+            # offset 은 driven rest 기준입니다.
+            api.set_pose_targets(driven + "_bm", index, offset.to_data())
+            offsets[pose.name].append(offset)
+
+    mc.setAttr(controller + ".t", 0, 0, 0)
+    mc.setAttr(controller + ".r", 0, 0, 0)
+
+    data = api.get_data()
+    built = model.Interpolator.from_data(interpolator_name, data[interpolator_name])
+    for pose, pose_offsets in offsets.items():
+        if pose in built.poses:
+            for offset in pose_offsets:
+                built.poses[pose].set_offset(offset.driven, offset.t, offset.r)
+    data[interpolator_name] = built.to_data()
+    api.set_data(data)
+
+
+def resolve_names(data, name_map):
+    """
+    data 의 driver, controller, driven 이름을 name_map 으로 바꾸고 scene 에 있는지 확인합니다. scene 은 수정하지 않습니다.
+
+    :param data: pose file data
+    :param name_map: retarget.NameMap or callable
+    :return: retarget.resolve result
+    """
+    report = retarget.resolve(data, name_map, mc.objExists)
+    for kind, source, target in report["missing"]:
+        mc.warning("Don't exists {0} '{1}' mapped from '{2}'".format(kind, target, source))
+    for target, sources in report["duplicate"]:
+        mc.warning("Duplicated target '{0}' mapped from {1}".format(target, sources))
+    return report
+
+
+def load(file_path, topology=None, name_map=None, cache=None):
     """
     generate PSD from data
 
     loop data
-        create interpolator
-        loop driven
-            create blendMatrix
-            create driven npo
-            connect blendMatrix -> driven npo
-        loop pose
-            add pose
+        build interpolator
 
     :param file_path:
+    :param topology: driven topology. api.topology_npo or api.topology_offset. None 이면 api.driven_topology
+    :param name_map: retarget.NameMap. 이름을 바꿔서 적용합니다. 없는 이름이 있으면 아무것도 만들지 않고 None 을 반환합니다.
+    :param cache: cache.PoseCache
     :return:
     """
-    with open(file_path, "r", encoding="UTF-8") as f:
-        data = json.load(f)
+    data = read(file_path, cache)
+    if name_map is not None:
+        report = resolve_names(data, name_map)
+        if report["missing"] or report["duplicate"]:
+            return None
+        data = report["data"]
 
     mc.undoInfo(openChunk=True, infinity=True)
     try:
         for interpolator_name in data.keys():
-            # add driver
-            driver = interpolator_name.replace("_pmInterpolator", "")
-            controller = data[interpolator_name]["controller"]
-            api.add_driver(driver, controller)
-
-            for blend_m in data[interpolator_name]["driven"]:
-                # add driven
-                driven = blend_m.replace("_bm", "")
-
-                api.add_driven(driver, driven)
-
-            for pose in data[interpolator_name]["pose"]:
-                # add pose
-                mc.setAttr(controller + ".t", *data[interpolator_name]["pose"][pose]["t"])
-                mc.setAttr(controller + ".r", *data[interpolator_name]["pose"][pose]["r"])
-                api.add_pose(driver, pose)
-
-                for driven, v in data[interpolator_name]["pose"][pose]["driven"].items():
-                    # edit driven
-                    mc.setAttr(driven + ".t", *v["t"])
-                    mc.setAttr(driven + ".r", *v["r"])
-                    api.update_driven(driver, pose, driven)
-
-            mc.setAttr(controller + ".t", 0, 0, 0)
-            mc.setAttr(controller + ".r", 0, 0, 0)
+            build_interpolator(interpolator_name, data[interpolator_name], topology)
     except Exception:
         traceback.print_exc()
         mc.undoInfo(closeChunk=True)
@@ -65,7 +141,128 @@ def load(file_path):
     return data
 
 
+def verify_interpolator(interpolator_name, interpolator_data, tolerance=1e-3):
+    """
+    build 한 interpolator 가 file data 와 같은지 확인합니다.
+    api 함수는 실패해도 warning 만 남기고 return 하므로 build 후에 확인해야 합니다.
+
+    :return: problem list
+    """
+    data = api.get_data() if mc.objExists("pose_manager") else {}
+    built = data.get(interpolator_name)
+    if built is None:
+        return ["interpolator not built"]
+
+    problems = ["driven '{0}' not built".format(b) for b in interpolator_data["driven"] if b not in built["driven"]]
+    for pose, pose_data in interpolator_data["pose"].items():
+        if pose not in built["pose"]:
+            problems.append("pose '{0}' not built".format(pose))
+            continue
+        for driven, offset in pose_data["driven"].items():
+            if driven + "_bm" not in built["driven"]:
+                continue
+            built_offset = api.get_driven_offset(built["pose"][pose], driven)
+            values = list(offset["t"]) + list(offset["r"])
+            built_values = list(built_offset["t"]) + list(built_offset["r"])
+            if any(abs(a - b) > tolerance for a, b in zip(values, built_values)):
+                problems.append("pose '{0}' driven '{1}' offset mismatch".format(pose, driven))
+    return problems
+
+
+def build_isolated(interpolator_name, interpolator_data, topology=None):
+    """
+    interpolator 하나를 자기 undo chunk 안에서 만듭니다. 실패하면 이 interpolator 만 되돌립니다.
+
+    :return: None or error message
+    """
+    if mc.objExists(interpolator_name):
+        return "Already exists : '{0}'".format(interpolator_name)
+    # api 함수 안의 undo 가 다른 interpolator 의 chunk 를 되돌리지 않도록 없는 node 는 미리 확인합니다.
+    controller = interpolator_data["controller"]
+    names = [interpolator_data["driver"], controller] + [b.replace("_bm", "") for b in interpolator_data["driven"]]
+    missing = [n for n in names if not mc.objExists(n)]
+    if missing:
+        return "Don't exists : {0}".format(missing)
+    # blendMatrix target index 는 pose index 라서 다른 interpolator 의 blendMatrix 를 같이 쓰면 연결이 겹칩니다.
+    blend_matrices = interpolator_data["driven"]
+    duplicate = sorted({b for b in blend_matrices if blend_matrices.count(b) > 1})
+    if duplicate:
+        return "Duplicated driven : {0}".format(duplicate)
+    exists = [b for b in blend_matrices if mc.objExists(b)]
+    if exists:
+        return "Already exists : {0}".format(exists)
+    rest = (mc.getAttr(controller + ".t")[0], mc.getAttr(controller + ".r")[0])
+
+    error = None
+    mc.undoInfo(openChunk=True, infinity=True)
+    try:
+        build_interpolator(interpolator_name, interpolator_data, topology)
+        error = "\n".join(verify_interpolator(interpolator_name, interpolator_data)) or None
+    except Exception:
+        error = traceback.format_exc()
+    mc.undoInfo(closeChunk=True)
+
+    if error:
+        if mc.objExists(interpolator_name):
+            mc.undo()
+        else:
+            # add_driver 가 실패하면 controller 값만 바뀌어 있습니다.
+            mc.setAttr(controller + ".t", *rest[0])
+            mc.setAttr(controller + ".r", *rest[1])
+        mc.warning("Occur error build '{0}'. Returned to action".format(interpolator_name))
+    return error
+
+
+def load_isolated(file_path, topology=None, interpolators=None, data=None, name_map=None, cache=None):
+    """
+    interpolator 마다 따로 checkpoint 합니다. 실패한 interpolator 만 건너뛰고 나머지는 유지합니다.
+
+    :param file_path:
+    :param topology: driven topology
+    :param interpolators: 만들 interpolator name list. None 이면 전체
+    :param data: 이미 읽은 data. 있으면 file 을 읽지 않습니다.
+    :param name_map: retarget.NameMap. load 와 같습니다.
+    :param cache: cache.PoseCache
+    :return: {"built": [interpolator name], "failed": {interpolator name: error}, "data": data}
+    """
+    data = read(file_path, cache) if data is None else data
+    if name_map is not None:
+        names_report = resolve_names(data, name_map)
+        if names_report["missing"] or names_report["duplicate"]:
+            return None
+        data = names_report["data"]
+    report = {"built": [], "failed": {}, "data": data}
+    for interpolator_name in (list(data) if interpolators is None else interpolators):
+        error = build_isolated(interpolator_name, data[interpolator_name], topology)
+        if error:
+            report["failed"][interpolator_name] = error
+        else:
+            report["built"].append(interpolator_name)
+    return report
+
+
+def retry_failed(report, topology=None):
+    """
+    load_isolated report 의 실패한 interpolator 만 다시 만듭니다.
+
+    :return: load_isolated report. built 는 이전 결과를 포함합니다.
+    """
+    if not report["failed"]:
+        return dict(report, built=list(report["built"]), failed={})
+    result = load_isolated(None, topology, list(report["failed"]), report["data"])
+    result["built"] = report["built"] + result["built"]
+    return result
+
+
+def print_load_report(report):
+    for interpolator_name, error in report["failed"].items():
+        print("failed  {0}".format(interpolator_name))
+        print("        " + error.strip().replace("\n", "\n        "))
+    print("{0} built, {1} failed".format(len(report["built"]), len(report["failed"])))
+
+
 def dump(file_path, data):
+    data = api.sparse_data(data)
     with open(file_path, "w", encoding="UTF-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
     return file_path
@@ -0,0 +1,194 @@
+"""
+pose 의 driven 을 viewport 에서 바로 수정합니다.
+
+    from posemanager import live
+    session = live.LiveEdit("jaw", "open")
+    session.start()
+    # <driven>_pmLive handle 을 움직이면 blendMatrix targetMatrix 가 바로 바뀝니다.
+    session.commit()  # or session.cancel()
+
+start 는 pose 로 이동하고 driven 마다 handle locator 를 만듭니다.
+handle 의 attribute changed callback 이 MPlug 로 targetMatrix 를 직접 씁니다. cmds, _data, ui refresh 를 거치지 않습니다.
+session 중에는 undo 를 끕니다. commit 은 targetMatrix, driven reset, _data 를 undo chunk 하나로 기록하고
+cancel 은 session 전 상태로 되돌립니다.
+"""
+# maya
+from maya import cmds as mc
+from maya.api import OpenMaya as om
+
+# pose manager
+from . import api
+
+# built-ins
+import traceback
+
+handle_suffix = "_pmLive"
+
+
+def _plug(name):
+    selection = om.MSelectionList()
+    selection.add(name)
+    return selection.getPlug(0)
+
+
+def _set_matrix(plug, m):
+    plug.setMObject(om.MFnMatrixData().create(m))
+
+
+class LiveEdit(object):
+    """
+    :param driver:
+    :param pose:
+    :param drivens: None 이면 interpolator 의 모든 driven
+    """
+
+    def __init__(self, driver, pose, drivens=None):
+        self.driver = driver
+        self.pose = pose
+        self.drivens = drivens
+        self.items = {}
+        self.callbacks = []
+        self.undo_state = None
+
+    @property
+    def running(self):
+        return self.undo_state is not None
+
+    def start(self):
+        interpolator_name = self.driver + "_pmInterpolator"
+        if not mc.objExists(interpolator_name):
+            mc.warning("Don't exists '{0}' interpolator node '{1}'".format(self.driver, interpolator_name))
+            return False
+        if self.running:
+            mc.warning("Already running live edit '{0}' '{1}'".format(self.driver, self.pose))
+            return False
+        interpolator = mc.listRelatives(interpolator_name, shapes=True)[0]
+        data = api.get_data()
+        if self.pose not in data[interpolator_name]["pose"]:
+            mc.warning("Don't exists '{0}' pose '{1}'".format(self.driver, self.pose))
+            return False
+
+        names = mc.poseInterpolator(interpolator, query=True, poseNames=True)
+        indexes = mc.poseInterpolator(interpolator, query=True, index=True)
+        index = indexes[names.index(self.pose)]
+        drivens = self.drivens or [b.replace("_bm", "") for b in data[interpolator_name]["driven"]]
+
+        api.go_to_pose(self.driver, self.pose)
+
+        # session 중의 변경은 undo queue 에 남기지 않습니다.
+        self.undo_state = mc.undoInfo(query=True, state=True)
+        mc.undoInfo(stateWithoutFlush=False)
+        try:
+            for driven in drivens:
+                target = driven + "_bm.target[{0}].targetMatrix".format(index)
+                parent = api.get_driven_parent(driven)
+                rest = api.get_driven_rest(driven)
+                item = {
+                    "target": target,
+                    "original_target": om.MMatrix(mc.getAttr(target)),
+                    "original_local": mc.getAttr(driven + ".matrix"),
+                    # handle matrix (parent 기준) -> targetMatrix. npo 는 rest.inverse(), offsetParentMatrix 는 identity
+                    "to_target": om.MMatrix(mc.getAttr(driven + "_bm.inputMatrix")) * rest.inverse(),
+                    "handle": None
+                }
+                # pose weight 가 1 일 때 update_driven 이 계산하는 driven * parent.inverse() 와 같습니다.
+                m = om.MMatrix(item["original_local"]) * item["to_target"].inverse() * item["original_target"]
+                self.items[driven] = item
+
+                handle = mc.spaceLocator(name=driven + handle_suffix)[0]
+                if parent:
+                    handle = mc.parent(handle, parent)[0]
+                item["handle"] = handle
+                mc.xform(handle, matrix=list(m), worldSpace=False)
+                mc.xform(driven, matrix=list(om.MMatrix()), worldSpace=False)
+
+                item["target_plug"] = _plug(target)
+                item["handle_plug"] = _plug(handle + ".matrix")
+                _set_matrix(item["target_plug"], item["to_target"] * m)
+
+                selection = om.MSelectionList()
+                selection.add(handle)
+                self.callbacks.append(om.MNodeMessage.addAttributeChangedCallback(
+                    selection.getDependNode(0), self.changed, driven))
+            mc.select([item["handle"] for item in self.items.values()])
+        except Exception:
+            traceback.print_exc()
+            mc.warning("Occur error live edit '{0}' '{1}'. Returned to action".format(self.driver, self.pose))
+            self.cancel()
+            return False
+        return True
+
+    def changed(self, message, plug, other_plug, driven):
+        if not message & om.MNodeMessage.kAttributeSet:
+            return
+        item = self.items.get(driven)
+        if item is None:
+            return
+        try:
+            m = om.MFnMatrixData(item["handle_plug"].asMObject()).matrix()
+            _set_matrix(item["target_plug"], item["to_target"] * m)
+        except Exception:
+            traceback.print_exc()
+
+    def stop(self):
+        """
+        callback 과 handle 을 지우고 session 전 값으로 되돌립니다. undo 는 아직 꺼진 상태입니다.
+
+        :return: {driven: (targetMatrix attribute, 마지막 targetMatrix)}
+        """
+        om.MMessage.removeCallbacks(self.callbacks)
+        self.callbacks = []
+        results = {}
+        for driven, item in self.items.items():
+            if item.get("target_plug") is not None:
+                results[driven] = (item["target"], om.MMatrix(mc.getAttr(item["target"])))
+                _set_matrix(item["target_plug"], item["original_target"])
+            mc.xform(driven, matrix=item["original_local"], worldSpace=False)
+            if item["handle"] and mc.objExists(item["handle"]):
+                mc.delete(item["handle"])
+        self.items = {}
+        return results
+
+    def cancel(self):
+        if not self.running:
+            return
+        try:
+            self.stop()
+        finally:
+            mc.undoInfo(stateWithoutFlush=self.undo_state)
+            self.undo_state = None
+
+    def commit(self):
+        """
+        _data 는 여기서 한 번만 씁니다.
+        """
+        if not self.running:
+            return
+        try:
+            results = self.stop()
+        finally:
+            mc.undoInfo(stateWithoutFlush=self.undo_state)
+            self.undo_state = None
+
+        interpolator_name = self.driver + "_pmInterpolator"
+        try:
+            mc.undoInfo(openChunk=True, infinity=True)
+
+            data = api.get_data()
+            for driven, (target, m) in results.items():
+                mc.setAttr(target, m, type="matrix")
+                offset = api.target_to_offset(driven, m)
+                if api.is_identity_offset(offset):
+                    data[interpolator_name]["pose"][self.pose]["driven"].pop(driven, None)
+                else:
+                    data[interpolator_name]["pose"][self.pose]["driven"][driven] = offset
+            if results:
+                mc.xform(list(results), matrix=list(om.MMatrix()), worldSpace=False)
+            api.set_data(data)
+        except Exception:
+            traceback.print_exc()
+            mc.warning("Occur error live edit '{0}' '{1}'. Returned to action".format(self.driver, self.pose))
+            mc.undoInfo(closeChunk=True)
+            mc.undo()
+        else:
+            mc.undoInfo(closeChunk=True)
@@ -0,0 +1,320 @@
+"""
+pose weight lookup table. maya 가 필요 없습니다.
+
+    from posemanager import lut
+    tables = lut.LookupCache(max_bytes=16 * 1024 * 1024)
+    table = tables.table(interpolator, falloffs)   # model.Interpolator, {pose: falloff}
+    weights = table.weights(t, r)                  # pose 순서
+
+    tables.prebuild(interpolators, progressive=True)  # 빈 table 만 만듭니다.
+    while tables.build_step(4096):                    # idle 때 조금씩 채웁니다. 다 채우기 전에는 solver 로 계산합니다.
+        pass
+
+interpolator 마다 controller 의 t/r (tx ty tz rx ry rz, euler degrees) 중 pose 가 가장 많이 움직이는 축을 최대 3 개 골라
+격자를 만들고, 격자점마다 solver.PoseSolver 의 weight 를 미리 계산합니다. 나머지 축은 pose 의 평균 값으로 고정합니다.
+pose 가 4 개 이상의 축을 움직이면 table.exact 가 False 이고, 고르지 않은 축의 값은 무시합니다.
+
+query 는 격자 cell 하나를 (tri)linear 로 보간하므로 pose 수에만 비례합니다. 격자 밖은 가장자리 값을 사용합니다.
+table 은 처음 query 할 때 (또는 prebuild 로) 만들고, query 할 때는 interpolator 를 다시 비교하지 않습니다.
+pose 를 수정하면 invalidate 를 부르거나, 수정할 때마다 올리는 version 을 넘겨서 version 이 다를 때만 다시 만듭니다.
+signature 는 table 을 만들 때 한 번 계산하며 stale 로 직접 확인할 수 있습니다.
+격자 해상도는 table 하나의 크기가 table_bytes 를 넘지 않도록 정합니다. LookupCache 는 max_bytes 를 넘으면 오래된 table 부터 버립니다.
+"""
+# pose manager
+from . import solver
+from .export import default_falloff
+
+# built-ins
+import hashlib
+import json
+from array import array
+from collections import OrderedDict
+
+axes = ("tx", "ty", "tz", "rx", "ry", "rz")
+default_table_bytes = 1024 * 1024
+default_max_resolution = 24
+# pose 가 없는 쪽으로도 weight 가 0 이 될 때까지 볼 수 있도록 범위를 늘립니다.
+padding = 0.25
+min_span = {"t": 1.0, "r": 30.0}
+
+
+def signature(interpolator, falloffs=None):
+    """
+    weight 에 영향을 주는 값만 사용합니다. driven offset 은 포함하지 않습니다.
+
+    :param interpolator: model.Interpolator
+    :param falloffs: {pose: falloff}
+    :return: str
+    """
+    falloffs = falloffs or {}
+    values = [[p, list(pose.t), list(pose.r), falloffs.get(p, default_falloff)]
+              for p, pose in interpolator.poses.items()]
+    return hashlib.sha1(json.dumps(values, separators=(",", ":")).encode("UTF-8")).hexdigest()
+
+
+def choose_axes(points, count=3):
+    """
+    :param points: [[tx, ty, tz, rx, ry, rz], ...]
+    :return: 범위가 큰 순서의 axis index list, 움직이는 axis 가 count 보다 많은지
+    """
+    spans = [max(p[i] for p in points) - min(p[i] for p in points) for i in range(6)]
+    moving = [i for i in sorted(range(6), key=lambda i: -spans[i]) if spans[i] > 1e-6]
+    return sorted(moving[:count]), len(moving) <= count
+
+
+class LookupTable(object):
+    """
+    :param interpolator: model.Interpolator
+    :param falloffs: {pose: falloff}
+    :param table_bytes: weight array 최대 크기
+    :param max_resolution: axis 하나의 최대 격자점 수
+    """
+
+    __slots__ = ("name", "poses", "signature", "version", "axes", "exact", "rest", "lower", "step", "shape",
+                 "values", "solver")
+
+    def __init__(self, interpolator, falloffs=None, table_bytes=default_table_bytes,
+                 max_resolution=default_max_resolution, version=None, build=True):
+        """
+        :param version: LookupCache 가 비교하는 값
+        :param build: False 면 values 를 비워두고 build_step 으로 채웁니다.
+        """
+        falloffs = falloffs or {}
+        self.name = interpolator.name
+        self.poses = list(interpolator.poses)
+        self.signature = signature(interpolator, falloffs)
+        self.version = version
+
+        points = [list(pose.t) + list(pose.r) for pose in interpolator.poses.values()] or [[0.0] * 6]
+        self.axes, self.exact = choose_axes(points)
+        self.rest = [sum(p[i] for p in points) / len(points) for i in range(6)]
+
+        # table_bytes 안에 들어가는 가장 큰 해상도
+        pose_count = max(len(self.poses), 1)
+        cells = max(table_bytes // (4 * pose_count), 1)
+        resolution = int(cells ** (1.0 / len(self.axes))) if self.axes else 1
+        resolution = max(2, min(max_resolution, resolution)) if self.axes else 1
+
+        self.lower = []
+        self.step = []
+        self.shape = []
+        for i in self.axes:
+            low = min(p[i] for p in points)
+            high = max(p[i] for p in points)
+            span = max(high - low, min_span["t" if i < 3 else "r"])
+            low, high = low - span * padding, high + span * padding
+            self.lower.append(low)
+            self.step.append((high - low) / (resolution - 1))
+            self.shape.append(resolution)
+
+        self.solver = solver.PoseSolver(solver.interpolator_targets(interpolator),
+                                        [falloffs.get(p, default_falloff) for p in self.poses])
+        self.values = array("f")
+        if build:
+            self.build_step()
+
+    @property
+    def cell_count(self):
+        count = 1
+        for n in self.shape:
+            count *= n
+        return count
+
+    @property
+    def built(self):
+        """
+        :return: 채운 격자점 수
+        """
+        return len(self.values) // max(len(self.poses), 1)
+
+    @property
+    def ready(self):
+        return self.built >= self.cell_count
+
+    @property
+    def nbytes(self):
+        # 다 채웠을 때의 크기
+        return self.values.itemsize * self.cell_count * max(len(self.poses), 1)
+
+    def build_step(self, count=None):
+        """
+        격자점을 순서대로 count 개 채웁니다.
+
+        :param count: None 이면 전부
+        :return: 남은 격자점 수
+        """
+        strides = self._strides()
+        start = self.built
+        end = self.cell_count if count is None else min(self.cell_count, start + count)
+        for index in range(start, end):
+            point = list(self.rest)
+            for axis, i in enumerate(self.axes):
+                point[i] = self.lower[axis] + self.step[axis] * ((index // strides[axis]) % self.shape[axis])
+            self.values.extend(self.solver.weights(point[:3], solver.euler_to_quaternion(point[3:])))
+        return self.cell_count - end
+
+    def stale(self, interpolator, falloffs=None):
+        """
+        signature 를 다시 계산해서 비교합니다. query 마다 부르지 않습니다.
+        """
+        return self.signature != signature(interpolator, falloffs)
+
+    def _strides(self):
+        # 마지막 axis 가 가장 빠르게 바뀝니다.
+        strides = []
+        stride = 1
+        for n in reversed(self.shape):
+            strides.insert(0, stride)
+            stride *= n
+        return strides
+
+    def weights(self, t, r):
+        """
+        :param t: controller translate
+        :param r: controller rotate (xyz euler degrees)
+        :return: [float, ...] pose 순서
+        """
+        if not self.ready:
+            return self.solver.weights(list(t), solver.euler_to_quaternion(list(r)))
+        pose_count = len(self.poses)
+        if not self.axes:
+            return list(self.values[:pose_count])
+
+        point = list(t) + list(r)
+        strides = self._strides()
+        base = 0
+        fractions = []
+        for axis, i in enumerate(self.axes):
+            x = (point[i] - self.lower[axis]) / self.step[axis]
+            x = min(max(x, 0.0), self.shape[axis] - 1.0)
+            cell = min(int(x), self.shape[axis] - 2)
+            base += cell * strides[axis]
+            fractions.append((x - cell, strides[axis]))
+
+        # 2 ^ axis 개의 꼭짓점을 보간합니다.
+        result = [0.0] * pose_count
+        for corner in range(1 << len(fractions)):
+            w = 1.0
+            offset = base
+            for bit, (fraction, stride) in enumerate(fractions):
+                if corner >> bit & 1:
+                    w *= fraction
+                    offset += stride
+                else:
+                    w *= 1.0 - fraction
+            if w == 0.0:
+                continue
+            start = offset * pose_count
+            for p in range(pose_count):
+                result[p] += w * self.values[start + p]
+        return result
+
+    def sample_grid(self, axis_a, axis_b, resolution=32, t=None, r=None):
+        """
+        heatmap 같은 2D preview 용입니다.
+
+        :param axis_a: axes 의 이름. "rx"
+        :param axis_b: axes 의 이름. "ry"
+        :param t: 나머지 축의 값. None 이면 rest
+        :param r: 나머지 축의 값. None 이면 rest
+        :return: [[weights, ...] x resolution] x resolution. axis_a 가 row 입니다.
+        """
+        point = (list(t) if t is not None else self.rest[:3]) + (list(r) if r is not None else self.rest[3:])
+        a, b = axes.index(axis_a), axes.index(axis_b)
+        ranges = {}
+        for i in (a, b):
+            if i in self.axes:
+                axis = self.axes.index(i)
+                ranges[i] = (self.lower[axis], self.step[axis] * (self.shape[axis] - 1))
+            else:
+                ranges[i] = (point[i], 0.0)
+        rows = []
+        for row in range(resolution):
+            point[a] = ranges[a][0] + ranges[a][1] * row / max(resolution - 1, 1)
+            columns = []
+            for column in range(resolution):
+                point[b] = ranges[b][0] + ranges[b][1] * column / max(resolution - 1, 1)
+                columns.append(self.weights(point[:3], point[3:]))
+            rows.append(columns)
+        return rows
+
+
+class LookupCache(object):
+    """
+    interpolator name 마다 LookupTable 을 하나씩 가집니다.
+
+    :param max_bytes: 모든 table 의 크기 합
+    :param table_bytes: LookupTable table_bytes
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024, table_bytes=default_table_bytes):
+        self.max_bytes = max_bytes
+        self.table_bytes = table_bytes
+        self.tables = OrderedDict()
+
+    @property
+    def nbytes(self):
+        return sum(table.nbytes for table in self.tables.values())
+
+    def table(self, interpolator, falloffs=None, version=None, progressive=False):
+        """
+        name 의 table 이 있으면 interpolator 를 비교하지 않고 반환합니다.
+        version 을 넘기면 table 을 만들 때의 version 과 다를 때만 다시 만듭니다.
+
+        :param interpolator: model.Interpolator
+        :param falloffs: {pose: falloff}
+        :param version: pose 를 수정할 때마다 바뀌는 값
+        :param progressive: True 면 빈 table 을 만들고 build_step 으로 채웁니다.
+        :return: LookupTable
+        """
+        table = self.tables.get(interpolator.name)
+        if table is not None and (version is None or table.version == version):
+            self.tables.move_to_end(interpolator.name)
+            return table
+
+        table = LookupTable(interpolator, falloffs, self.table_bytes, version=version, build=not progressive)
+        self.tables[interpolator.name] = table
+        self.tables.move_to_end(interpolator.name)
+        while len(self.tables) > 1 and self.nbytes > self.max_bytes:
+            self.tables.popitem(last=False)
+        return table
+
+    def weights(self, interpolator, t, r, falloffs=None, version=None):
+        return self.table(interpolator, falloffs, version).weights(t, r)
+
+    def prebuild(self, interpolators, falloffs=None, version=None, progressive=False):
+        """
+        query 전에 table 을 만듭니다. 첫 query 가 격자 전체를 기다리지 않습니다.
+
+        :param interpolators: [model.Interpolator, ...]
+        :param falloffs: {interpolator name: {pose: falloff}}
+        :param progressive: True 면 빈 table 만 만들고 build_step 으로 채웁니다.
+        :return: [LookupTable, ...]
+        """
+        falloffs = falloffs or {}
+        return [self.table(interpolator, falloffs.get(interpolator.name), version, progressive)
+                for interpolator in interpolators]
+
+    def build_step(self, count=4096):
+        """
+        다 채우지 않은 table 을 최근에 사용한 순서로 count 개 격자점만큼 채웁니다. evalDeferred 나 timer 에서 반복해서 부릅니다.
+
+        :return: 남은 격자점 수. 0 이면 모두 채웠습니다.
+        """
+        for table in reversed(list(self.tables.values())):
+            if count <= 0:
+                break
+            if not table.ready:
+                before = table.built
+                table.build_step(count)
+                count -= table.built - before
+        return sum(table.cell_count - table.built for table in self.tables.values())
+
+    def invalidate(self, name=None):
+        """
+        :param name: interpolator name. None 이면 전체
+        """
+        if name is None:
+            self.tables.clear()
+        else:
+            self.tables.pop(name, None)
@@ -0,0 +1,254 @@
+"""
+pose data 의 slotted model. maya 가 필요 없습니다.
+
+_data 와 pose file 은 json (nested dict) 으로 저장하고, build_interpolator, mirror_driver, export, bake, analysis, lut 은
+이 model 로 읽고 씁니다. 숫자는 interpolator 마다 contiguous double array 하나에 모여 있습니다.
+
+    pose_tr             : pose 순서대로 [tx, ty, tz, rx, ry, rz] x pose
+    offset_tr[driven]   : pose 순서대로 [tx, ty, tz, rx, ry, rz] x pose. 없는 offset 은 0 (identity)
+    offset_keys[driven] : pose 마다 data 에 offset key 가 있는지 (1 / 0). sparse / dense data 를 그대로 되돌립니다.
+
+Pose 는 array 를 가리키는 view 입니다. t, r, offset() 은 복사본을 반환하므로 값을 바꿀 때는 set, set_offset 을 사용합니다.
+모르는 key 는 extra 에 보관하므로 to_data(from_data(data)) == data 입니다.
+"""
+# built-ins
+from array import array
+
+interpolator_suffix = "_pmInterpolator"
+blend_matrix_suffix = "_bm"
+
+interpolator_keys = ("driver", "driven", "pose", "controller")
+pose_keys = ("t", "r", "driven")
+offset_keys = ("t", "r")
+
+
+def _zeros(count):
+    return array("d", bytes(8 * count))
+
+
+class DrivenOffset(object):
+    """
+    pose 에서 driven 의 offset 값. tr 은 [tx, ty, tz, rx, ry, rz] double array 입니다.
+    """
+
+    __slots__ = ("driven", "tr")
+
+    def __init__(self, driven, t=(0, 0, 0), r=(0, 0, 0)):
+        self.driven = driven
+        self.tr = array("d", list(t) + list(r))
+
+    @property
+    def t(self):
+        return self.tr[0:3]
+
+    @property
+    def r(self):
+        return self.tr[3:6]
+
+    def is_identity(self, tolerance=1e-6):
+        return all(abs(x) <= tolerance for x in self.tr)
+
+    def to_data(self):
+        return {"t": self.tr[0:3].tolist(), "r": self.tr[3:6].tolist()}
+
+    @classmethod
+    def from_data(cls, driven, data):
+        return cls(driven, data["t"], data["r"])
+
+
+class Pose(object):
+    """
+    Interpolator 의 array 에서 index 번째 pose 를 가리킵니다.
+    """
+
+    __slots__ = ("name", "owner", "index", "extra", "offset_extra")
+
+    def __init__(self, name, owner, index):
+        self.name = name
+        self.owner = owner
+        self.index = index
+        self.extra = {}
+        self.offset_extra = {}
+
+    @property
+    def tr(self):
+        i = self.index * 6
+        return self.owner.pose_tr[i:i + 6]
+
+    @property
+    def t(self):
+        i = self.index * 6
+        return self.owner.pose_tr[i:i + 3]
+
+    @property
+    def r(self):
+        i = self.index * 6
+        return self.owner.pose_tr[i + 3:i + 6]
+
+    def set(self, t, r):
+        i = self.index * 6
+        self.owner.pose_tr[i:i + 6] = array("d", list(t) + list(r))
+
+    @property
+    def offsets(self):
+        """
+        :return: {driven: DrivenOffset} data 에 key 가 있는 offset
+        """
+        return {d: self.offset(d) for d, keys in self.owner.offset_keys.items() if keys[self.index]}
+
+    def offset(self, driven):
+        tr = self.owner.offset_tr.get(driven)
+        if tr is None:
+            return DrivenOffset(driven)
+        i = self.index * 6
+        return DrivenOffset(driven, tr[i:i + 3], tr[i + 3:i + 6])
+
+    def set_offset(self, driven, t, r, keep_identity=False):
+        """
+        :param keep_identity: False 면 identity offset 은 key 를 지웁니다 (sparse).
+        """
+        offset = DrivenOffset(driven, t, r)
+        tr, keys = self.owner.offset_arrays(driven)
+        i = self.index * 6
+        tr[i:i + 6] = offset.tr
+        keys[self.index] = 1 if keep_identity or not offset.is_identity() else 0
+        if not keys[self.index]:
+            self.offset_extra.pop(driven, None)
+        return offset
+
+    def to_data(self):
+        driven = {}
+        for d, offset in self.offsets.items():
+            driven[d] = offset.to_data()
+            driven[d].update(self.offset_extra.get(d, {}))
+        data = {"t": self.t.tolist(), "r": self.r.tolist(), "driven": driven}
+        data.update(self.extra)
+        return data
+
+
+class Interpolator(object):
+    """
+    _data 의 interpolator 하나.
+
+    blend_matrices 는 data 의 "driven" 그대로이고, drivens 는 blendMatrix suffix 를 뗀 driven 이름입니다.
+    """
+
+    __slots__ = ("name", "driver", "controller", "blend_matrices", "poses", "pose_tr", "offset_tr", "offset_keys",
+                 "extra")
+
+    def __init__(self, name, driver="", controller=""):
+        self.name = name
+        self.driver = driver
+        self.controller = controller
+        self.blend_matrices = []
+        self.poses = {}
+        self.pose_tr = array("d")
+        self.offset_tr = {}
+        self.offset_keys = {}
+        self.extra = {}
+
+    @property
+    def drivens(self):
+        return [b[:-len(blend_matrix_suffix)] if b.endswith(blend_matrix_suffix) else b for b in self.blend_matrices]
+
+    def add_driven(self, driven):
+        blend_m = driven + blend_matrix_suffix
+        if blend_m not in self.blend_matrices:
+            self.blend_matrices.append(blend_m)
+        return blend_m
+
+    def offset_arrays(self, driven):
+        """
+        :return: driven 의 offset_tr, offset_keys. 없으면 0 으로 만듭니다.
+        """
+        if driven not in self.offset_tr:
+            self.offset_tr[driven] = _zeros(len(self.pose_tr))
+            self.offset_keys[driven] = bytearray(len(self.poses))
+        return self.offset_tr[driven], self.offset_keys[driven]
+
+    def add_pose(self, name, t=(0, 0, 0), r=(0, 0, 0)):
+        if name in self.poses:
+            self.poses[name].set(t, r)
+            return self.poses[name]
+        pose = Pose(name, self, len(self.poses))
+        self.poses[name] = pose
+        self.pose_tr.extend(array("d", list(t) + list(r)))
+        for driven, tr in self.offset_tr.items():
+            tr.extend(_zeros(6))
+            self.offset_keys[driven].append(0)
+        return pose
+
+    def remove_pose(self, name):
+        pose = self.poses.pop(name)
+        i = pose.index * 6
+        del self.pose_tr[i:i + 6]
+        for driven, tr in self.offset_tr.items():
+            del tr[i:i + 6]
+            del self.offset_keys[driven][pose.index]
+        for p in self.poses.values():
+            if p.index > pose.index:
+                p.index -= 1
+
+    def pose_array(self):
+        """
+        :return: pose_tr. 복사하지 않습니다.
+        """
+        return self.pose_tr
+
+    def offset_array(self, driven):
+        """
+        :return: offset_tr[driven]. 복사하지 않습니다. 없는 driven 은 0 array
+        """
+        tr = self.offset_tr.get(driven)
+        return tr if tr is not None else _zeros(len(self.pose_tr))
+
+    def to_data(self):
+        data = {
+            "driver": self.driver,
+            "driven": list(self.blend_matrices),
+            "pose": {k: v.to_data() for k, v in self.poses.items()},
+            "controller": self.controller
+        }
+        data.update(self.extra)
+        return data
+
+    @classmethod
+    def from_data(cls, name, data):
+        interpolator = cls(name, data["driver"], data["controller"])
+        interpolator.blend_matrices = list(data["driven"])
+        interpolator.extra = {k: v for k, v in data.items() if k not in interpolator_keys}
+
+        pose_count = len(data["pose"])
+        interpolator.pose_tr = _zeros(pose_count * 6)
+        for index, (pose_name, pose_data) in enumerate(data["pose"].items()):
+            pose = Pose(pose_name, interpolator, index)
+            interpolator.poses[pose_name] = pose
+            pose.extra = {k: v for k, v in pose_data.items() if k not in pose_keys}
+            i = index * 6
+            interpolator.pose_tr[i:i + 6] = array("d", list(pose_data["t"]) + list(pose_data["r"]))
+            for driven, offset in pose_data["driven"].items():
+                if driven not in interpolator.offset_tr:
+                    interpolator.offset_tr[driven] = _zeros(pose_count * 6)
+                    interpolator.offset_keys[driven] = bytearray(pose_count)
+                interpolator.offset_tr[driven][i:i + 6] = array("d", list(offset["t"]) + list(offset["r"]))
+                interpolator.offset_keys[driven][index] = 1
+                extra = {k: v for k, v in offset.items() if k not in offset_keys}
+                if extra:
+                    pose.offset_extra[driven] = extra
+        return interpolator
+
+
+def from_data(data):
+    """
+    :param data: _data or pose file data
+    :return: {interpolator name: Interpolator}
+    """
+    return {k: Interpolator.from_data(k, v) for k, v in data.items()}
+
+
+def to_data(interpolators):
+    """
+    :param interpolators: {interpolator name: Interpolator}
+    :return: _data or pose file data
+    """
+    return {k: v.to_data() for k, v in interpolators.items()}
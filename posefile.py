@@ -0,0 +1,326 @@
+"""
+maya 없이 .pose file 을 validate, diff, merge 합니다.
+
+    python -m posemanager.posefile validate poses/ --jobs 8
+    python -m posemanager.posefile diff old.pose new.pose --tolerance 1e-4
+    python -m posemanager.posefile merge base.pose ours.pose theirs.pose -o merged.pose
+
+maya, api, io 를 import 하지 않습니다.
+"""
+# built-ins
+import argparse
+import concurrent.futures
+import json
+import math
+import os
+import sys
+
+interpolator_suffix = "_pmInterpolator"
+blend_matrix_suffix = "_bm"
+
+default_limits = {
+    "translate": 1e4,
+    "rotate": 3600.0
+}
+
+
+def read(file_path):
+    with open(file_path, "r", encoding="UTF-8") as f:
+        return json.load(f)
+
+
+def write(file_path, data):
+    with open(file_path, "w", encoding="UTF-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    return file_path
+
+
+def get_offset(pose_data, driven):
+    # sparse driven offset. 없으면 identity 입니다.
+    offset = pose_data.get("driven", {}).get(driven)
+    if offset is None:
+        return {"t": [0, 0, 0], "r": [0, 0, 0]}
+    return offset
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# validate
+# ----------------------------------------------------------------------------------------------------------------------
+def _is_vector(value):
+    return isinstance(value, (list, tuple)) and len(value) == 3 and \
+        all(isinstance(x, (int, float)) and not isinstance(x, bool) and math.isfinite(x) for x in value)
+
+
+def validate(data, limits=None):
+    """
+    :param data: pose file data
+    :param limits: {"translate": float, "rotate": float}
+    :return: [{"type": str, "interpolator": str, "message": str}, ...]
+    """
+    limits = dict(default_limits, **(limits or {}))
+    report = []
+
+    def add(issue_type, interpolator_name, message):
+        report.append({"type": issue_type, "interpolator": interpolator_name, "message": message})
+
+    def check_tr(interpolator_name, path, value):
+        for key, limit in (("t", limits["translate"]), ("r", limits["rotate"])):
+            if not _is_vector(value.get(key)):
+                add("bad_value", interpolator_name, "{0}.{1} : {2!r}".format(path, key, value.get(key)))
+            elif any(abs(x) > limit for x in value[key]):
+                add("out_of_range", interpolator_name, "{0}.{1} : {2}".format(path, key, value[key]))
+
+    if not isinstance(data, dict):
+        add("bad_schema", "", "top level is not object")
+        return report
+
+    for interpolator_name, interpolator_data in data.items():
+        if not interpolator_name.endswith(interpolator_suffix):
+            add("bad_name", interpolator_name, "interpolator name must end with '{0}'".format(interpolator_suffix))
+        if not isinstance(interpolator_data, dict):
+            add("bad_schema", interpolator_name, "interpolator is not object")
+            continue
+        missing = [k for k in ("driver", "driven", "pose", "controller") if k not in interpolator_data]
+        if missing:
+            add("bad_schema", interpolator_name, "missing key {0}".format(missing))
+            continue
+
+        driver = interpolator_name[:-len(interpolator_suffix)]
+        if interpolator_data["driver"] != driver:
+            add("bad_driver", interpolator_name, "driver '{0}' != '{1}'".format(interpolator_data["driver"], driver))
+        if not interpolator_data["controller"] or not isinstance(interpolator_data["controller"], str):
+            add("bad_controller", interpolator_name, repr(interpolator_data["controller"]))
+
+        drivens = []
+        for blend_m in interpolator_data["driven"]:
+            if not isinstance(blend_m, str) or not blend_m.endswith(blend_matrix_suffix):
+                add("bad_driven", interpolator_name, "'{0}' is not blendMatrix name".format(blend_m))
+                continue
+            drivens.append(blend_m[:-len(blend_matrix_suffix)])
+        if len(set(drivens)) != len(drivens):
+            add("duplicate_driven", interpolator_name, "duplicated driven in {0}".format(interpolator_data["driven"]))
+
+        if not isinstance(interpolator_data["pose"], dict):
+            add("bad_schema", interpolator_name, "pose is not object")
+            continue
+        for pose, pose_data in interpolator_data["pose"].items():
+            if not isinstance(pose_data, dict) or not isinstance(pose_data.get("driven"), dict):
+                add("bad_schema", interpolator_name, "pose '{0}' is not object".format(pose))
+                continue
+            check_tr(interpolator_name, pose, pose_data)
+            # driven offset 은 sparse 이므로 driven list 의 부분집합이면 됩니다.
+            for driven, offset in pose_data["driven"].items():
+                if driven not in drivens:
+                    add("unknown_driven", interpolator_name, "pose '{0}' driven '{1}' not in driven list".format(
+                        pose, driven))
+                if not isinstance(offset, dict):
+                    add("bad_schema", interpolator_name, "{0}.{1} is not object".format(pose, driven))
+                    continue
+                check_tr(interpolator_name, "{0}.{1}".format(pose, driven), offset)
+    return report
+
+
+def validate_file(file_path, limits=None):
+    try:
+        data = read(file_path)
+    except (OSError, ValueError) as e:
+        return file_path, [{"type": "unreadable", "interpolator": "", "message": str(e)}]
+    return file_path, validate(data, limits)
+
+
+def validate_files(file_paths, jobs=None, limits=None):
+    """
+    :return: {file path: report}. process pool 에서 병렬로 실행합니다.
+    """
+    if jobs == 1 or len(file_paths) < 2:
+        return dict(validate_file(f, limits) for f in file_paths)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        return dict(executor.map(validate_file, file_paths, [limits] * len(file_paths), chunksize=4))
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# diff
+# ----------------------------------------------------------------------------------------------------------------------
+def _vector_changed(a, b, tolerance):
+    return any(abs(x - y) > tolerance for x, y in zip(a, b))
+
+
+def diff_interpolator(interpolator_name, a, b, tolerance=1e-4):
+    """
+    :return: [{"interpolator", "path", "a", "b"}, ...]. 없는 쪽은 None 입니다.
+    """
+    changes = []
+
+    def add(path, value_a, value_b):
+        changes.append({"interpolator": interpolator_name, "path": path, "a": value_a, "b": value_b})
+
+    if a is None or b is None:
+        add("", a, b)
+        return changes
+    for key in ("driver", "controller"):
+        if a[key] != b[key]:
+            add(key, a[key], b[key])
+    for blend_m in [x for x in a["driven"] if x not in b["driven"]]:
+        add("driven." + blend_m, blend_m, None)
+    for blend_m in [x for x in b["driven"] if x not in a["driven"]]:
+        add("driven." + blend_m, None, blend_m)
+
+    drivens = [x[:-len(blend_matrix_suffix)] for x in a["driven"]]
+    drivens += [x[:-len(blend_matrix_suffix)] for x in b["driven"] if x not in a["driven"]]
+    for pose in list(a["pose"]) + [p for p in b["pose"] if p not in a["pose"]]:
+        pose_a = a["pose"].get(pose)
+        pose_b = b["pose"].get(pose)
+        if pose_a is None or pose_b is None:
+            add("pose." + pose, pose_a, pose_b)
+            continue
+        for key in ("t", "r"):
+            if _vector_changed(pose_a[key], pose_b[key], tolerance):
+                add("pose.{0}.{1}".format(pose, key), pose_a[key], pose_b[key])
+        for driven in drivens:
+            offset_a = get_offset(pose_a, driven)
+            offset_b = get_offset(pose_b, driven)
+            for key in ("t", "r"):
+                if _vector_changed(offset_a[key], offset_b[key], tolerance):
+                    add("pose.{0}.driven.{1}.{2}".format(pose, driven, key), offset_a[key], offset_b[key])
+    return changes
+
+
+def diff(a, b, tolerance=1e-4):
+    """
+    :param a: pose file data
+    :param b: pose file data
+    :param tolerance: 이 값 이하의 숫자 차이는 무시합니다.
+    :return: [{"interpolator", "path", "a", "b"}, ...]
+    """
+    changes = []
+    for interpolator_name in list(a) + [k for k in b if k not in a]:
+        changes += diff_interpolator(interpolator_name, a.get(interpolator_name), b.get(interpolator_name), tolerance)
+    return changes
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# merge
+# ----------------------------------------------------------------------------------------------------------------------
+def _same(a, b, tolerance):
+    if a is None or b is None:
+        return a is b
+    return not diff_interpolator("", a, b, tolerance)
+
+
+def _same_pose(a, b, tolerance):
+    if a is None or b is None:
+        return a is b
+    if _vector_changed(a["t"], b["t"], tolerance) or _vector_changed(a["r"], b["r"], tolerance):
+        return False
+    for driven in set(a["driven"]) | set(b["driven"]):
+        offset_a = get_offset(a, driven)
+        offset_b = get_offset(b, driven)
+        if _vector_changed(offset_a["t"], offset_b["t"], tolerance) or \
+                _vector_changed(offset_a["r"], offset_b["r"], tolerance):
+            return False
+    return True
+
+
+def merge3(base, ours, theirs, tolerance=1e-4):
+    """
+    interpolator 단위 3-way merge.
+    양쪽 모두 바뀐 interpolator 는 driver, controller, driven 이 같으면 pose 단위로 merge 합니다.
+    conflict 는 ours 를 사용하고 conflicts 에 기록합니다.
+
+    :return: merged data, [{"interpolator", "path"}, ...]
+    """
+    merged = {}
+    conflicts = []
+    names = list(ours) + [k for k in theirs if k not in ours] + [k for k in base if k not in ours and k not in theirs]
+    for name in names:
+        b, o, t = base.get(name), ours.get(name), theirs.get(name)
+        if _same(o, b, tolerance):
+            result = t
+        elif _same(t, b, tolerance) or _same(o, t, tolerance):
+            result = o
+        elif o is None or t is None or b is None or \
+                any(o[k] != t[k] for k in ("driver", "controller", "driven")):
+            result = o
+            conflicts.append({"interpolator": name, "path": ""})
+        else:
+            result = dict(o)
+            result["pose"] = {}
+            poses = list(o["pose"]) + [p for p in t["pose"] if p not in o["pose"]]
+            for pose in poses:
+                pose_b, pose_o, pose_t = b["pose"].get(pose), o["pose"].get(pose), t["pose"].get(pose)
+                if _same_pose(pose_o, pose_b, tolerance):
+                    value = pose_t
+                elif _same_pose(pose_t, pose_b, tolerance) or _same_pose(pose_o, pose_t, tolerance):
+                    value = pose_o
+                else:
+                    value = pose_o
+                    conflicts.append({"interpolator": name, "path": "pose." + pose})
+                if value is not None:
+                    result["pose"][pose] = value
+        if result is not None:
+            merged[name] = result
+    return merged, conflicts
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# cli
+# ----------------------------------------------------------------------------------------------------------------------
+def collect_files(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files += [os.path.join(root, n) for n in sorted(names) if n.endswith(".pose")]
+        else:
+            files.append(path)
+    return files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m posemanager.posefile")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    validate_parser = sub.add_parser("validate", help="validate .pose files or directories")
+    validate_parser.add_argument("paths", nargs="+")
+    validate_parser.add_argument("--jobs", type=int, default=None)
+    validate_parser.add_argument("--max-translate", type=float, default=default_limits["translate"])
+    validate_parser.add_argument("--max-rotate", type=float, default=default_limits["rotate"])
+
+    diff_parser = sub.add_parser("diff", help="numeric diff of two .pose files")
+    diff_parser.add_argument("a")
+    diff_parser.add_argument("b")
+    diff_parser.add_argument("--tolerance", type=float, default=1e-4)
+
+    merge_parser = sub.add_parser("merge", help="3-way merge per interpolator")
+    merge_parser.add_argument("base")
+    merge_parser.add_argument("ours")
+    merge_parser.add_argument("theirs")
+    merge_parser.add_argument("-o", "--output", required=True)
+    merge_parser.add_argument("--tolerance", type=float, default=1e-4)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "validate":
+        limits = {"translate": args.max_translate, "rotate": args.max_rotate}
+        reports = validate_files(collect_files(args.paths), jobs=args.jobs, limits=limits)
+        for file_path, report in reports.items():
+            print("{0:<7} {1}".format("ok" if not report else "FAILED", file_path))
+            for issue in report:
+                print("        {0:<18} {1:<40} {2}".format(issue["type"], issue["interpolator"], issue["message"]))
+        return 0 if not any(reports.values()) else 1
+
+    if args.command == "diff":
+        changes = diff(read(args.a), read(args.b), tolerance=args.tolerance)
+        for change in changes:
+            print("{0:<40} {1:<50} {2} -> {3}".format(change["interpolator"], change["path"], change["a"], change["b"]))
+        return 0 if not changes else 1
+
+    merged, conflicts = merge3(read(args.base), read(args.ours), read(args.theirs), tolerance=args.tolerance)
+    write(args.output, merged)
+    for conflict in conflicts:
+        print("CONFLICT {0} {1}".format(conflict["interpolator"], conflict["path"]))
+    return 0 if not conflicts else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+opt-in profiling of api / io.
+
+    from posemanager import profiler
+    profiler.enable()
+    ...
+    profiler.disable()
+    profiler.export("profile.json")
+
+enable() 은 module 의 public function 과 maya.cmds 를 wrapper 로 바꾸고 disable() 은 원래대로 돌려놓습니다.
+disable 상태에서는 wrapper 가 없으므로 비용이 없습니다.
+"""
+# built-ins
+import functools
+import importlib
+import inspect
+import json
+import time
+
+default_modules = ("api", "io", "check")
+
+_originals = []
+_stack = []
+_operations = {}
+_commands = {}
+
+
+def is_enabled():
+    return bool(_originals)
+
+
+def _operation_stats(name):
+    stats = _operations.get(name)
+    if stats is None:
+        stats = _operations[name] = {"count": 0, "time": 0.0, "commands": 0, "bytes": 0}
+    return stats
+
+
+def _wrap_function(name, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        _stack.append(name)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            _stack.pop()
+            stats = _operation_stats(name)
+            stats["count"] += 1
+            stats["time"] += elapsed
+    return wrapper
+
+
+def _wrap_command(name, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+
+        operation = _stack[-1] if _stack else "<none>"
+        commands = _commands.setdefault(operation, {})
+        stats = commands.get(name)
+        if stats is None:
+            stats = commands[name] = {"count": 0, "time": 0.0}
+        stats["count"] += 1
+        stats["time"] += elapsed
+
+        # _data 의 json string 크기
+        operation_stats = _operation_stats(operation)
+        operation_stats["commands"] += 1
+        if name == "setAttr" and kwargs.get("type") == "string":
+            operation_stats["bytes"] += len(args[1])
+        elif name == "getAttr" and isinstance(result, str):
+            operation_stats["bytes"] += len(result)
+        return result
+    return wrapper
+
+
+class _CommandProxy(object):
+    """
+    maya.cmds 대신 module 의 mc 에 들어갑니다. 처음 호출할 때 wrapper 를 만듭니다.
+    """
+
+    def __init__(self, cmds):
+        self._cmds = cmds
+
+    def __getattr__(self, name):
+        attr = getattr(self._cmds, name)
+        if callable(attr):
+            attr = _wrap_command(name, attr)
+        setattr(self, name, attr)
+        return attr
+
+
+def enable(modules=default_modules):
+    """
+    :param modules: profile 할 module 이름. posemanager 기준 상대 이름입니다.
+    """
+    if is_enabled():
+        return
+    package = __name__.rsplit(".", 1)[0]
+    for module_name in modules:
+        module = importlib.import_module(package + "." + module_name)
+        for name, func in list(vars(module).items()):
+            if name.startswith("_") or not inspect.isfunction(func) or func.__module__ != module.__name__:
+                continue
+            _originals.append((module, name, func))
+            setattr(module, name, _wrap_function(module_name + "." + name, func))
+        if hasattr(module, "mc"):
+            _originals.append((module, "mc", module.mc))
+            module.mc = _CommandProxy(module.mc)
+
+
+def disable():
+    while _originals:
+        module, name, original = _originals.pop()
+        setattr(module, name, original)
+    del _stack[:]
+
+
+def reset():
+    _operations.clear()
+    _commands.clear()
+
+
+def report():
+    """
+    :return: {"operations": {name: {"count", "time", "commands", "bytes", "by_command": {cmd: {"count", "time"}}}}}
+    """
+    operations = {}
+    for name, stats in sorted(_operations.items(), key=lambda x: -x[1]["time"]):
+        operations[name] = dict(stats)
+        operations[name]["by_command"] = dict(sorted(_commands.get(name, {}).items(),
+                                                     key=lambda x: -x[1]["time"]))
+    return {"operations": operations}
+
+
+def export(file_path):
+    with open(file_path, "w", encoding="UTF-8") as f:
+        json.dump(report(), f, indent=2, ensure_ascii=False)
+    return file_path
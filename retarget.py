@@ -0,0 +1,165 @@
+"""
+이름이 다른 rig 에 pose file 을 적용할 때 사용하는 name map. maya 가 필요 없습니다.
+
+    from posemanager import io, retarget
+    io.load("face.pose", name_map=retarget.read("charB.json"))
+
+name map file (json)
+
+    {
+        "pairs": {"jaw_jnt": "C_jaw_JNT"},
+        "rules": [
+            {"type": "namespace", "from": "charA", "to": "charB"},
+            {"type": "prefix", "from": "L_", "to": "Lf_"},
+            {"type": "suffix", "from": "_ctl", "to": "_CTRL"},
+            {"type": "regex", "pattern": "^(\\\\w+)_jnt$", "replace": "\\\\1_JNT"}
+        ]
+    }
+
+pairs 에 있으면 pairs 를 사용하고, 없으면 rules 를 순서대로 모두 적용합니다.
+driver, controller, driven 이름만 바꿉니다. pose 이름은 그대로입니다.
+"""
+# pose manager
+from .model import interpolator_suffix, blend_matrix_suffix
+
+# built-ins
+import json
+import re
+
+rule_types = ("namespace", "prefix", "suffix", "regex")
+
+
+class NameMap(object):
+    """
+    rule 은 생성할 때 한 번 compile 하고, 결과는 이름마다 cache 합니다.
+    """
+
+    __slots__ = ("pairs", "rules", "_compiled", "_cache")
+
+    def __init__(self, pairs=None, rules=None):
+        self.pairs = dict(pairs or {})
+        self.rules = list(rules or [])
+        self._compiled = [self._compile(rule) for rule in self.rules]
+        self._cache = {}
+
+    @staticmethod
+    def _compile(rule):
+        rule_type = rule.get("type")
+        if rule_type == "namespace":
+            # 빈 from 은 namespace 추가, 빈 to 는 namespace 제거
+            source = re.escape(rule["from"] + ":") if rule.get("from") else ""
+            target = rule["to"] + ":" if rule.get("to") else ""
+            pattern = re.compile("^" + source) if source else re.compile("^(?![^:|]+:)")
+            return lambda name: pattern.sub(lambda m: target, name, count=1)
+        if rule_type == "prefix":
+            pattern = re.compile("^" + re.escape(rule["from"]))
+            return lambda name: pattern.sub(lambda m: rule["to"], name, count=1)
+        if rule_type == "suffix":
+            pattern = re.compile(re.escape(rule["from"]) + "$")
+            return lambda name: pattern.sub(lambda m: rule["to"], name, count=1)
+        if rule_type == "regex":
+            pattern = re.compile(rule["pattern"])
+            return lambda name: pattern.sub(rule["replace"], name)
+        raise ValueError("Unknown name map rule type {0!r}. use one of {1}".format(rule_type, rule_types))
+
+    def map(self, name):
+        if name in self._cache:
+            return self._cache[name]
+        if name in self.pairs:
+            result = self.pairs[name]
+        else:
+            result = name
+            for rule in self._compiled:
+                result = rule(result)
+        self._cache[name] = result
+        return result
+
+    def __call__(self, name):
+        return self.map(name)
+
+    def to_data(self):
+        return {"pairs": self.pairs, "rules": self.rules}
+
+    @classmethod
+    def from_data(cls, data):
+        return cls(data.get("pairs"), data.get("rules"))
+
+
+def read(file_path):
+    with open(file_path, "r", encoding="UTF-8") as f:
+        return NameMap.from_data(json.load(f))
+
+
+def collect_names(data):
+    """
+    :param data: pose file data
+    :return: [(kind, name), ...] kind 는 "driver", "controller", "driven". 중복 없이 처음 나온 순서입니다.
+    """
+    names = {}
+    for interpolator_name, interpolator_data in data.items():
+        names.setdefault(interpolator_name[:-len(interpolator_suffix)], "driver")
+        names.setdefault(interpolator_data["controller"], "controller")
+        for blend_m in interpolator_data["driven"]:
+            names.setdefault(blend_m[:-len(blend_matrix_suffix)], "driven")
+    return [(kind, name) for name, kind in names.items()]
+
+
+def retarget_data(data, name_map):
+    """
+    :param data: pose file data
+    :param name_map: NameMap or callable
+    :return: 이름을 바꾼 새 data
+    """
+    result = {}
+    for interpolator_name, interpolator_data in data.items():
+        driver = name_map(interpolator_name[:-len(interpolator_suffix)])
+        result[driver + interpolator_suffix] = {
+            "driver": driver,
+            "controller": name_map(interpolator_data["controller"]),
+            "driven": [name_map(b[:-len(blend_matrix_suffix)]) + blend_matrix_suffix
+                       for b in interpolator_data["driven"]],
+            "pose": {
+                pose: dict(pose_data, driven={name_map(d): o for d, o in pose_data.get("driven", {}).items()})
+                for pose, pose_data in interpolator_data["pose"].items()
+            }
+        }
+    return result
+
+
+def resolve(data, name_map, exists):
+    """
+    scene 을 건드리기 전에 모든 이름을 한 번에 확인합니다.
+
+    :param data: pose file data
+    :param name_map: NameMap or callable
+    :param exists: callable(name) -> bool. maya 에서는 mc.objExists
+    :return: {"data": 이름을 바꾼 data,
+              "mapping": {source: target},
+              "missing": [(kind, source, target)],
+              "duplicate": [(target, [source, ...])]}
+    """
+    mapping = {}
+    targets = {}
+    missing = []
+    for kind, name in collect_names(data):
+        target = name_map(name)
+        mapping[name] = target
+        targets.setdefault(target, []).append(name)
+        if not exists(target):
+            missing.append((kind, name, target))
+    duplicate = [(t, s) for t, s in targets.items() if len(s) > 1]
+    return {
+        "data": retarget_data(data, name_map),
+        "mapping": mapping,
+        "missing": missing,
+        "duplicate": duplicate
+    }
+
+
+def print_report(report):
+    for kind, source, target in report["missing"]:
+        print("missing    {0:<10} {1} -> {2}".format(kind, source, target))
+    for target, sources in report["duplicate"]:
+        print("duplicate  {0} <- {1}".format(target, sources))
+    print("{0} name(s), {1} missing, {2} duplicate".format(
+        len(report["mapping"]), len(report["missing"]), len(report["duplicate"])))
@@ -0,0 +1,224 @@
+"""
+maya 없이 pose weight 와 driven transform 을 계산합니다. export, bake, lut 에서 사용합니다.
+
+- rotation 은 maya 와 같은 xyz euler (degrees), row vector (v * M) 규칙입니다.
+- quaternion 은 (x, y, z, w) 입니다.
+- weight 는 gaussian rbf 입니다. pose 위치에서 그 pose 의 weight 가 1, 나머지가 0 이 되도록 풉니다.
+  poseInterpolator 의 내부 구현과 완전히 같지는 않습니다.
+- driven 은 blendMatrix 처럼 target index 순서대로 이전 결과와 target 을 weight 로 보간합니다.
+"""
+# built-ins
+import math
+
+regularization = 1e-6
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# rotation
+# ----------------------------------------------------------------------------------------------------------------------
+def euler_to_rows(r):
+    """
+    :param r: xyz euler degrees
+    :return: 3x3 rotation rows (row vector 규칙)
+    """
+    rx, ry, rz = [math.radians(x) for x in r]
+    cx, sx = math.cos(rx), math.sin(rx)
+    cy, sy = math.cos(ry), math.sin(ry)
+    cz, sz = math.cos(rz), math.sin(rz)
+    return [[cy * cz, cy * sz, -sy],
+            [sx * sy * cz - cx * sz, sx * sy * sz + cx * cz, sx * cy],
+            [cx * sy * cz + sx * sz, cx * sy * sz - sx * cz, cx * cy]]
+
+
+def rows_to_euler(rows):
+    ry = math.asin(max(-1.0, min(1.0, -rows[0][2])))
+    if abs(math.cos(ry)) > 1e-9:
+        rx = math.atan2(rows[1][2], rows[2][2])
+        rz = math.atan2(rows[0][1], rows[0][0])
+    else:
+        rx = math.atan2(-rows[2][1], rows[1][1])
+        rz = 0.0
+    return [math.degrees(rx), math.degrees(ry), math.degrees(rz)]
+
+
+def rows_to_quaternion(rows):
+    # row vector matrix 는 column vector matrix 의 transpose 입니다.
+    m00, m01, m02 = rows[0][0], rows[1][0], rows[2][0]
+    m10, m11, m12 = rows[0][1], rows[1][1], rows[2][1]
+    m20, m21, m22 = rows[0][2], rows[1][2], rows[2][2]
+    trace = m00 + m11 + m22
+    if trace > 0.0:
+        s = math.sqrt(trace + 1.0) * 2.0
+        q = [(m21 - m12) / s, (m02 - m20) / s, (m10 - m01) / s, 0.25 * s]
+    elif m00 > m11 and m00 > m22:
+        s = math.sqrt(1.0 + m00 - m11 - m22) * 2.0
+        q = [0.25 * s, (m01 + m10) / s, (m02 + m20) / s, (m21 - m12) / s]
+    elif m11 > m22:
+        s = math.sqrt(1.0 + m11 - m00 - m22) * 2.0
+        q = [(m01 + m10) / s, 0.25 * s, (m12 + m21) / s, (m02 - m20) / s]
+    else:
+        s = math.sqrt(1.0 + m22 - m00 - m11) * 2.0
+        q = [(m02 + m20) / s, (m12 + m21) / s, 0.25 * s, (m10 - m01) / s]
+    return normalize(q)
+
+
+def quaternion_to_rows(q):
+    x, y, z, w = q
+    # column vector matrix 를 transpose 해서 row vector matrix 로 만듭니다.
+    return [[1 - 2 * (y * y + z * z), 2 * (x * y + z * w), 2 * (x * z - y * w)],
+            [2 * (x * y - z * w), 1 - 2 * (x * x + z * z), 2 * (y * z + x * w)],
+            [2 * (x * z + y * w), 2 * (y * z - x * w), 1 - 2 * (x * x + y * y)]]
+
+
+def euler_to_quaternion(r):
+    return rows_to_quaternion(euler_to_rows(r))
+
+
+def quaternion_to_euler(q):
+    return rows_to_euler(quaternion_to_rows(q))
+
+
+def normalize(q):
+    length = math.sqrt(sum(x * x for x in q)) or 1.0
+    return [x / length for x in q]
+
+
+def slerp(q0, q1, t):
+    dot = sum(a * b for a, b in zip(q0, q1))
+    if dot < 0.0:
+        q1 = [-x for x in q1]
+        dot = -dot
+    if dot > 0.9995:
+        return normalize([a + (b - a) * t for a, b in zip(q0, q1)])
+    theta = math.acos(dot)
+    sin_theta = math.sin(theta)
+    a = math.sin((1.0 - t) * theta) / sin_theta
+    b = math.sin(t * theta) / sin_theta
+    return [a * x + b * y for x, y in zip(q0, q1)]
+
+
+def angle(q0, q1):
+    dot = abs(sum(a * b for a, b in zip(q0, q1)))
+    return 2.0 * math.acos(min(1.0, dot))
+
+
+def offset_to_matrix(t, q):
+    """
+    :return: 16 floats, row major
+    """
+    rows = quaternion_to_rows(q)
+    return rows[0] + [0.0] + rows[1] + [0.0] + rows[2] + [0.0] + list(t) + [1.0]
+
+
+def matrix_to_transform(m):
+    """
+    :param m: 16 floats, row major. scale 은 버립니다.
+    :return: t, q
+    """
+    m = list(m)
+    rows = []
+    for row in (m[0:3], m[4:7], m[8:11]):
+        length = math.sqrt(sum(x * x for x in row)) or 1.0
+        rows.append([x / length for x in row])
+    return m[12:15], rows_to_quaternion(rows)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# weight
+# ----------------------------------------------------------------------------------------------------------------------
+def distance(t0, q0, t1, q1):
+    dt = math.sqrt(sum((a - b) ** 2 for a, b in zip(t0, t1)))
+    return math.sqrt(dt * dt + angle(q0, q1) ** 2)
+
+
+def kernel(d, falloff):
+    falloff = max(falloff, 1e-6)
+    return math.exp(-(d * d) / (2.0 * falloff * falloff))
+
+
+def _invert(matrix):
+    n = len(matrix)
+    a = [list(row) + [1.0 if r == c else 0.0 for c in range(n)] for r, row in enumerate(matrix)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(a[r][col]))
+        if abs(a[pivot][col]) < 1e-15:
+            raise ValueError("singular pose kernel matrix")
+        a[col], a[pivot] = a[pivot], a[col]
+        p = a[col][col]
+        a[col] = [x / p for x in a[col]]
+        for r in range(n):
+            if r != col and a[r][col] != 0.0:
+                f = a[r][col]
+                a[r] = [x - f * y for x, y in zip(a[r], a[col])]
+    return [row[n:] for row in a]
+
+
+class PoseSolver(object):
+    """
+    interpolator 하나의 pose target 으로 rbf 를 미리 풀어둡니다.
+
+    :param targets: [(t, q), ...] pose 순서
+    :param falloffs: [float, ...] pose 순서
+    """
+
+    __slots__ = ("targets", "falloffs", "inverse")
+
+    def __init__(self, targets, falloffs):
+        self.targets = [(list(t), list(q)) for t, q in targets]
+        self.falloffs = list(falloffs)
+        n = len(self.targets)
+        matrix = [[kernel(distance(ti, qi, tj, qj), self.falloffs[j]) + (regularization if i == j else 0.0)
+                   for j, (tj, qj) in enumerate(self.targets)]
+                  for i, (ti, qi) in enumerate(self.targets)]
+        self.inverse = _invert(matrix) if n else []
+
+    def weights(self, t, q):
+        """
+        :param t: controller translate
+        :param q: controller rotation quaternion
+        :return: [float, ...] pose 순서. 0 ~ 1 로 clamp 합니다.
+        """
+        k = [kernel(distance(t, q, tj, qj), self.falloffs[j]) for j, (tj, qj) in enumerate(self.targets)]
+        n = len(k)
+        return [min(1.0, max(0.0, sum(k[j] * self.inverse[j][i] for j in range(n)))) for i in range(n)]
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# driven
+# ----------------------------------------------------------------------------------------------------------------------
+def blend(offsets, weights, rest=((0.0, 0.0, 0.0), (0.0, 0.0, 0.0, 1.0))):
+    """
+    blendMatrix 와 같이 순서대로 보간합니다.
+
+    :param offsets: [(t, q), ...] pose 순서
+    :param weights: [float, ...] pose 순서
+    :param rest: blendMatrix inputMatrix
+    :return: t, q
+    """
+    t, q = list(rest[0]), list(rest[1])
+    for (target_t, target_q), w in zip(offsets, weights):
+        if w <= 0.0:
+            continue
+        t = [a + (b - a) * w for a, b in zip(t, target_t)]
+        q = slerp(q, target_q, w)
+    return t, q
+
+
+def interpolator_targets(interpolator):
+    """
+    :param interpolator: model.Interpolator
+    :return: [(t, q), ...]
+    """
+    return [(list(p.t), euler_to_quaternion(p.r)) for p in interpolator.poses.values()]
+
+
+def interpolator_offsets(interpolator, driven):
+    """
+    :param interpolator: model.Interpolator
+    :return: [(t, q), ...]
+    """
+    offsets = []
+    for pose in interpolator.poses.values():
+        offset = pose.offset(driven)
+        offsets.append((list(offset.t), euler_to_quaternion(offset.r)))
+    return offsets
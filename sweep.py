@@ -0,0 +1,264 @@
+"""
+pose 를 하나씩 적용하면서 검토하는 QA sweep.
+
+    from posemanager import sweep
+    s = sweep.Sweep(sweep.collect_poses(), timing=True, playblast_dir="D:/qa/face")
+    results = s.run()
+    sweep.print_report(results)
+
+controller 값은 undo queue 밖에서 controller 마다 xform 한 번으로 적용합니다.
+끝나면 (중간에 멈춰도) 처음 값으로 되돌립니다. UI 에서는 step() 을 QTimer 로 호출합니다.
+
+key_timeline 은 frame 마다 pose 를 하나씩 key 합니다. timeline 을 scrub 하거나 playblast 로 전체를 검토할 수 있습니다.
+기존 animation 은 덮어쓰지 않습니다.
+"""
+# maya
+from maya import cmds as mc
+
+# pose manager
+from . import api
+
+# built-ins
+import os
+import time
+import traceback
+
+
+def collect_poses(drivers=None, data=None):
+    """
+    :param drivers: None 이면 모든 driver
+    :param data: None 이면 api.get_data()
+    :return: [{"interpolator", "pose", "controller", "t", "r", "drivens"}, ...] data 순서
+    """
+    data = api.get_data() if data is None else data
+    poses = []
+    for interpolator_name, interpolator_data in data.items():
+        if drivers is not None and interpolator_data["driver"] not in drivers:
+            continue
+        for pose, pose_data in interpolator_data["pose"].items():
+            poses.append({
+                "interpolator": interpolator_name,
+                "pose": pose,
+                "controller": interpolator_data["controller"],
+                "t": list(pose_data["t"]),
+                "r": list(pose_data["r"]),
+                "drivens": list(interpolator_data["driven"])
+            })
+    return poses
+
+
+def evaluate(item):
+    """
+    interpolator output 과 blendMatrix output 을 읽어서 evaluation 을 강제합니다.
+
+    :return: seconds
+    """
+    start = time.perf_counter()
+    shape = mc.listRelatives(item["interpolator"], shapes=True)[0]
+    mc.getAttr(shape + ".output")
+    for blend_m in item["drivens"]:
+        mc.getAttr(blend_m + ".outputMatrix")
+    return time.perf_counter() - start
+
+
+def playblast(item, directory):
+    """
+    :return: image path
+    """
+    file_path = os.path.join(directory, "{0}_{1}.png".format(item["interpolator"], item["pose"]))
+    frame = mc.currentTime(query=True)
+    mc.playblast(frame=[frame], completeFilename=file_path, format="image", compression="png", viewer=False,
+                 showOrnaments=False, percent=100, forceOverwrite=True)
+    return file_path
+
+
+class Sweep(object):
+    """
+    :param poses: collect_poses result
+    :param timing: pose 마다 evaluation 시간을 잽니다.
+    :param playblast_dir: 있으면 pose 마다 playblast 합니다.
+    """
+
+    def __init__(self, poses, timing=False, playblast_dir=None):
+        self.poses = list(poses)
+        self.timing = timing
+        self.playblast_dir = playblast_dir
+        self.index = 0
+        self.results = []
+        self.rest = {}
+        self.undo_state = None
+        self.finished = False
+
+    @property
+    def running(self):
+        return self.undo_state is not None
+
+    def start(self):
+        controllers = []
+        for item in self.poses:
+            if item["controller"] not in controllers:
+                controllers.append(item["controller"])
+        self.rest = {c: (mc.getAttr(c + ".t")[0], mc.getAttr(c + ".r")[0]) for c in controllers}
+        self.index = 0
+        self.results = []
+        self.finished = False
+        if self.playblast_dir and not os.path.isdir(self.playblast_dir):
+            os.makedirs(self.playblast_dir)
+        # sweep 중의 controller 값 변경은 undo queue 에 남기지 않습니다.
+        self.undo_state = mc.undoInfo(query=True, state=True)
+        mc.undoInfo(stateWithoutFlush=False)
+
+    def apply(self, item):
+        # 이전 pose 의 controller 를 rest 로 되돌리고 현재 pose 를 적용합니다.
+        if self.index > 0:
+            previous = self.poses[self.index - 1]["controller"]
+            if previous != item["controller"]:
+                t, r = self.rest[previous]
+                mc.xform(previous, translation=t, rotation=r)
+        mc.xform(item["controller"], translation=item["t"], rotation=item["r"])
+
+    def step(self):
+        """
+        :return: 적용한 pose 의 result. 끝났으면 None. finish 뒤에는 다시 시작하지 않고 계속 None 입니다.
+        """
+        if self.finished:
+            return None
+        if not self.running:
+            self.start()
+        if self.index >= len(self.poses):
+            self.finish()
+            return None
+
+        item = self.poses[self.index]
+        result = {"interpolator": item["interpolator"], "pose": item["pose"], "time": None, "image": None}
+        try:
+            self.apply(item)
+            if self.timing:
+                result["time"] = evaluate(item)
+            if self.playblast_dir:
+                result["image"] = playblast(item, self.playblast_dir)
+        except Exception:
+            traceback.print_exc()
+            mc.warning("Occur error sweep '{0}' '{1}'".format(item["interpolator"], item["pose"]))
+        self.results.append(result)
+        self.index += 1
+        return result
+
+    def finish(self):
+        if not self.running:
+            return
+        self.finished = True
+        try:
+            for controller, (t, r) in self.rest.items():
+                mc.xform(controller, translation=t, rotation=r)
+        finally:
+            mc.undoInfo(stateWithoutFlush=self.undo_state)
+            self.undo_state = None
+
+    def run(self):
+        """
+        모든 pose 를 한 번에 실행합니다.
+
+        :return: results
+        """
+        self.start()
+        try:
+            while self.step() is not None:
+                pass
+        finally:
+            self.finish()
+        return self.results
+
+
+def key_timeline(poses, start=None):
+    """
+    start frame 은 rest 이고, 그 다음 frame 부터 pose 를 하나씩 key 합니다. 마지막 frame 다음도 rest 입니다.
+    controller 마다 rest 와 다른 channel 만, 자기 pose 의 frame 과 그 앞뒤 frame 에만 key 합니다.
+    같은 값의 key 는 attribute, time list 로 묶어서 setKeyframe 한 번으로 만듭니다.
+    기존 key 는 덮어쓰지 않습니다. start 가 None 이면 기존 key 뒤에서 시작하고, 범위 안에 key 가 있으면 실패합니다.
+
+    :param poses: collect_poses result
+    :param start: None 이면 current time 과 마지막 기존 key 다음 frame 중 늦은 frame
+    :return: {frame: (interpolator, pose)}
+    """
+    attributes = ["tx", "ty", "tz", "rx", "ry", "rz"]
+    controllers = []
+    for item in poses:
+        if item["controller"] not in controllers:
+            controllers.append(item["controller"])
+    rest = {c: list(mc.getAttr(c + ".t")[0]) + list(mc.getAttr(c + ".r")[0]) for c in controllers}
+
+    # rest 와 다른 channel
+    channels = {c: set() for c in controllers}
+    for item in poses:
+        values = list(item["t"]) + list(item["r"])
+        channels[item["controller"]].update(
+            attr for attr, v, rv in zip(attributes, values, rest[item["controller"]]) if abs(v - rv) > 1e-6)
+    channels = {c: [attr for attr in attributes if attr in channels[c]] for c in controllers}
+
+    existing = []
+    for controller in controllers:
+        if channels[controller]:
+            existing.extend(mc.keyframe(controller, attribute=channels[controller], query=True,
+                                        timeChange=True) or [])
+    if start is None:
+        start = mc.currentTime(query=True)
+        if existing:
+            start = max(start, max(existing) + 1)
+    end = start + len(poses) + 1
+    overlap = [t for t in existing if start <= t <= end]
+    if overlap:
+        mc.warning("Already exists key in frame {0} ~ {1} : {2}".format(start, end, sorted(set(overlap))))
+        return {}
+
+    # controller 마다 {(value, times): [attr]}
+    groups = {c: {} for c in controllers}
+    for controller in controllers:
+        if not channels[controller]:
+            continue
+        frames_values = {}
+        for i, item in enumerate(poses):
+            if item["controller"] != controller:
+                continue
+            frame = start + i + 1
+            frames_values[frame] = list(item["t"]) + list(item["r"])
+            for neighbor in (frame - 1, frame + 1):
+                frames_values.setdefault(neighbor, None)
+        for attr in channels[controller]:
+            a = attributes.index(attr)
+            times = {}
+            for frame, values in sorted(frames_values.items()):
+                v = rest[controller][a] if values is None else values[a]
+                times.setdefault(v, []).append(frame)
+            for v, t in times.items():
+                groups[controller].setdefault((v, tuple(t)), []).append(attr)
+
+    frames = {}
+    mc.undoInfo(openChunk=True, infinity=True)
+    try:
+        for controller in controllers:
+            for (value, times), attrs in groups[controller].items():
+                mc.setKeyframe(controller, attribute=attrs, time=list(times), value=value)
+        for i, item in enumerate(poses):
+            frames[start + i + 1] = (item["interpolator"], item["pose"])
+    except Exception:
+        traceback.print_exc()
+        mc.undoInfo(closeChunk=True)
+        mc.undo()
+        mc.warning("Occur error key_timeline. Returned to action")
+        return {}
+    else:
+        mc.undoInfo(closeChunk=True)
+    return frames
+
+
+def print_report(results):
+    for result in results:
+        timing = "{0:>9.3f}ms".format(result["time"] * 1000.0) if result["time"] is not None else ""
+        print("{0:<40} {1:<20} {2} {3}".format(result["interpolator"], result["pose"], timing, result["image"] or ""))
+    times = [r["time"] for r in results if r["time"] is not None]
+    if times:
+        print("{0} pose(s), evaluation avg {1:.3f}ms, max {2:.3f}ms".format(
+            len(results), sum(times) / len(times) * 1000.0, max(times) * 1000.0))
+    else:
+        print("{0} pose(s)".format(len(results)))
@@ -0,0 +1,72 @@
+"""
+fake maya 로 package import 시간과 lazy import 를 확인합니다.
+
+    python -m pytest tests
+    python -m unittest discover -s tests
+"""
+# built-ins
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import unittest
+
+package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+package = os.path.basename(package_dir)
+# bench 의 --import-budget 기본값과 같습니다.
+import_budget = 0.05
+
+# import 할 때마다 새 interpreter 에서 잽니다. fake_maya 는 package 를 import 하지 않도록 file 로 읽습니다.
+script = textwrap.dedent("""
+    import importlib.util
+    import json
+    import sys
+    import time
+
+    sys.path.insert(0, {root!r})
+    spec = importlib.util.spec_from_file_location("fake_maya", {fake_maya!r})
+    fake_maya = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(fake_maya)
+    fake_maya.install()
+
+    result = {{}}
+    start = time.perf_counter()
+    importlib.import_module({package!r})
+    result["time"] = time.perf_counter() - start
+    result["eager"] = sorted(n for n in sys.modules if n.startswith({package!r} + "."))
+
+    importlib.import_module({package!r} + ".api")
+    importlib.import_module({package!r} + ".io")
+    result["headless"] = sorted(n for n in ("PySide2", {package!r} + ".ui", "maya.app.general.mayaMixin")
+                                if n in sys.modules)
+    print(json.dumps(result))
+""")
+
+
+def run_import():
+    code = script.format(root=os.path.dirname(package_dir), package=package,
+                         fake_maya=os.path.join(package_dir, "bench", "fake_maya.py"))
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=os.path.dirname(package_dir))
+    return json.loads(output.decode("UTF-8").strip().splitlines()[-1])
+
+
+class ImportTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.result = run_import()
+
+    def test_budget(self):
+        self.assertLessEqual(self.result["time"], import_budget,
+                             "import {0} : {1:.3f}s".format(package, self.result["time"]))
+
+    def test_no_eager_submodules(self):
+        self.assertEqual(self.result["eager"], [])
+
+    def test_headless(self):
+        self.assertEqual(self.result["headless"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,10 +7,54 @@ from maya.app.general.mayaMixin import MayaQWidgetDockableMixin
 # pose manager
 from .. import api as pm_api
 from .. import io as pm_io
+from .. import check as pm_check
+from .. import profiler as pm_profiler
+from .. import analysis as pm_analysis
+from .. import retarget as pm_retarget
+from .. import sweep as pm_sweep
+from .. import live as pm_live
+from .. import history as pm_history
 
 # maya
 from maya import cmds as mc
 
+# built-ins
+import os
+import time
+import traceback
+
+
+class FileWorker(QtCore.QThread):
+    """
+    run pose file read / write in worker thread.
+    maya scene 를 수정하는 함수는 넣지 마세요.
+    """
+
+    succeeded = QtCore.Signal(object)
+    failed = QtCore.Signal(str)
+
+    def __init__(self, func, *args, parent=None):
+        super().__init__(parent=parent)
+        self.func = func
+        self.args = args
+
+    def run(self):
+        try:
+            result = self.func(*self.args)
+        except Exception:
+            self.failed.emit(traceback.format_exc())
+        else:
+            self.succeeded.emit(result)
+
+
+def dump_with_history(file_path, data):
+    """
+    pose file 을 저장하고 <file>.history 에 snapshot 을 기록합니다. worker thread 에서 실행합니다.
+    """
+    pm_io.dump(file_path, data)
+    pm_history.get(pm_history.history_directory(file_path)).record(data, label=os.path.basename(file_path))
+    return file_path
+
 
 class DriverWidget(QtWidgets.QWidget):
     """
@@ -106,9 +150,8 @@ class DriverWidget(QtWidgets.QWidget):
 
     def delete_driver(self):
         items = self.list_widget.selectedItems()
-        for item in items:
-            pm_api.delete_driver(item.text().split(" | ")[0])
         if items:
+            pm_api.delete_drivers([item.text().split(" | ")[0] for item in items])
             self.refresh_ui()
             self.changedCurrentDriver.emit("")
 
@@ -192,6 +235,10 @@ class PoseDrivenWidget(QtWidgets.QWidget):
         self.update_pose_btn.clicked.connect(self.update_pose)
         self.delete_pose_btn = QtWidgets.QPushButton("Delete Pose")
         self.delete_pose_btn.clicked.connect(self.delete_pose)
+        self.delete_pose_btn.setContextMenuPolicy(QtCore.Qt.ActionsContextMenu)
+        delete_pose_all_action = QtWidgets.QAction("Delete Pose In All Drivers", self.delete_pose_btn)
+        delete_pose_all_action.triggered.connect(self.delete_pose_all_drivers)
+        self.delete_pose_btn.addAction(delete_pose_all_action)
         btn_layout.addWidget(self.add_pose_btn)
         btn_layout.addWidget(self.update_pose_btn)
         btn_layout.addWidget(self.delete_pose_btn)
@@ -205,9 +252,18 @@ class PoseDrivenWidget(QtWidgets.QWidget):
         self.update_driven_btn.clicked.connect(self.update_driven)
         self.delete_driven_btn = QtWidgets.QPushButton("Delete Driven")
         self.delete_driven_btn.clicked.connect(self.delete_driven)
+        self.live_edit_btn = QtWidgets.QPushButton("Live Edit")
+        self.live_edit_btn.setCheckable(True)
+        self.live_edit_btn.toggled.connect(self.toggle_live_edit)
+        self.live_edit_btn.setContextMenuPolicy(QtCore.Qt.ActionsContextMenu)
+        cancel_live_edit_action = QtWidgets.QAction("Cancel Live Edit", self.live_edit_btn)
+        cancel_live_edit_action.triggered.connect(self.cancel_live_edit)
+        self.live_edit_btn.addAction(cancel_live_edit_action)
         btn_layout.addWidget(self.add_driven_btn)
         btn_layout.addWidget(self.update_driven_btn)
         btn_layout.addWidget(self.delete_driven_btn)
+        btn_layout.addWidget(self.live_edit_btn)
+        self.live_edit = None
 
     def refresh_ui(self, current_driver=""):
         # DriverWidget 의 current_driver 변수를 저장합니다.
@@ -260,10 +316,9 @@ class PoseDrivenWidget(QtWidgets.QWidget):
             table_widget.setHorizontalHeaderLabels(["tx", "ty", "tz", "rx", "ry", "rz"])
 
             for i, pose in enumerate(data[interpolator_name]["pose"].keys()):
-                t = data[interpolator_name]["pose"][pose]["driven"][driven]["t"]
-                r = data[interpolator_name]["pose"][pose]["driven"][driven]["r"]
+                offset = pm_api.get_driven_offset(data[interpolator_name]["pose"][pose], driven)
                 table_widget.insertRow(i)
-                for _i, v in enumerate(t + r):
+                for _i, v in enumerate(list(offset["t"]) + list(offset["r"])):
                     item = QtWidgets.QTableWidgetItem()
                     item.setData(QtCore.Qt.DisplayRole, v)
                     table_widget.setItem(i, _i, item)
@@ -322,14 +377,31 @@ class PoseDrivenWidget(QtWidgets.QWidget):
         pm_api.update_pose(self.current_driver, pose)
         self.refresh_ui(self.current_driver)
 
+    def selected_poses(self):
+        widget = self.tab_widget.currentWidget()
+        if widget is None:
+            return []
+        rows = sorted({index.row() for index in widget.selectionModel().selectedRows()})
+        if not rows and widget.currentRow() >= 0:
+            rows = [widget.currentRow()]
+        return [widget.verticalHeaderItem(row).text() for row in rows]
+
     def delete_pose(self):
         if self.current_driver is None:
             return
-        widget = self.tab_widget.currentWidget()
-        row = widget.currentRow()
-        pose = widget.verticalHeaderItem(row).text()
-        pm_api.delete_pose(self.current_driver, pose)
-        self.refresh_ui(self.current_driver)
+        poses = self.selected_poses()
+        if poses:
+            pm_api.delete_poses({self.current_driver: poses})
+            self.refresh_ui(self.current_driver)
+
+    def delete_pose_all_drivers(self):
+        # 선택한 pose 이름을 모든 driver 에서 지웁니다.
+        if self.current_driver is None:
+            return
+        poses = self.selected_poses()
+        if poses:
+            pm_api.delete_poses(poses)
+            self.refresh_ui(self.current_driver)
 
     def add_driven(self):
         if self.current_driver is None:
@@ -362,13 +434,42 @@ class PoseDrivenWidget(QtWidgets.QWidget):
         pm_api.update_driven(self.current_driver, pose, current_tab_name)
         self.refresh_ui(self.current_driver)
 
+    def toggle_live_edit(self, checked):
+        if not checked:
+            if self.live_edit is not None:
+                self.live_edit.commit()
+                self.live_edit = None
+                self.refresh_ui(self.current_driver)
+            return
+
+        poses = self.selected_poses()
+        if not self.current_driver or not poses:
+            mc.warning("Pose 를 선택해 주세요.")
+            self.live_edit_btn.setChecked(False)
+            return
+        # driven tab 이면 그 driven 만, pose tab 이면 모든 driven 을 수정합니다.
+        current_tab_name = self.tab_widget.tabText(self.tab_widget.currentIndex())
+        drivens = [current_tab_name] if current_tab_name != "pose" else None
+        self.live_edit = pm_live.LiveEdit(self.current_driver, poses[0], drivens)
+        if not self.live_edit.start():
+            self.live_edit = None
+            self.live_edit_btn.setChecked(False)
+
+    def cancel_live_edit(self):
+        if self.live_edit is not None:
+            self.live_edit.cancel()
+            self.live_edit = None
+        self.live_edit_btn.blockSignals(True)
+        self.live_edit_btn.setChecked(False)
+        self.live_edit_btn.blockSignals(False)
+
     def delete_driven(self):
         current_index = self.tab_widget.currentIndex()
         current_tab_name = ""
         if current_index >= 0:
             current_tab_name = self.tab_widget.tabText(current_index)
         if current_tab_name:
-            pm_api.delete_driven(self.current_driver, current_tab_name)
+            pm_api.delete_drivens([current_tab_name], drivers=[self.current_driver])
             self.refresh_ui(self.current_driver)
 
     def go_to_pose(self, index):
@@ -392,6 +493,273 @@ class PoseDrivenWidget(QtWidgets.QWidget):
                 mc.select(driven)
 
 
+class ProfilerDialog(QtWidgets.QDialog):
+    """
+┌──────────────────────────────────────────────┐
+│ ┌──────────┬───────┬──────┬──────────┬─────┐ │
+│ │operation │ count │ time │ commands │bytes│ │
+│ ├──────────┼───────┼──────┼──────────┼─────┤ │
+│ │          │       │      │          │     │ │
+│ └──────────┴───────┴──────┴──────────┴─────┘ │
+│ ┌──────┐ ┌──────┐ ┌───────┐ ┌──────┐         │
+│ │enable│ │reset │ │refresh│ │export│         │
+│ └──────┘ └──────┘ └───────┘ └──────┘         │
+└──────────────────────────────────────────────┘
+
+    operation item 에 maya.cmds 별 count, time 이 tooltip 으로 표시됩니다.
+    """
+
+    columns = ["operation", "count", "time (s)", "commands", "bytes"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+        self.setWindowTitle("Pose Manager Profiler")
+
+        layout = QtWidgets.QVBoxLayout(self)
+        self.setLayout(layout)
+
+        self.table_widget = QtWidgets.QTableWidget(self)
+        self.table_widget.setEditTriggers(QtWidgets.QTableWidget.NoEditTriggers)
+        self.table_widget.setColumnCount(len(self.columns))
+        self.table_widget.setHorizontalHeaderLabels(self.columns)
+        layout.addWidget(self.table_widget)
+
+        btn_layout = QtWidgets.QHBoxLayout()
+        layout.addLayout(btn_layout)
+        self.enable_btn = QtWidgets.QPushButton()
+        self.enable_btn.clicked.connect(self.toggle)
+        reset_btn = QtWidgets.QPushButton("Reset")
+        reset_btn.clicked.connect(self.reset)
+        refresh_btn = QtWidgets.QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh_ui)
+        export_btn = QtWidgets.QPushButton("Export")
+        export_btn.clicked.connect(self.export)
+        btn_layout.addWidget(self.enable_btn)
+        btn_layout.addWidget(reset_btn)
+        btn_layout.addWidget(refresh_btn)
+        btn_layout.addWidget(export_btn)
+
+        self.refresh_ui()
+
+    def refresh_ui(self):
+        self.enable_btn.setText("Disable" if pm_profiler.is_enabled() else "Enable")
+
+        operations = pm_profiler.report()["operations"]
+        self.table_widget.setRowCount(0)
+        for i, (name, stats) in enumerate(operations.items()):
+            self.table_widget.insertRow(i)
+            values = [name, stats["count"], round(stats["time"], 6), stats["commands"], stats["bytes"]]
+            for _i, v in enumerate(values):
+                item = QtWidgets.QTableWidgetItem()
+                item.setData(QtCore.Qt.DisplayRole, v)
+                self.table_widget.setItem(i, _i, item)
+            tooltip = "\n".join("{0} : {1} / {2:.6f}s".format(k, v["count"], v["time"])
+                                for k, v in stats["by_command"].items())
+            self.table_widget.item(i, 0).setToolTip(tooltip)
+        self.table_widget.resizeColumnsToContents()
+
+    def toggle(self):
+        if pm_profiler.is_enabled():
+            pm_profiler.disable()
+        else:
+            pm_profiler.enable()
+        self.refresh_ui()
+
+    def reset(self):
+        pm_profiler.reset()
+        self.refresh_ui()
+
+    def export(self):
+        root_dir = mc.workspace(query=True, rootDirectory=True)
+        file_path = mc.fileDialog2(caption="Export Profile",
+                                   startingDirectory=root_dir,
+                                   fileFilter="Json (*.json)",
+                                   fileMode=0)
+        if file_path:
+            print("Export Profile : {0}".format(pm_profiler.export(file_path[0])))
+
+
+class SweepDialog(QtWidgets.QDialog):
+    """
+┌────────────────────────────────────────┐
+│ Interval (ms) : [ 500 ]                │
+│ [x] timing  [ ] playblast              │
+│ pose : drv_pmInterpolator / pose (3/40)│
+│ ┌──────┐ ┌────────────┐                │
+│ │start │ │key timeline│                │
+│ └──────┘ └────────────┘                │
+└────────────────────────────────────────┘
+
+    driver list 에서 선택한 driver 의 pose 를 sweep 합니다. 선택이 없으면 모든 driver 입니다.
+    """
+
+    def __init__(self, drivers=None, parent=None):
+        super().__init__(parent=parent)
+        self.setWindowTitle("Pose Sweep")
+        self.drivers = drivers or None
+        self.sweep = None
+        self.timer = QtCore.QTimer(self)
+        self.timer.timeout.connect(self.step)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        self.setLayout(layout)
+
+        interval_layout = QtWidgets.QHBoxLayout()
+        layout.addLayout(interval_layout)
+        interval_layout.addWidget(QtWidgets.QLabel("Interval (ms) : "))
+        self.interval_spin = QtWidgets.QSpinBox()
+        self.interval_spin.setRange(0, 10000)
+        self.interval_spin.setValue(500)
+        interval_layout.addWidget(self.interval_spin)
+
+        option_layout = QtWidgets.QHBoxLayout()
+        layout.addLayout(option_layout)
+        self.timing_check = QtWidgets.QCheckBox("Timing")
+        self.playblast_check = QtWidgets.QCheckBox("Playblast")
+        option_layout.addWidget(self.timing_check)
+        option_layout.addWidget(self.playblast_check)
+
+        self.status_label = QtWidgets.QLabel()
+        layout.addWidget(self.status_label)
+
+        btn_layout = QtWidgets.QHBoxLayout()
+        layout.addLayout(btn_layout)
+        self.start_btn = QtWidgets.QPushButton("Start")
+        self.start_btn.clicked.connect(self.toggle)
+        key_btn = QtWidgets.QPushButton("Key Timeline")
+        key_btn.clicked.connect(self.key_timeline)
+        btn_layout.addWidget(self.start_btn)
+        btn_layout.addWidget(key_btn)
+
+    def toggle(self):
+        if self.sweep is not None:
+            self.stop()
+            return
+        if not mc.objExists("pose_manager"):
+            return
+        playblast_dir = None
+        if self.playblast_check.isChecked():
+            playblast_dir = mc.fileDialog2(caption="Playblast Directory",
+                                           startingDirectory=mc.workspace(query=True, rootDirectory=True),
+                                           fileMode=3)
+            if not playblast_dir:
+                return
+            playblast_dir = playblast_dir[0]
+        poses = pm_sweep.collect_poses(self.drivers)
+        if not poses:
+            return
+        self.sweep = pm_sweep.Sweep(poses, timing=self.timing_check.isChecked(), playblast_dir=playblast_dir)
+        self.start_btn.setText("Stop")
+        self.timer.start(self.interval_spin.value())
+
+    def step(self):
+        result = self.sweep.step()
+        if result is None:
+            self.stop()
+            return
+        self.status_label.setText("pose : {0} / {1} ({2}/{3})".format(
+            result["interpolator"], result["pose"], self.sweep.index, len(self.sweep.poses)))
+
+    def stop(self):
+        self.timer.stop()
+        self.sweep.finish()
+        pm_sweep.print_report(self.sweep.results)
+        self.sweep = None
+        self.start_btn.setText("Start")
+        self.status_label.setText("")
+
+    def key_timeline(self):
+        if not mc.objExists("pose_manager"):
+            return
+        frames = pm_sweep.key_timeline(pm_sweep.collect_poses(self.drivers))
+        for frame, (interpolator_name, pose) in frames.items():
+            print("{0:>8} {1} {2}".format(frame, interpolator_name, pose))
+
+    def closeEvent(self, event):
+        if self.sweep is not None:
+            self.stop()
+        super().closeEvent(event)
+
+
+class HistoryDialog(QtWidgets.QDialog):
+    """
+┌────────────────────────────────────────────────┐
+│ ┌─list widget──────────────────────────────┐   │
+│ │ 3  2026-10-19 14:02  face.pose  ~1 -1    │   │
+│ │ 2  2026-10-19 13:40  auto       +2       │   │
+│ └──────────────────────────────────────────┘   │
+│ [x] Auto Record Every [ 20 ] Edits             │
+│ ┌───────┐ ┌────────┐                           │
+│ │restore│ │refresh │                           │
+│ └───────┘ └────────┘                           │
+└────────────────────────────────────────────────┘
+    """
+
+    def __init__(self, directory, parent=None):
+        super().__init__(parent=parent)
+        self.setWindowTitle("Pose History : {0}".format(directory))
+        self.history = pm_history.get(directory)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        self.setLayout(layout)
+
+        self.list_widget = QtWidgets.QListWidget()
+        layout.addWidget(self.list_widget)
+
+        record_layout = QtWidgets.QHBoxLayout()
+        layout.addLayout(record_layout)
+        self.auto_record_check = QtWidgets.QCheckBox("Auto Record Every")
+        self.every_spin = QtWidgets.QSpinBox()
+        self.every_spin.setRange(1, 1000)
+        self.every_spin.setValue(20)
+        record_layout.addWidget(self.auto_record_check)
+        record_layout.addWidget(self.every_spin)
+        record_layout.addWidget(QtWidgets.QLabel("Edits"))
+        recorder = parent.history_recorder if parent is not None else None
+        if recorder is not None and recorder.running:
+            self.auto_record_check.setChecked(True)
+            self.every_spin.setValue(recorder.every)
+        self.auto_record_check.toggled.connect(self.set_auto_record)
+
+        btn_layout = QtWidgets.QHBoxLayout()
+        layout.addLayout(btn_layout)
+        restore_btn = QtWidgets.QPushButton("Restore")
+        restore_btn.clicked.connect(self.restore)
+        refresh_btn = QtWidgets.QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh_ui)
+        btn_layout.addWidget(restore_btn)
+        btn_layout.addWidget(refresh_btn)
+
+        self.refresh_ui()
+
+    def refresh_ui(self):
+        self.list_widget.clear()
+        for entry in reversed(self.history.versions()):
+            changes = " ".join("{0}{1}".format(sign, len(entry[key]))
+                               for sign, key in (("+", "added"), ("~", "changed"), ("-", "removed")) if entry[key])
+            item = QtWidgets.QListWidgetItem("{0:<5} {1}  {2:<24} {3}".format(
+                entry["version"], time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["time"])), entry["label"],
+                changes))
+            item.setData(QtCore.Qt.UserRole, entry["version"])
+            item.setToolTip("\n".join(entry["added"] + entry["changed"] + entry["removed"]))
+            self.list_widget.addItem(item)
+
+    def restore(self):
+        item = self.list_widget.currentItem()
+        if item is None:
+            return
+        version = item.data(QtCore.Qt.UserRole)
+        changes = pm_history.restore(self.history, version)
+        if changes is not None:
+            print("Restore history version {0} : {1}".format(version, changes))
+        if self.parent() is not None:
+            self.parent().refresh_ui()
+
+    def set_auto_record(self, checked):
+        if self.parent() is not None:
+            self.parent().set_history_recorder(self.history.directory if checked else None, self.every_spin.value())
+
+
 class PoseManagerUI(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
     """
 ┌──────────────────────┐ ┌──file──┐
@@ -414,10 +782,19 @@ class PoseManagerUI(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
     # use dockable in __init.py
     tool_name = "PoseManagerUI"
 
+    file_worker = None
+    progress_dialog = None
+    name_map = None
+    load_report = None
+    pose_file_path = None
+    history_recorder = None
+
     def __init__(self, parent=None):
         super().__init__(parent=parent)
         self.setWindowTitle("Pose Manager")
         self.setObjectName(self.tool_name)
+        self.build_queue = []
+        self.build_count = 0
 
         self.setCentralWidget(self.initialize_ui())
 
@@ -444,10 +821,24 @@ class PoseManagerUI(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
 
         save_action = QtWidgets.QAction(QtGui.QIcon(":save.png"), "Save", self)
         load_action = QtWidgets.QAction(QtGui.QIcon(":openLoadGeneric.png"), "Load", self)
+        load_name_map_action = QtWidgets.QAction("Load With Name Map", self)
+        load_isolated_action = QtWidgets.QAction("Load Skipping Failed Drivers", self)
         file_menu.addAction(save_action)
         file_menu.addAction(load_action)
+        file_menu.addAction(load_name_map_action)
+        file_menu.addAction(load_isolated_action)
         save_action.triggered.connect(self.save)
-        load_action.triggered.connect(self.load)
+        load_action.triggered.connect(lambda: self.load())
+        load_name_map_action.triggered.connect(lambda: self.load(use_name_map=True))
+        load_isolated_action.triggered.connect(lambda: self.load(isolated=True))
+
+        file_menu.addSeparator()
+        self.record_history_action = QtWidgets.QAction("Record History On Save", self)
+        self.record_history_action.setCheckable(True)
+        history_action = QtWidgets.QAction("History", self)
+        file_menu.addAction(self.record_history_action)
+        file_menu.addAction(history_action)
+        history_action.triggered.connect(self.show_history)
 
         utils_menu = menu.addMenu("Utils")
         refresh_action = QtWidgets.QAction(QtGui.QIcon(":refresh.png"), "Refresh", self)
@@ -457,6 +848,45 @@ class PoseManagerUI(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
         refresh_action.triggered.connect(self.refresh_ui)
         auto_gaussian_action.triggered.connect(pm_api.auto_adjust_gaussian_falloff)
 
+        utils_menu.addSeparator()
+        check_action = QtWidgets.QAction("Check Scene", self)
+        rebuild_data_action = QtWidgets.QAction("Rebuild Data From Scene", self)
+        rebuild_scene_action = QtWidgets.QAction("Rebuild Scene From Data", self)
+        utils_menu.addAction(check_action)
+        utils_menu.addAction(rebuild_data_action)
+        utils_menu.addAction(rebuild_scene_action)
+        check_action.triggered.connect(lambda: pm_check.print_report(pm_check.scan()))
+        rebuild_data_action.triggered.connect(self.rebuild_data)
+        rebuild_scene_action.triggered.connect(self.rebuild_scene)
+
+        utils_menu.addSeparator()
+        topology_action = QtWidgets.QAction("Use offsetParentMatrix For New Driven", self)
+        topology_action.setCheckable(True)
+        topology_action.setChecked(pm_api.driven_topology == pm_api.topology_offset)
+        to_offset_action = QtWidgets.QAction("Convert Driven To offsetParentMatrix", self)
+        to_npo_action = QtWidgets.QAction("Convert Driven To NPO", self)
+        utils_menu.addAction(topology_action)
+        utils_menu.addAction(to_offset_action)
+        utils_menu.addAction(to_npo_action)
+        topology_action.toggled.connect(self.set_driven_topology)
+        to_offset_action.triggered.connect(lambda: self.convert_topology(pm_api.topology_offset))
+        to_npo_action.triggered.connect(lambda: self.convert_topology(pm_api.topology_npo))
+
+        utils_menu.addSeparator()
+        prune_action = QtWidgets.QAction("Prune Redundant Poses", self)
+        utils_menu.addAction(prune_action)
+        prune_action.triggered.connect(self.prune_poses)
+
+        utils_menu.addSeparator()
+        sweep_action = QtWidgets.QAction("Pose Sweep", self)
+        utils_menu.addAction(sweep_action)
+        sweep_action.triggered.connect(self.show_sweep)
+
+        utils_menu.addSeparator()
+        profiler_action = QtWidgets.QAction("Profiler", self)
+        utils_menu.addAction(profiler_action)
+        profiler_action.triggered.connect(lambda: ProfilerDialog(self).show())
+
         return widget
 
     def save(self):
@@ -469,14 +899,29 @@ class PoseManagerUI(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
             file_path = file_path[0]
         else:
             return None
+        if self.file_worker is not None:
+            mc.warning("Already running save / load")
+            return None
         data = pm_api.get_data()
-        if data:
-            print("Save Pose : {0}".format(file_path))
-            pm_io.dump(file_path=file_path, data=data)
-        else:
+        if not data:
             print("Empty data")
+            return None
 
-    def load(self):
+        # json 직렬화와 file write 는 worker thread 에서 실행합니다.
+        self.statusBar().showMessage("Saving Pose : {0}".format(file_path))
+        dump = dump_with_history if self.record_history_action.isChecked() else pm_io.dump
+        self.file_worker = FileWorker(dump, file_path, data, parent=self)
+        self.file_worker.succeeded.connect(self.saved)
+        self.file_worker.failed.connect(self.file_failed)
+        self.file_worker.start()
+
+    def saved(self, file_path):
+        self.file_worker = None
+        self.pose_file_path = file_path
+        self.statusBar().showMessage("Save Pose : {0}".format(file_path), 5000)
+        print("Save Pose : {0}".format(file_path))
+
+    def load(self, use_name_map=False, isolated=False):
         root_dir = mc.workspace(query=True, rootDirectory=True)
         file_path = mc.fileDialog2(caption="Load Pose",
                                    startingDirectory=root_dir,
@@ -486,9 +931,204 @@ class PoseManagerUI(MayaQWidgetDockableMixin, QtWidgets.QMainWindow):
             file_path = file_path[0]
         else:
             return None
-        pm_io.load(file_path=file_path)
+        if self.file_worker is not None:
+            mc.warning("Already running save / load")
+            return None
+
+        self.load_report = {"built": [], "failed": {}, "data": None} if isolated else None
+        self.name_map = None
+        if use_name_map:
+            name_map_path = mc.fileDialog2(caption="Load Name Map",
+                                           startingDirectory=root_dir,
+                                           fileFilter="Name Map (*.json)",
+                                           fileMode=1)
+            if not name_map_path:
+                return None
+            self.name_map = pm_retarget.read(name_map_path[0])
+
+        # file read 와 json parse 는 worker thread 에서 실행합니다.
+        self.pose_file_path = file_path
+        self.statusBar().showMessage("Reading Pose : {0}".format(file_path))
+        self.file_worker = FileWorker(pm_io.read, file_path, parent=self)
+        self.file_worker.succeeded.connect(self.build)
+        self.file_worker.failed.connect(self.file_failed)
+        self.file_worker.start()
+
+    def file_failed(self, message):
+        self.file_worker = None
+        self.load_report = None
+        self.statusBar().clearMessage()
+        print(message)
+        mc.warning("Occur error save / load pose file")
+
+    def build(self, data):
+        """
+        scene 수정은 main thread 에서 interpolator 단위로 나눠서 실행합니다.
+        interpolator 하나를 만들 때마다 event loop 로 돌아가므로 maya 가 멈추지 않습니다.
+        interpolator 마다 undo chunk 를 하나씩 닫고 개수를 세어서, cancel 하면 그만큼만 undo 합니다.
+        progress dialog 는 application modal 이라 build 중에는 다른 수정을 할 수 없습니다.
+        load_report 가 있으면 (isolated) interpolator 마다 따로 undo chunk 를 열고, 실패한 interpolator 만 되돌립니다.
+        cancel 해도 지금까지 만든 것은 유지합니다.
+        """
+        self.file_worker = None
+        self.statusBar().clearMessage()
+
+        # scene 을 수정하기 전에 모든 이름을 확인합니다.
+        if self.name_map is not None:
+            report = pm_io.resolve_names(data, self.name_map)
+            self.name_map = None
+            if report["missing"] or report["duplicate"]:
+                pm_retarget.print_report(report)
+                mc.warning("Unmapped names. Canceled load pose. see script editor")
+                self.load_report = None
+                return
+            data = report["data"]
+        if self.load_report is not None and self.load_report["data"] is None:
+            self.load_report["data"] = data
+
+        self.build_queue = list(data.items())
+        self.build_count = 0
+        self.progress_dialog = QtWidgets.QProgressDialog("Load Pose", "Cancel", 0, len(self.build_queue), self)
+        self.progress_dialog.setWindowTitle("Load Pose")
+        self.progress_dialog.setWindowModality(QtCore.Qt.ApplicationModal)
+        self.progress_dialog.setMinimumDuration(0)
+        self.progress_dialog.setValue(0)
+
+        QtCore.QTimer.singleShot(0, self.build_step)
+
+    def build_step(self):
+        if self.progress_dialog is None:
+            return
+        if self.progress_dialog.wasCanceled():
+            self.build_finished(rollback=True)
+            return
+        if not self.build_queue:
+            self.build_finished(rollback=False)
+            return
+
+        interpolator_name, interpolator_data = self.build_queue.pop(0)
+        self.progress_dialog.setLabelText(interpolator_name)
+        if self.load_report is not None:
+            error = pm_io.build_isolated(interpolator_name, interpolator_data)
+            if error:
+                self.load_report["failed"][interpolator_name] = error
+            else:
+                self.load_report["built"].append(interpolator_name)
+            self.progress_dialog.setValue(self.progress_dialog.maximum() - len(self.build_queue))
+            QtCore.QTimer.singleShot(0, self.build_step)
+            return
+        mc.undoInfo(openChunk=True, infinity=True)
+        try:
+            pm_io.build_interpolator(interpolator_name, interpolator_data)
+        except Exception:
+            traceback.print_exc()
+            mc.undoInfo(closeChunk=True)
+            mc.undo()
+            self.build_finished(rollback=True)
+            return
+        else:
+            mc.undoInfo(closeChunk=True)
+        self.build_count += 1
+        self.progress_dialog.setValue(self.progress_dialog.maximum() - len(self.build_queue))
+        QtCore.QTimer.singleShot(0, self.build_step)
+
+    def build_finished(self, rollback):
+        self.build_queue = []
+        self.progress_dialog.close()
+        self.progress_dialog = None
+        if self.load_report is not None:
+            self.isolated_build_finished()
+            return
+        if rollback:
+            # build_step 이 닫은 chunk 만 undo 합니다.
+            for _ in range(self.build_count):
+                mc.undo()
+            mc.warning("Canceled load pose. Returned to action")
+        self.build_count = 0
         self.refresh_ui()
 
+    def closeEvent(self, event):
+        if self.progress_dialog is not None:
+            self.build_finished(rollback=True)
+        super().closeEvent(event)
+
+    def isolated_build_finished(self):
+        report = self.load_report
+        pm_io.print_load_report(report)
+        self.refresh_ui()
+        if not report["failed"]:
+            self.load_report = None
+            return
+        result = QtWidgets.QMessageBox.question(self,
+                                                "Load Pose",
+                                                "{0} driver 를 만들지 못했습니다. 자세한 내용은 script editor 를 확인하세요.\n"
+                                                "실패한 driver 만 다시 만들까요?".format(len(report["failed"])))
+        if result != QtWidgets.QMessageBox.Yes:
+            self.load_report = None
+            return
+        data = {k: report["data"][k] for k in report["failed"]}
+        self.load_report = {"built": report["built"], "failed": {}, "data": report["data"]}
+        self.build(data)
+
+    def rebuild_data(self):
+        pm_check.rebuild_data()
+        self.refresh_ui()
+
+    def rebuild_scene(self):
+        pm_check.rebuild_scene()
+        self.refresh_ui()
+
+    def set_driven_topology(self, checked):
+        pm_api.driven_topology = pm_api.topology_offset if checked else pm_api.topology_npo
+
+    def convert_topology(self, topology):
+        pm_api.convert_topology(topology)
+        self.refresh_ui()
+
+    def prune_poses(self):
+        if not mc.objExists("pose_manager"):
+            return
+        report = pm_analysis.analyze(pm_api.get_data())
+        pm_analysis.print_report(report)
+        count = sum(len(r["remove"]) for r in report.values())
+        if not count:
+            return
+        result = QtWidgets.QMessageBox.question(self,
+                                                "Prune Redundant Poses",
+                                                "{0} pose 를 지웁니다. 자세한 내용은 script editor 를 확인하세요.".format(count))
+        if result != QtWidgets.QMessageBox.Yes:
+            return
+        pm_analysis.prune(report)
+        self.refresh_ui()
+
+    def show_sweep(self):
+        drivers = [item.text().split(" | ")[0] for item in self.driver_widget.list_widget.selectedItems()]
+        SweepDialog(drivers, parent=self).show()
+
+    def show_history(self):
+        file_path = self.pose_file_path
+        if not file_path:
+            file_path = mc.fileDialog2(caption="Pose History",
+                                       startingDirectory=mc.workspace(query=True, rootDirectory=True),
+                                       fileFilter="Pose (*.pose)",
+                                       fileMode=1)
+            if not file_path:
+                return
+            file_path = file_path[0]
+        HistoryDialog(pm_history.history_directory(file_path), parent=self).show()
+
+    def set_history_recorder(self, directory, every=20):
+        """
+        :param directory: None 이면 자동 기록을 멈춥니다.
+        """
+        if self.history_recorder is not None:
+            self.history_recorder.flush()
+            self.history_recorder.stop()
+            self.history_recorder = None
+        if directory:
+            self.history_recorder = pm_history.Recorder(pm_history.get(directory), every)
+            self.history_recorder.start()
+
     def refresh_ui(self):
         self.driver_widget.refresh_ui()
         self.pose_driven_widget.refresh_ui()
\ No newline at end of file